@@ -0,0 +1,21 @@
+"""app.py와 roadmap.py(및 asgi.py)의 관리자 API가 함께 쓰는 관리자 키 확인입니다."""
+import hmac
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+
+
+def admin_auth_error(admin_key):
+    """관리자 API 키를 확인하여 실패하면 (메시지, 상태 코드)를, 통과하면 None을 반환합니다.
+
+    ADMIN_API_KEY가 설정되지 않은 서버에서는 관리자 API를 모두 거부합니다(403).
+    """
+    if not ADMIN_API_KEY:
+        return "관리자 API가 비활성화되어 있습니다. ADMIN_API_KEY를 설정하세요.", 403
+    if not admin_key or not hmac.compare_digest(admin_key, ADMIN_API_KEY):
+        return "관리자 인증에 실패했습니다.", 401
+    return None
@@ -0,0 +1,115 @@
+import hashlib
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from models import db, AnalysisCacheEntry
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def make_cache_key(company_name, search_summary, model_id, prompt_version):
+    """회사명, 검색 요약 해시, 모델 ID, 프롬프트 버전으로 캐시 키를 만듭니다."""
+    summary_hash = hashlib.sha256(search_summary.encode("utf-8")).hexdigest()
+    raw = "\x1f".join([company_name, summary_hash, model_id, prompt_version])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """AI 기업 분석 결과를 DB에 저장하는 내용 주소 기반 캐시입니다.
+
+    ttl_seconds가 지난 항목은 조회 시 삭제되고, 항목 수가 max_entries를 넘으면
+    가장 오래 조회되지 않은 항목부터 삭제합니다. 애플리케이션 컨텍스트 안에서
+    사용해야 합니다.
+    """
+
+    def __init__(self, ttl_seconds=90 * 24 * 3600, max_entries=5000):
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """캐시된 분석 결과를 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        entry = AnalysisCacheEntry.query.filter_by(cache_key=key).first()
+        now = _now_ms()
+        if entry is None:
+            self._count(False)
+            return None
+        if self.ttl_ms and now - entry.created_at > self.ttl_ms:
+            db.session.delete(entry)
+            db.session.commit()
+            self._count(False)
+            return None
+        entry.last_accessed_at = now
+        db.session.commit()
+        self._count(True)
+        return entry.ai_analysis
+
+    def put(self, key, company_name, ai_analysis):
+        """분석 결과를 저장하고 필요하면 LRU 순서로 오래된 항목을 삭제합니다."""
+        now = _now_ms()
+        db.session.add(
+            AnalysisCacheEntry(
+                cache_key=key,
+                company_name=company_name,
+                ai_analysis=ai_analysis,
+                created_at=now,
+                last_accessed_at=now,
+            )
+        )
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # 다른 워커가 같은 키를 먼저 저장한 경우
+            db.session.rollback()
+            return
+        self._evict()
+
+    def _evict(self):
+        if not self.max_entries:
+            return
+        overflow = AnalysisCacheEntry.query.count() - self.max_entries
+        if overflow <= 0:
+            return
+        stale_ids = [
+            row.id
+            for row in AnalysisCacheEntry.query.with_entities(AnalysisCacheEntry.id)
+            .order_by(AnalysisCacheEntry.last_accessed_at)
+            .limit(overflow)
+        ]
+        AnalysisCacheEntry.query.filter(AnalysisCacheEntry.id.in_(stale_ids)).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
+
+    def invalidate_company(self, company_name):
+        """한 회사의 캐시 항목을 모두 삭제하고 삭제된 개수를 반환합니다."""
+        deleted = AnalysisCacheEntry.query.filter_by(company_name=company_name).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
+        return deleted
+
+    def stats(self):
+        """조회 적중/실패 횟수와 현재 저장된 항목 수를 반환합니다."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "entries": AnalysisCacheEntry.query.count(),
+            "ttlSeconds": self.ttl_ms // 1000,
+            "maxEntries": self.max_entries,
+        }
@@ -1,113 +1,833 @@
 import os
-import pymupdf as fitz
+import hashlib
+import json
+import logging
+import threading
+import time
 import requests
-import re
-import pprint
-from flask import Flask, request, jsonify
+from contextlib import contextmanager
+from pprint import pformat
+from flask import Flask, Response, current_app, g, request, jsonify, stream_with_context, url_for
 from flask_cors import CORS
 from flask_migrate import Migrate
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from dotenv import load_dotenv
 from datetime import datetime
 
 load_dotenv()
 
-from models import db, CompanyInformation, JobInformation
-
-torch_import = True
-try:
-    import torch
-    from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
-except ImportError:
-    torch_import = False
-    print("Warning: torch or transformers not found. LLM features will be disabled.")
-
+from models import db, CompanyInformation
+from admin_auth import admin_auth_error
+from jobs import JobQueue
+from batching import MicroBatcher
+from analysis_cache import AnalysisCache, make_cache_key
+from cache import make_cache
+from catalog import list_companies, list_job_postings
+from http_client import HttpClient, client_stats
+from extractor import extract_company_name, extract_info
+from generation_policy import GenerationPolicy
+from pdf_reader import extract_form_text, file_sha256
+from persistence import (
+    bulk_upsert,
+    company_row,
+    find_company,
+    IdempotencyKeyConflict,
+    find_processed_job,
+    job_row,
+    normalize_company_fields,
+)
+from db_pool import engine_options, pool_status
+from inference_server import InferenceClient
+from llm_loader import GENERATION_KWARGS, LLMLoader
+from matching import job_index, job_summaries, student_texts
+import metrics
+from metrics import PROMETHEUS_CONTENT_TYPE, stage_timer
+from prefix_cache import create_prefix_generator
+from sse import SSE_HEADERS, sse_event
+from stage_graph import StageGraph, emit_from, shared_executor
 
 # ---------- 전역 확장 및 설정 변수 ----------
+logger = logging.getLogger("dbase.pipeline")
 migrate = Migrate()
 llm_pipeline = None
+llm_batcher = None
+prefix_generator = None
+generation_policy = None
+analysis_cache = None
 
 DB_URL = os.getenv("DATABASE_URL")
 SERPER_KEY = os.getenv("SERPER_API_KEY")
 MODEL_ID = os.getenv("MODEL_ID", "sh2orc/Llama-3.1-Korean-8B-Instruct")
-SERPER_URL = "https://google.serper.dev/search"
+SERPER_URL = os.getenv("SERPER_URL", "https://google.serper.dev/search")
+SERPER_TIMEOUT = float(os.getenv("SERPER_TIMEOUT", "10"))
+SERPER_RETRIES = int(os.getenv("SERPER_RETRIES", "2"))
+# 동시에 보낼 수 있는 Serper 요청 수 (0이면 제한 없음)
+SERPER_MAX_CONCURRENCY = int(os.getenv("SERPER_MAX_CONCURRENCY", "0"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# LLM 마이크로 배치: 첫 요청 후 대기 시간(ms)과 한 배치의 최대 프롬프트 수
+LLM_BATCH_WINDOW_MS = int(os.getenv("LLM_BATCH_WINDOW_MS", "50"))
+LLM_BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", "8"))
+# analyze 단계 전용 스레드 수. LLM 생성 동안 스레드를 붙잡으므로 공용 단계 풀과 나눕니다.
+# 한 번에 생성하는 프롬프트는 배치 크기까지이므로 기본값은 LLM_BATCH_MAX_SIZE입니다.
+ANALYZE_STAGE_WORKERS = int(os.getenv("ANALYZE_STAGE_WORKERS") or LLM_BATCH_MAX_SIZE)
+# 설정하면 모델을 직접 불러오지 않고 이 소켓의 추론 프로세스(inference_server.py)에 생성을 요청합니다.
+LLM_SOCKET = os.getenv("LLM_SOCKET")
+# AI 분석 캐시: 프롬프트를 바꾸면 ANALYSIS_PROMPT_VERSION을 올려 기존 캐시를 무효화합니다.
+ANALYSIS_PROMPT_VERSION = "v2"
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(90 * 24 * 3600)))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+# 한 번의 매칭 요청에서 비교할 수 있는 최대 학생 수와 학생별 최대 추천 공고 수
+MATCHING_MAX_USERS = int(os.getenv("MATCHING_MAX_USERS", "1000"))
+MATCHING_MAX_K = 100
+# 로그 수준 (DEBUG로 설정하면 추출 정보와 저장 데이터 전체를 출력합니다)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# 모델 로딩 중에 들어온 요청은 이 문구로 저장하고, 로딩이 끝나면 다시 분석합니다.
+ANALYSIS_PENDING_MESSAGE = "AI 분석 대기 중입니다. 모델 로딩이 끝나면 자동으로 생성됩니다."
+ANALYSIS_SKIPPED_MESSAGE = "LLM 미설정 또는 회사명 누락으로 AI 분석을 건너뜁니다."
+# 대기 중이던 분석을 한 프로세스가 가져가 생성하는 동안 저장해 두는 표시
+ANALYSIS_GENERATING_MESSAGE = "AI 분석을 생성하고 있습니다."
+# 생성 중 표시가 이 시간(초) 동안 바뀌지 않으면 생성하던 프로세스가 죽은 것으로 보고 다시 생성합니다.
+# 백필 스레드는 같은 간격으로 다른 프로세스(ingest.py 등)가 남긴 대기 중/건너뛴 분석도 다시 찾습니다.
+ANALYSIS_BACKFILL_LEASE_SECONDS = int(os.getenv("ANALYSIS_BACKFILL_LEASE_SECONDS", "600"))
 
 SCRIPT_PATH = os.path.abspath(__file__)
 AI_DIR = os.path.dirname(SCRIPT_PATH)
 DBASE_ROOT_DIR = os.path.dirname(AI_DIR)
 UPLOAD_JOB_INFO_ROOT = os.path.join(DBASE_ROOT_DIR, "DBase-backend", "uploads")
 
+# Serper 검색 결과 캐시: memory(LRU) | sqlite | none
+SERPER_CACHE_BACKEND = os.getenv("SERPER_CACHE_BACKEND", "memory")
+SERPER_CACHE_TTL_SECONDS = int(os.getenv("SERPER_CACHE_TTL_SECONDS", "86400"))
+SERPER_CACHE_MAX_ENTRIES = int(os.getenv("SERPER_CACHE_MAX_ENTRIES", "1024"))
+SERPER_CACHE_PATH = os.getenv(
+    "SERPER_CACHE_PATH", os.path.join(AI_DIR, "serper_cache.sqlite3")
+)
+
+serper_client = HttpClient(
+    "serper",
+    timeout=SERPER_TIMEOUT,
+    retries=SERPER_RETRIES,
+    max_concurrency=SERPER_MAX_CONCURRENCY,
+)
+search_cache = make_cache(
+    SERPER_CACHE_BACKEND,
+    ttl=SERPER_CACHE_TTL_SECONDS,
+    maxsize=SERPER_CACHE_MAX_ENTRIES,
+    path=SERPER_CACHE_PATH,
+)
+
 
 # ---------- 유틸리티 함수 ----------
 
 
-def extract_text(path):
-    """PDF 파일 경로를 받아 텍스트를 추출합니다."""
-    return "".join(page.get_text() for page in fitz.open(path))
+def search_cache_key(query, num):
+    return json.dumps([query, num], ensure_ascii=False)
+
+
+def format_search_results(response_json):
+    """Serper 응답의 organic 결과를 '제목/링크/내용' 문자열 목록으로 변환합니다."""
+    return [
+        f"제목: {i.get('title', 'N/A')}\n링크: {i.get('link', 'N/A')}\n내용: {i.get('snippet', '내용 없음')}"
+        for i in response_json.get("organic", [])
+    ]
+
+
+def fetch_search_results(query, num=5):
+    """캐시를 거치지 않고 Serper로 검색하여 결과를 캐시에 저장하고 반환합니다.
+
+    검색에 실패하면 requests.exceptions.RequestException을 그대로 발생시킵니다.
+    """
+    headers = {"X-API-KEY": SERPER_KEY, "Content-Type": "application/json"}
+    r = serper_client.post(SERPER_URL, json={"q": query, "num": num}, headers=headers)
+    r.raise_for_status()
+    results = format_search_results(r.json())
+    if search_cache is not None:
+        search_cache.set(search_cache_key(query, num), results)
+    return results
 
 
 def google_search(query, num=5):
     """주어진 쿼리로 Google 검색을 수행하고 결과를 반환합니다."""
     if not query or not SERPER_KEY:
         return []
-    headers = {"X-API-KEY": SERPER_KEY, "Content-Type": "application/json"}
+    if search_cache is not None:
+        cached = search_cache.get(search_cache_key(query, num))
+        if cached is not None:
+            return cached
+
     try:
-        r = requests.post(SERPER_URL, json={"q": query, "num": num}, headers=headers)
-        r.raise_for_status()
-        return [
-            f"제목: {i.get('title', 'N/A')}\n링크: {i.get('link', 'N/A')}\n내용: {i.get('snippet', '내용 없음')}"
-            for i in r.json().get("organic", [])
-        ]
+        return fetch_search_results(query, num)
     except requests.exceptions.RequestException as e:
         print(f"--- ERROR: Google 검색 실패: {e}")
         return []
 
 
-def extract_info(text):
-    """정규식을 사용하여 PDF 텍스트에서 구조화된 정보를 추출합니다."""
-    info = {}
-    patterns = {
-        "company_name": r"회사명\s*(.*?)\s*사업자번호",
-        "established": r"설립\s*일자\s*([\d\.\s]+)",
-        "upte": r"업태\s*([^\n]+)",
-        "jongmok": r"종목\s*([^\n]+)",
-        "num_employees": r"상시근로자\s*수\s*(\d+)",
-        "main_business": r"주요\s*사업\s*내용\s*([\s\S]+?)(?:홈페이지|대표자명)",
-        "website": r"홈페이지\s*(https?://\S+)",
-        "location": r"소재지\s*([\s\S]+?)\s*대표자명",
-        "application_deadline": r"요청일:\s*([^\n]+)",
-        "job_category": r"모집직종\s*([^\n]+)",
-        "positions": r"모집인원\s*(\d+)\s*명",
-        "job_description": r"직무내용\s*\(구체적\)\s*([\s\S]+?)\s*근무\s*형태",
-        "qualifications": r"자격요건\s*\(우대자격\)\s*([\s\S]+?)\s*근무\s*시간",
-        "employment_type": r"근무\s*형태\s*([\s\S]+?)\s*자격요건",
-        "work_hours": r"근무\s*시간\s*([\s\S]+?)\s*접수\s*서류",
-        "intern_stipend": r"실습\s*수당\s*\(현장실습\s*시\)\s*(.*?)(?:\n|$)",
-        "salary": r"급여\s*\(정규직\s*채용\s*시\)\s*(.*?)(?:\n|$)",
-        "other_requirements": r"기타\s*요구사항\s*([\s\S]+?)\s*요청일",
-    }
-    for key, pattern in patterns.items():
-        match = re.search(pattern, text, re.DOTALL)
-        info[key] = match.group(1).strip().replace("\n", " ") if match else None
-
-    info["business_type"] = (
-        f"{info['upte']} / {info['jongmok']}"
-        if info.get("upte") and info.get("jongmok")
-        else (info.get("upte") or info.get("jongmok"))
+# ---------- PDF 처리 파이프라인 ----------
+class PipelineError(Exception):
+    """파이프라인 처리 중 클라이언트에 그대로 전달할 오류입니다."""
+
+    def __init__(self, message, status_code=500):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+    def __reduce__(self):
+        # 프로세스 풀에서 발생한 오류도 상태 코드를 유지한 채 전달되도록 합니다.
+        return type(self), (self.message, self.status_code)
+
+
+# 모든 요청에 같은 지시문을 프롬프트 맨 앞에 두어, 이 부분의 KV 캐시를 재사용합니다 (prefix_cache.py).
+ANALYSIS_PROMPT_PREFIX = "다음 정보를 바탕으로 아래 회사의 기업 분석 보고서를 작성해줘. 회사의 주력 사업, 사용하는 기술, 성장 가능성에 초점을 맞춰 전문가 관점에서 간결하게 요약해줘(200자 내외). 불필요한 인사말이나 **마크다운 문법** 제외하고 핵심 내용만 포함해줘.\n\n"
+
+
+def build_llm_prompt(company_name, search_summary):
+    """기업 분석 보고서 생성을 위한 LLM 프롬프트를 만듭니다. 고정 지시문 뒤에 회사별 내용이 옵니다."""
+    return f"{ANALYSIS_PROMPT_PREFIX}## 회사명:\n{company_name}\n\n## 웹 검색 결과 요약:\n{search_summary}\n\n## 기업 분석 보고서:"
+
+
+def analyze_company(company_name, search_summary):
+    """웹 검색 요약을 바탕으로 LLM 기업 분석 보고서를 생성합니다.
+
+    (분석 결과, 상태)를 반환하며 상태는 done, cached, pending(모델 로딩 중), skipped 중 하나입니다.
+    """
+    if company_name and llm_loader.is_loading:
+        return ANALYSIS_PENDING_MESSAGE, "pending"
+    if not llm_pipeline or not company_name:
+        return ANALYSIS_SKIPPED_MESSAGE, "skipped"
+    cache_key = make_cache_key(
+        company_name, search_summary, MODEL_ID, ANALYSIS_PROMPT_VERSION
+    )
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        print(f"--- INFO: AI 분석 캐시 적중: {company_name}")
+        return cached, "cached"
+
+    llm_prompt = build_llm_prompt(company_name, search_summary)
+    # 캐시 조회로 연 트랜잭션이 생성 동안 DB 연결을 붙잡지 않도록 반납합니다.
+    db.session.close()
+    # llm 단계 시간에는 캐시 적중이나 대기/건너뜀 없이 실제 생성만 기록합니다.
+    with stage_timer("llm"):
+        ai_analysis_result = llm_batcher(llm_prompt)
+    analysis_cache.put(cache_key, company_name, ai_analysis_result)
+    return ai_analysis_result, "done"
+
+
+def stream_company_analysis(company_name, search_summary):
+    """analyze_company와 같지만 생성되는 토큰 조각을 ("token", {"text": ...}) 이벤트로 내보냅니다.
+
+    `yield from`으로 사용하며 (분석 결과, 상태)를 반환합니다. 스트리밍 생성은 요청 한 건을
+    바로 생성하므로 마이크로 배치를 거치지 않습니다.
+    """
+    if not llm_pipeline or not company_name or llm_loader.is_loading:
+        return analyze_company(company_name, search_summary)
+    cache_key = make_cache_key(
+        company_name, search_summary, MODEL_ID, ANALYSIS_PROMPT_VERSION
     )
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        print(f"--- INFO: AI 분석 캐시 적중: {company_name}")
+        return cached, "cached"
+
+    db.session.close()
+    with stage_timer("llm"):
+        ai_analysis_result = yield from stream_generate(
+            build_llm_prompt(company_name, search_summary)
+        )
+    analysis_cache.put(cache_key, company_name, ai_analysis_result)
+    return ai_analysis_result, "done"
+
+
+def stream_generate(llm_prompt):
+    """프롬프트 하나를 생성하며 ("token", {"text": ...}) 이벤트를 내보내고 정리된 결과를 반환합니다.
+
+    스트리밍된 토큰에는 생성 정책이 잘라낸 꼬리(끝 표시 등)가 포함될 수 있으므로, 저장할 때는
+    반환값을 사용합니다.
+    """
+    if isinstance(llm_pipeline, InferenceClient):
+        return (yield from llm_pipeline.stream(llm_prompt))
+
+    from transformers import TextIteratorStreamer
+
+    streamer = TextIteratorStreamer(
+        llm_pipeline.tokenizer, skip_prompt=True, skip_special_tokens=True
+    )
+    errors = []
+    results = []
+
+    def generate():
+        try:
+            results.extend(_generate_batch([llm_prompt], streamer=streamer))
+        except Exception as e:
+            errors.append(e)
+            streamer.end()
+
+    worker = threading.Thread(target=generate, name="llm-stream", daemon=True)
+    worker.start()
+    for chunk in streamer:
+        if chunk:
+            yield "token", {"text": chunk}
+    worker.join()
+    if errors:
+        raise errors[0]
+    return results[0]
+
+
+def _generate_texts(prompts, **kwargs):
+    """접두어 캐시(가능하면) 또는 파이프라인으로 프롬프트들을 한 배치로 생성합니다."""
+    if prefix_generator is not None and all(map(prefix_generator.matches, prompts)):
+        return prefix_generator.generate(prompts, **kwargs)
+    outputs = llm_pipeline(prompts, batch_size=len(prompts), return_full_text=False, **kwargs)
+    return [output[0]["generated_text"] for output in outputs]
+
+
+def _generate_batch(prompts, **kwargs):
+    """모인 프롬프트들을 패딩된 하나의 배치로 생성하고 입력 순서대로 반환합니다.
+
+    생성 정책이 있으면 토큰 예산과 조기 종료 조건을 적용하고 결과를 정리합니다.
+    """
+    if generation_policy is not None:
+        return generation_policy.run(_generate_texts, prompts, **kwargs)
+    return [text.strip() for text in _generate_texts(prompts, **kwargs)]
+
+
+def _on_llm_ready(loaded_pipeline):
+    """모델 로딩이 끝나면 생성 정책, 프롬프트 접두어 캐시, 파이프라인과 배치 스케줄러를 설정합니다."""
+    global llm_pipeline, llm_batcher, prefix_generator, generation_policy
+    generation_policy = GenerationPolicy(
+        loaded_pipeline.tokenizer,
+        ANALYSIS_PROMPT_PREFIX,
+        temperature=GENERATION_KWARGS["temperature"],
+    )
+    try:
+        prefix_generator = create_prefix_generator(
+            loaded_pipeline,
+            ANALYSIS_PROMPT_PREFIX,
+            GENERATION_KWARGS,
+            sample_prompt=build_llm_prompt("회사명", summarize_search_results([])),
+            max_batch_size=LLM_BATCH_MAX_SIZE,
+        )
+    except Exception as e:
+        # 접두어 캐시는 최적화일 뿐이므로 실패하면 기존 파이프라인으로 생성합니다.
+        print(f"--- ERROR: 프롬프트 접두어 캐시 준비 실패, 사용하지 않습니다: {e}")
+    llm_batcher = MicroBatcher(
+        _generate_batch,
+        window_ms=LLM_BATCH_WINDOW_MS,
+        max_batch_size=LLM_BATCH_MAX_SIZE,
+        name="llm-batcher",
+    )
+    llm_pipeline = loaded_pipeline
+
+
+def _on_inference_server_ready(client):
+    """추론 서버의 모델이 준비되면 클라이언트를 파이프라인과 배치 스케줄러 자리에 둡니다.
+
+    배치, 접두어 캐시, 생성 정책은 추론 서버에서 적용되므로 이 프로세스에서는 만들지 않습니다.
+    """
+    global llm_pipeline, llm_batcher
+    llm_batcher = client.generate
+    llm_pipeline = client
+
+
+def use_inference_server(socket_path):
+    """이 프로세스가 모델을 불러오지 않고 공유 추론 프로세스에 생성을 요청하도록 전환합니다."""
+    global llm_loader
+    if not isinstance(llm_loader, InferenceClient):
+        llm_loader = InferenceClient(socket_path, on_ready=_on_inference_server_ready)
+
+
+llm_loader = LLMLoader(MODEL_ID, on_ready=_on_llm_ready)
+
+
+_backfill_requested = threading.Event()
+
+
+def request_pending_backfill():
+    """모델이 준비된 뒤 '대기 중' 분석이 저장되었음을 백필 스레드에 알립니다."""
+    _backfill_requested.set()
+
+
+def _backfill_claimable(now):
+    """대기 중이거나 분석을 건너뛴 회사와, 생성하던 프로세스가 ANALYSIS_BACKFILL_LEASE_SECONDS 동안
+    끝내지 못한 회사의 조건입니다. 건너뛴 분석은 모델을 불러오지 못한 ingest.py 실행 등에서 남습니다.
+    """
+    return or_(
+        CompanyInformation.ai_analysis == ANALYSIS_PENDING_MESSAGE,
+        and_(
+            CompanyInformation.ai_analysis == ANALYSIS_SKIPPED_MESSAGE,
+            CompanyInformation.company_name.is_not(None),
+        ),
+        and_(
+            CompanyInformation.ai_analysis == ANALYSIS_GENERATING_MESSAGE,
+            or_(
+                CompanyInformation.analysis_claimed_at.is_(None),
+                CompanyInformation.analysis_claimed_at < now - ANALYSIS_BACKFILL_LEASE_SECONDS,
+            ),
+        ),
+    )
+
 
-    if info.get("num_employees"):
+def _claim_pending_analysis(company_id, now):
+    """조건부 UPDATE로 회사를 '생성 중'으로 바꿉니다. 다른 프로세스가 먼저 가져갔으면 False입니다."""
+    claimed = db.session.execute(
+        update(CompanyInformation)
+        .where(CompanyInformation.id == company_id, _backfill_claimable(now))
+        .values(ai_analysis=ANALYSIS_GENERATING_MESSAGE, analysis_claimed_at=now)
+    ).rowcount
+    db.session.commit()
+    return bool(claimed)
+
+
+def _backfill_once():
+    now = int(time.time())
+    pending = db.session.execute(
+        select(CompanyInformation.id, CompanyInformation.company_name).where(
+            _backfill_claimable(now)
+        )
+    ).all()
+    if pending:
+        print(f"--- INFO: 대기 중이던 AI 분석 {len(pending)}건을 생성합니다.")
+    for company_id, company_name in pending:
+        # 여러 워커 프로세스가 같은 회사를 생성하지 않도록, 가져간 프로세스만 생성합니다.
+        if not _claim_pending_analysis(company_id, now):
+            continue
         try:
-            info["num_employees"] = int(info["num_employees"])
-        except (ValueError, TypeError):
-            info["num_employees"] = None
+            search_summary = search_summary_for(company_name)
+            ai_analysis, analysis_status = analyze_company(company_name, search_summary)
+            values = {
+                "ai_analysis": ai_analysis,
+                "search_fingerprint": analysis_fingerprint(search_summary, analysis_status),
+            }
+        except Exception as e:
+            db.session.rollback()
+            print(f"--- ERROR: '{company_name}' AI 분석 생성 실패: {e}")
+            values = {"ai_analysis": ANALYSIS_PENDING_MESSAGE}
+        values["analysis_claimed_at"] = None
+        # 생성하는 동안 새 업로드가 분석을 저장했으면 덮어쓰지 않습니다.
+        db.session.execute(
+            update(CompanyInformation)
+            .where(
+                CompanyInformation.id == company_id,
+                CompanyInformation.ai_analysis == ANALYSIS_GENERATING_MESSAGE,
+            )
+            .values(**values)
+        )
+        db.session.commit()
+
+
+def _backfill_pending_analyses(app):
+    """모델 로딩 중에 '대기 중'으로 저장된(또는 분석을 건너뛴) 회사의 AI 분석을 로딩이 끝난 뒤 생성합니다.
+
+    로딩 직전에 분석을 건너뛴 요청이 이 스레드의 조회 뒤에 저장될 수 있으므로, 그런 요청은
+    persist_records에서 request_pending_backfill()로 다시 깨웁니다. 다른 프로세스가 남긴 행을 위해
+    ANALYSIS_BACKFILL_LEASE_SECONDS마다 다시 조회합니다.
+    """
+    if not llm_loader.wait():
+        return
+    while True:
+        _backfill_requested.clear()
+        try:
+            with app.app_context():
+                _backfill_once()
+        except Exception as e:
+            print(f"--- ERROR: 대기 중 AI 분석 생성 실패: {e}")
+        _backfill_requested.wait(ANALYSIS_BACKFILL_LEASE_SECONDS)
+
+
+@stage_timer("commit")
+def persist_records(info, ai_analysis_result, content_hash=None, idempotency_key=None,
+                    company_fields=None, search_fingerprint=None):
+    """추출 정보와 AI 분석 결과를 회사/채용 정보로 upsert하고 (회사 ID, 채용 정보 ID)를 반환합니다.
+
+    company_fields는 미리 변환해 둔 normalize_company_fields(info)의 결과이고,
+    search_fingerprint는 분석의 근거가 된 검색 요약 지문(analysis_fingerprint)입니다.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "저장할 CompanyInformation:\n%s",
+            pformat(
+                company_row(
+                    info,
+                    ai_analysis_result,
+                    datetime.now().year,
+                    company_fields,
+                    search_fingerprint,
+                )
+            ),
+        )
+        logger.debug("저장할 JobInformation:\n%s", pformat(job_row(info, None)))
+    options = {
+        "content_hash": content_hash,
+        "idempotency_key": idempotency_key,
+        "company_fields": company_fields,
+        "search_fingerprint": search_fingerprint,
+    }
+    saved = bulk_upsert([(info, ai_analysis_result, options)])[0]
+    if ai_analysis_result == ANALYSIS_PENDING_MESSAGE and not llm_loader.is_loading:
+        # 로딩 중에 분석을 건너뛰었지만 저장하기 전에 모델이 준비되어 백필 조회를 놓쳤을 수 있습니다.
+        request_pending_backfill()
+    return saved
+
+
+@stage_timer("search")
+def search_summary_for(company_name):
+    """회사명을 검색하여 LLM 프롬프트에 넣을 상위 5개 검색 결과 요약을 만듭니다."""
+    return summarize_search_results(google_search(company_name))
+
+
+def summarize_search_results(search_results):
+    return "\n\n".join(search_results[:5]) if search_results else "검색 결과 없음"
+
+
+def search_fingerprint(search_summary):
+    """공백 차이를 무시한 검색 요약의 SHA-256 지문입니다. 근거가 바뀌었는지 비교할 때 사용합니다."""
+    normalized = " ".join(search_summary.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def analysis_fingerprint(search_summary, analysis_status, existing=None):
+    """저장할 AI 분석의 근거가 된 검색 요약 지문을 반환합니다.
+
+    새로 생성했거나 같은 검색 요약의 캐시를 쓴 분석은 search_summary의 지문, 저장된 회사의
+    분석을 그대로 쓴 경우(existing)는 그 분석의 지문, 대기 중이거나 건너뛴 경우는 None입니다.
+    """
+    if analysis_status in ("done", "cached"):
+        return search_fingerprint(search_summary)
+    if analysis_status == "existing":
+        return existing.search_fingerprint
+    return None
+
+
+def has_analysis(ai_analysis):
+    """'대기 중'이나 건너뛴 표시가 아닌 실제 AI 분석인지 확인합니다."""
+    return ai_analysis not in (
+        None,
+        "",
+        ANALYSIS_PENDING_MESSAGE,
+        ANALYSIS_SKIPPED_MESSAGE,
+        ANALYSIS_GENERATING_MESSAGE,
+    )
+
+
+def reusable_analysis(existing, search_summary):
+    """저장된 회사(find_company의 결과)의 분석이 같은 검색 요약으로 만든 것이면 반환합니다.
 
+    지문이 없는 회사(근거를 알 수 없는 분석)는 다시 생성합니다.
+    """
+    if (
+        existing is not None
+        and has_analysis(existing.ai_analysis)
+        and existing.search_fingerprint == search_fingerprint(search_summary)
+    ):
+        return existing.ai_analysis
+    return None
+
+
+def keep_existing_analysis(existing, ai_analysis_result, analysis_status):
+    """새 분석이 대기 중이거나 건너뛴 경우 저장된 회사의 실제 분석을 덮어쓰지 않도록 그 분석을 씁니다."""
+    if (
+        analysis_status in ("pending", "skipped")
+        and existing is not None
+        and has_analysis(existing.ai_analysis)
+    ):
+        return existing.ai_analysis, "existing"
+    return ai_analysis_result, analysis_status
+
+
+def _is_int(value):
+    """JSON 정수인지 확인합니다. bool은 int의 하위 클래스이므로 true/false는 제외합니다."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _noop_report(stage, status):
+    pass
+
+
+def read_pdf_form(file_name, file_path, workers=None):
+    """PDF에서 채용 의뢰서 양식 텍스트를 읽고 (텍스트, 회사명)을 반환합니다.
+
+    회사명만 먼저 찾으므로, 나머지 필드를 추출하는 동안 회사명으로 검색을 시작할 수 있습니다.
+    실패하면 PipelineError를 발생시킵니다.
+    """
+    with stage_timer("extract"):
+        text = extract_form_text(file_path, workers)
+    if not text.strip():
+        raise PipelineError(f"'{file_name}'에서 텍스트를 추출할 수 없습니다.", 500)
+
+    company_name = extract_company_name(text)
+    if not company_name:
+        raise PipelineError("PDF에서 회사명을 추출할 수 없습니다.", 422)
+    return text, company_name
+
+
+def parse_pdf_info(file_name, text):
+    """양식 텍스트에서 모든 필드를 추출합니다."""
+    with stage_timer("parse"):
+        info = extract_info(text)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("'%s'에서 추출된 정보:\n%s", file_name, pformat(info))
     return info
 
 
+def extract_pdf_info(file_name, file_path, workers=None):
+    """PDF에서 채용 의뢰서 양식을 읽어 필드를 추출합니다. 실패하면 PipelineError를 발생시킵니다."""
+    text, _ = read_pdf_form(file_name, file_path, workers)
+    return parse_pdf_info(file_name, text)
+
+
+_document_locks = {}
+_document_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _document_lock(content_hash):
+    """같은 내용의 PDF를 동시에 처리하지 않도록 해시별 잠금을 잡습니다.
+
+    백엔드가 타임아웃 후 재시도하면 두 번째 요청은 첫 요청이 끝날 때까지 기다렸다가
+    저장된 결과를 받습니다. 기다리는 요청이 없으면 잠금을 지웁니다.
+    """
+    with _document_locks_guard:
+        entry = _document_locks.setdefault(content_hash, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _document_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _document_locks[content_hash]
+
+
+def find_processed_document(content_hash, idempotency_key=None):
+    """find_processed_job과 같지만, Idempotency-Key가 다른 내용의 문서에 쓰였으면 409 PipelineError를 발생시킵니다."""
+    try:
+        return find_processed_job(content_hash, idempotency_key)
+    except IdempotencyKeyConflict:
+        raise PipelineError(
+            "같은 Idempotency-Key로 다른 내용의 문서가 이미 처리되었습니다.", 409
+        ) from None
+
+
+def _duplicate_result(existing):
+    company_id, job_information_id = existing
+    return {"companyId": company_id, "jobInformationId": job_information_id, "duplicate": True}
+
+
+def iter_pdf_pipeline(file_name, file_path, report=_noop_report, stream_tokens=False,
+                      content_hash=None, idempotency_key=None):
+    """PDF 한 건을 추출 → 검색/조회 → 분석 → 저장 단계로 처리하며 (이벤트, 데이터)를 내보냅니다.
+
+    이벤트는 extracted(추출 정보), token(stream_tokens일 때 분석 토큰 조각),
+    analysis(전체 분석 결과), saved(저장된 ID와 단계별 시간) 순서입니다. report(stage, status)로
+    각 단계의 시작과 종료를 알리며, 클라이언트 오류는 PipelineError로 발생시킵니다.
+    같은 내용(content_hash, 생략하면 파일에서 계산)이나 같은 idempotency_key로 이미
+    저장된 문서라면 다른 단계 없이 기존 ID와 "duplicate": true를 담은 saved 이벤트만 보냅니다.
+    애플리케이션 컨텍스트 안에서 호출해야 합니다.
+    """
+    content_hash = content_hash or file_sha256(file_path)
+    with _document_lock(content_hash):
+        existing = find_processed_document(content_hash, idempotency_key)
+        if existing:
+            logger.info("'%s'은(는) 이미 처리된 문서입니다 (jobInformationId=%s)", file_name, existing[1])
+            yield "saved", _duplicate_result(existing)
+            return
+        # 단계마다 별도의 세션을 쓰므로, 요청의 세션이 LLM 생성 동안 연결을 붙잡지 않도록 반납합니다.
+        db.session.close()
+        yield from _iter_pdf_stages(
+            file_name, file_path, report, stream_tokens, content_hash, idempotency_key
+        )
+
+
+def _in_app_context(app, func):
+    """단계 함수를 스레드 풀에서 애플리케이션 컨텍스트(단계마다 별도의 DB 세션) 안에서 실행합니다."""
+
+    def run(results, emit):
+        with app.app_context():
+            try:
+                return func(results, emit)
+            except Exception:
+                db.session.rollback()
+                raise
+
+    return run
+
+
+def _analysis_stage_status(analysis):
+    return "done" if analysis[1] in ("done", "cached", "existing") else "skipped"
+
+
+def _iter_pdf_stages(file_name, file_path, report, stream_tokens, content_hash, idempotency_key):
+    """PDF 한 건의 단계를 StageGraph로 실행합니다.
+
+    회사명이 나오면 나머지 필드 추출(parse), Serper 검색(search), 기존 회사 조회(lookup)가
+    동시에 시작되고, 날짜 정규화(normalize)는 LLM 분석(analyze)과 동시에 실행됩니다.
+    analyze는 extracted 이벤트가 먼저 나가도록 parse도 기다립니다. saved 이벤트에는
+    단계별 시간과 임계 경로(timings)를 담습니다.
+    """
+
+    def extract(results, emit):
+        return read_pdf_form(file_name, file_path)
+
+    def parse(results, emit):
+        info = parse_pdf_info(file_name, results["extract"][0])
+        emit("extracted", {"companyName": info["company_name"], "info": info})
+        return info
+
+    def search(results, emit):
+        return search_summary_for(results["extract"][1])
+
+    def lookup(results, emit):
+        return find_company(results["extract"][1])
+
+    def normalize(results, emit):
+        return normalize_company_fields(results["parse"])
+
+    def analyze(results, emit):
+        company_name = results["extract"][1]
+        search_summary = results["search"]
+        existing = results["lookup"]
+        reused = reusable_analysis(existing, search_summary)
+        if reused is not None:
+            logger.info("'%s'의 저장된 AI 분석을 사용합니다 (검색 근거 동일)", company_name)
+            ai_analysis_result, analysis_status = reused, "existing"
+        elif stream_tokens:
+            ai_analysis_result, analysis_status = emit_from(
+                stream_company_analysis(company_name, search_summary), emit
+            )
+        else:
+            ai_analysis_result, analysis_status = analyze_company(company_name, search_summary)
+        ai_analysis_result, analysis_status = keep_existing_analysis(
+            existing, ai_analysis_result, analysis_status
+        )
+        emit("analysis", {"analysisStatus": analysis_status, "aiAnalysis": ai_analysis_result})
+        logger.debug("'%s' AI 분석 결과 (%s):\n%s", file_name, analysis_status, ai_analysis_result)
+        fingerprint = analysis_fingerprint(search_summary, analysis_status, existing)
+        return ai_analysis_result, analysis_status, fingerprint
+
+    def persist(results, emit):
+        ai_analysis_result, analysis_status, fingerprint = results["analyze"]
+        try:
+            company_id, job_information_id = persist_records(
+                results["parse"],
+                ai_analysis_result,
+                content_hash,
+                idempotency_key,
+                company_fields=results["normalize"],
+                search_fingerprint=fingerprint,
+            )
+        except IntegrityError:
+            # 다른 워커 프로세스가 같은 문서를 먼저 저장한 경우입니다.
+            db.session.rollback()
+            existing = find_processed_document(content_hash, idempotency_key)
+            if not existing:
+                raise
+            return _duplicate_result(existing)
+        logger.info("'%s' 처리 및 DB 저장 완료 (companyId=%s)", file_name, company_id)
+        return {
+            "companyId": company_id,
+            "jobInformationId": job_information_id,
+            "analysisStatus": analysis_status,
+            "duplicate": False,
+        }
+
+    app = current_app._get_current_object()
+    graph = StageGraph(report)
+    graph.add("extract", _in_app_context(app, extract))
+    graph.add("parse", _in_app_context(app, parse), deps=("extract",))
+    graph.add("search", _in_app_context(app, search), deps=("extract",))
+    graph.add("lookup", _in_app_context(app, lookup), deps=("extract",))
+    graph.add("normalize", _in_app_context(app, normalize), deps=("parse",))
+    graph.add(
+        "analyze",
+        _in_app_context(app, analyze),
+        deps=("parse", "search", "lookup"),
+        done_status=_analysis_stage_status,
+        executor=shared_executor("analyze", ANALYZE_STAGE_WORKERS),
+    )
+    graph.add("persist", _in_app_context(app, persist), deps=("analyze", "normalize"))
+    results = yield from graph.run()
+
+    timings = graph.timings()
+    metrics.pipeline_time.observe(timings["criticalPathMs"] / 1000, "critical_path")
+    metrics.pipeline_time.observe(timings["serialMs"] / 1000, "serial")
+    logger.info(
+        "'%s' 임계 경로 %s: %.1fms (단계 시간 합 %.1fms)",
+        file_name,
+        " → ".join(timings["criticalPath"]),
+        timings["criticalPathMs"],
+        timings["serialMs"],
+    )
+    yield "saved", {**results["persist"], "timings": timings}
+
+
+def run_pdf_pipeline(file_name, file_path, report=_noop_report, content_hash=None,
+                     idempotency_key=None):
+    """iter_pdf_pipeline을 끝까지 실행하고 저장 결과(saved 이벤트의 데이터)를 반환합니다."""
+    for _, data in iter_pdf_pipeline(
+        file_name, file_path, report, content_hash=content_hash, idempotency_key=idempotency_key
+    ):
+        result = data
+    return result
+
+
+def _stream_pdf_pipeline(file_name, file_path, idempotency_key=None):
+    """파이프라인 이벤트를 SSE 문자열로 변환합니다. 오류는 error 이벤트로 보냅니다."""
+    try:
+        for event, data in iter_pdf_pipeline(
+            file_name, file_path, stream_tokens=True, idempotency_key=idempotency_key
+        ):
+            yield sse_event(event, data)
+    except PipelineError as e:
+        db.session.rollback()
+        yield sse_event("error", {"message": e.message, "statusCode": e.status_code})
+    except Exception as e:
+        db.session.rollback()
+        print(f"--- ERROR: '{file_name}' 스트리밍 처리 중 예외 발생: {e}")
+        yield sse_event(
+            "error",
+            {"message": f"예상치 못한 오류가 발생했습니다: {str(e)}", "statusCode": 500},
+        )
+
+
+def _run_job(app, payload, report):
+    """작업 큐 워커에서 애플리케이션 컨텍스트를 열고 파이프라인을 실행합니다."""
+    with app.app_context():
+        try:
+            return run_pdf_pipeline(
+                payload["fileName"],
+                payload["filePath"],
+                report,
+                content_hash=payload.get("contentHash"),
+                idempotency_key=payload.get("idempotencyKey"),
+            )
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+def _configure_logging():
+    """dbase.* 로거만 LOG_LEVEL로 설정합니다. 다른 라이브러리의 로그 수준은 바꾸지 않습니다."""
+    base_logger = logging.getLogger("dbase")
+    if not base_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+        )
+        base_logger.addHandler(handler)
+        base_logger.propagate = False
+    base_logger.setLevel(LOG_LEVEL)
+
+
 # ---------- 애플리케이션 팩토리 함수 ----------
-def create_app():
-    """Flask 애플리케이션 인스턴스를 생성하고 설정합니다."""
+def create_app(load_llm=True):
+    """Flask 애플리케이션 인스턴스를 생성하고 설정합니다.
+
+    load_llm이 True이면 LLM을 백그라운드에서 불러오기 시작하고 즉시 반환합니다.
+    DB 초기화 같은 도구에서는 load_llm=False로 호출하여 모델을 건드리지 않습니다.
+    """
     app = Flask(__name__)
+    _configure_logging()
 
     if not DB_URL or not SERPER_KEY:
         raise ValueError(
@@ -116,42 +836,65 @@ def create_app():
 
     app.config["SQLALCHEMY_DATABASE_URI"] = DB_URL
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(DB_URL)
     CORS(app)
 
     db.init_app(app)
     migrate.init_app(app, db)
 
-    global llm_pipeline
-    if torch_import and SERPER_KEY:
-        try:
-            tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
-            model = AutoModelForCausalLM.from_pretrained(
-                MODEL_ID,
-                device_map="auto" if torch.cuda.is_available() else "cpu",
-                torch_dtype=(
-                    torch.float16 if torch.cuda.is_available() else torch.float32
-                ),
-                low_cpu_mem_usage=True,
-            )
-            llm_pipeline = pipeline(
-                "text-generation",
-                model=model,
-                tokenizer=tokenizer,
-                max_new_tokens=1024,
-                do_sample=True,
-                temperature=0.5,
+    global analysis_cache
+    analysis_cache = AnalysisCache(
+        ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS,
+        max_entries=ANALYSIS_CACHE_MAX_ENTRIES,
+    )
+    if load_llm:
+        if LLM_SOCKET:
+            use_inference_server(LLM_SOCKET)
+        llm_loader.start()
+        threading.Thread(
+            target=_backfill_pending_analyses,
+            args=(app,),
+            name="llm-pending-backfill",
+            daemon=True,
+        ).start()
+
+    job_queue = JobQueue(
+        app,
+        handler=lambda payload, report: _run_job(app, payload, report),
+        num_workers=JOB_WORKERS,
+    )
+    app.extensions["job_queue"] = job_queue
+
+    @app.before_request
+    def _start_request_timer():
+        g.request_started = time.perf_counter()
+        # 작업 큐 워커는 요청을 처리하는 서버에서만 시작합니다 (init_db 등 도구에서는 시작하지 않음).
+        job_queue.start()
+
+    @app.after_request
+    def _record_request_metrics(response):
+        started = g.pop("request_started", None)
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.http_requests.inc(request.method, endpoint, str(response.status_code))
+        if response.status_code >= 400:
+            metrics.http_errors.inc(str(response.status_code))
+        if started is not None:
+            metrics.http_duration.observe(
+                time.perf_counter() - started, request.method, endpoint
             )
-            print("--- INFO: LLM 파이프라인 로딩 성공.")
-        except Exception as e:
-            print(f"--- ERROR: LLM 파이프라인 로딩 실패: {e}")
-            llm_pipeline = None
+        return response
 
     @app.route("/api/process-pdf", methods=["POST"])
     def process_pdf_api():
-        """PDF 파일을 처리하여 회사 및 채용 정보를 추출하고 DB에 저장합니다."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"\n[{timestamp}] === [START] /api/process-pdf 요청 수신 ===")
+        """PDF 파일을 처리하여 회사 및 채용 정보를 추출하고 DB에 저장합니다.
 
+        요청 본문에 "async": true를 넣으면 작업을 큐에 등록하고 즉시 202와 작업 ID를
+        반환합니다. 진행 상황은 GET /api/jobs/<id>로 조회합니다.
+        "stream": true를 넣으면 추출 정보, 분석 토큰, 저장된 ID를 Server-Sent Events로
+        생성되는 즉시 보냅니다.
+        이미 처리한 내용의 PDF이거나 같은 Idempotency-Key 헤더로 처리한 요청이면 다시
+        처리하지 않고 200과 저장된 ID("duplicate": true)를 반환합니다.
+        """
         if not request.is_json:
             return (
                 jsonify(
@@ -166,9 +909,7 @@ def create_app():
         data = request.get_json()
         file_name = data.get("fileName")
 
-        print(
-            f"[{timestamp}] [INFO] 요청 데이터: fileName='{file_name}'"
-        )
+        logger.info("/api/process-pdf 요청 수신: fileName='%s'", file_name)
 
         if not file_name:
             return (
@@ -179,7 +920,7 @@ def create_app():
             )
 
         file_path = os.path.join(UPLOAD_JOB_INFO_ROOT, file_name)
-        print(f"[{timestamp}] [INFO] 접근할 파일 경로: {file_path}")
+        logger.debug("접근할 파일 경로: %s", file_path)
 
         if not os.path.exists(file_path):
             return (
@@ -192,148 +933,57 @@ def create_app():
                 404,
             )
 
-        try:
-            text = extract_text(file_path)
-            if not text.strip():
-                return (
-                    jsonify(
-                        {
-                            "status": "error",
-                            "message": f"'{file_name}'에서 텍스트를 추출할 수 없습니다.",
-                        }
-                    ),
-                    500,
-                )
-
-            info = extract_info(text)
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{timestamp}] --- [DEBUG] PDF에서 추출된 정보 (info) ---")
-            pprint.pprint(info)
-            print(f"[{timestamp}] ------------------------------------------")
-
-            if not info.get("company_name"):
-                return (
-                    jsonify(
-                        {
-                            "status": "error",
-                            "message": "PDF에서 회사명을 추출할 수 없습니다.",
-                        }
-                    ),
-                    422,
-                )
-
-            search_results = google_search(info.get("company_name"))
-            search_summary = (
-                "\n\n".join(search_results[:5]) if search_results else "검색 결과 없음"
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if data.get("stream"):
+            return Response(
+                stream_with_context(
+                    _stream_pdf_pipeline(file_name, file_path, idempotency_key)
+                ),
+                mimetype="text/event-stream",
+                headers=SSE_HEADERS,
             )
 
-            ai_analysis_result = "LLM 미설정 또는 회사명 누락으로 AI 분석을 건너뜁니다."
-            print(info.get("company_name"))
-            if llm_pipeline and info.get("company_name"):
-                llm_prompt = f"다음 정보를 바탕으로 '{info['company_name']}'의 기업 분석 보고서를 작성해줘. 회사의 주력 사업, 사용하는 기술, 성장 가능성에 초점을 맞춰 전문가 관점에서 간결하게 요약해줘(200자 내외). 불필요한 인사말이나 **마크다운 문법** 제외하고 핵심 내용만 포함해줘.\n\n## 웹 검색 결과 요약:\n{search_summary}\n\n## 기업 분석 보고서:"
-                ai_result = llm_pipeline(llm_prompt, return_full_text=False)
-                ai_analysis_result = ai_result[0]["generated_text"].strip()
-
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{timestamp}] --- [DEBUG] AI 분석 결과 ---")
-            print(ai_analysis_result)
-            print(f"[{timestamp}] ----------------------------")
-
-            company = CompanyInformation.query.filter_by(
-                company_name=info["company_name"]
-            ).first()
-            if not company:
-                company = CompanyInformation(company_name=info["company_name"])
-                db.session.add(company)
-
-            company.year = datetime.now().year
-
-            deadline_str = info.get("application_deadline")
-            if deadline_str:
-                try:
-                    date_match = re.search(
-                        r"(\d{4}년\s*\d{1,2}월\s*\d{1,2}일)", deadline_str
-                    )
-                    if date_match:
-                        clean_deadline_str = date_match.group(1).replace(" ", "")
-                        company.deadline = datetime.strptime(
-                            clean_deadline_str, "%Y년%m월%d일"
-                        ).date()
-                    else:
-                        company.deadline = None
-                except ValueError:
-                    company.deadline = None
-            else:
-                company.deadline = None
-
+        content_hash = file_sha256(file_path)
+        if data.get("async"):
             try:
-                company.establishment_year = (
-                    int(info.get("established").split(".")[0])
-                    if info.get("established")
-                    else None
-                )
-            except (ValueError, TypeError, IndexError, AttributeError):
-                company.establishment_year = None
-
-            company.business_type = info.get("business_type")
-            company.employee_count = info.get("num_employees")
-            company.main_business = info.get("main_business")
-            company.website = info.get("website")
-            company.address = info.get("location")
-            company.ai_analysis = ai_analysis_result
-
-            job_posting = JobInformation(
-                company=company,
-                job_title=info.get("job_category"),
-                recruitment_count=info.get("positions"),
-                job_description=info.get("job_description"),
-                qualifications=info.get("qualifications"),
-                working_hours=info.get("work_hours"),
-                work_type=info.get("employment_type"),
-                internship_pay=info.get("intern_stipend"),
-                salary=info.get("salary"),
-                additional_requirements=info.get("other_requirements"),
+                existing = find_processed_document(content_hash, idempotency_key)
+            except PipelineError as e:
+                return jsonify({"status": "error", "message": e.message}), e.status_code
+            if existing:
+                return _duplicate_response(file_name, _duplicate_result(existing))
+            job_id = job_queue.submit(
+                {
+                    "fileName": file_name,
+                    "filePath": file_path,
+                    "contentHash": content_hash,
+                    "idempotencyKey": idempotency_key,
+                }
             )
-            db.session.add(job_posting)
-
-            # --- [중요] DB 저장 직전 데이터 로깅 ---
-            company_data_to_save = {
-                k: v for k, v in company.__dict__.items() if not k.startswith("_")
-            }
-            job_data_to_save = {
-                k: v for k, v in job_posting.__dict__.items() if not k.startswith("_")
-            }
-
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{timestamp}] --- [COMMIT] 데이터베이스에 저장될 최종 데이터 ---")
-            print("\n[COMMIT] CompanyInformation:")
-            pprint.pprint(company_data_to_save)
-            print("\n[COMMIT] JobInformation:")
-            pprint.pprint(job_data_to_save)
-            print(f"[{timestamp}] --------------------------------------------------")
-
-            db.session.commit()
-
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{timestamp}] === [SUCCESS] '{file_name}' 처리 및 DB 저장 완료 ===")
-
+            logger.info("작업 큐 등록: jobId='%s'", job_id)
+            status_url = url_for("job_status_api", job_id=job_id)
             return (
                 jsonify(
                     {
-                        "status": "success",
-                        "message": f"'{file_name}' 파일이 성공적으로 처리되어 데이터베이스에 저장되었습니다.",
+                        "status": "accepted",
+                        "message": f"'{file_name}' 파일 처리 작업이 등록되었습니다.",
+                        "jobId": job_id,
+                        "statusUrl": status_url,
                     }
                 ),
-                201,
+                202,
+                {"Location": status_url},
             )
 
+        try:
+            result = run_pdf_pipeline(
+                file_name, file_path, content_hash=content_hash, idempotency_key=idempotency_key
+            )
+        except PipelineError as e:
+            db.session.rollback()
+            return jsonify({"status": "error", "message": e.message}), e.status_code
         except Exception as e:
             db.session.rollback()
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{timestamp}] !!! [ERROR] '{file_name}' 처리 중 예외 발생: {e} !!!")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("'%s' 처리 중 예외 발생: %s", file_name, e)
             return (
                 jsonify(
                     {
@@ -344,9 +994,306 @@ def create_app():
                 500,
             )
 
+        if result["duplicate"]:
+            return _duplicate_response(file_name, result)
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "message": f"'{file_name}' 파일이 성공적으로 처리되어 데이터베이스에 저장되었습니다.",
+                    **result,
+                }
+            ),
+            201,
+        )
+
+    def _duplicate_response(file_name, result):
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "message": f"'{file_name}'은(는) 이미 처리된 문서입니다. 저장된 결과를 반환합니다.",
+                    **result,
+                }
+            ),
+            200,
+        )
+
+    @app.route("/api/llm-status", methods=["GET"])
+    def llm_status_api():
+        """LLM 모델의 로딩 상태(loading, ready, failed, disabled)와 접두어 캐시, 생성 정책 상태를 반환합니다."""
+        return jsonify({"status": "success", **llm_status()}), 200
+
+    @app.route("/api/jobs/<job_id>", methods=["GET"])
+    def job_status_api(job_id):
+        """비동기 PDF 처리 작업의 단계별 진행 상황을 반환합니다."""
+        job = job_queue.get(job_id)
+        if job is None:
+            return (
+                jsonify(
+                    {"status": "error", "message": f"작업을 찾을 수 없습니다: {job_id}"}
+                ),
+                404,
+            )
+        return (
+            jsonify(
+                {
+                    "jobId": job["id"],
+                    "status": job["status"],
+                    "fileName": job["payload"]["fileName"],
+                    "queuePosition": job["queue_position"],
+                    "stages": {
+                        stage: {
+                            "status": entry["status"],
+                            "startedAt": entry["started_at"],
+                            "finishedAt": entry["finished_at"],
+                        }
+                        for stage, entry in job["stages"].items()
+                    },
+                    "result": job["result"],
+                    "error": job["error"],
+                    "createdAt": job["created_at"],
+                    "startedAt": job["started_at"],
+                    "finishedAt": job["finished_at"],
+                }
+            ),
+            200,
+        )
+
+    @app.route("/api/companies", methods=["GET"])
+    def companies_api():
+        """회사 목록을 최신순으로 조회합니다.
+
+        필터: year, businessType, minEmployees, maxEmployees, deadlineFrom, deadlineTo,
+        q(회사명). limit(기본값 20, 최대 100)개씩 반환하며, 다음 페이지는 응답의
+        nextCursor를 cursor로 넘겨 조회합니다.
+        """
+        try:
+            items, next_cursor = list_companies(request.args)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        return jsonify({"status": "success", "items": items, "nextCursor": next_cursor}), 200
+
+    @app.route("/api/job-postings", methods=["GET"])
+    def job_postings_api():
+        """채용 공고 목록을 최신순으로 조회합니다.
+
+        /api/companies의 회사 필터와 companyId, q(직무명 또는 자격 요건)를 지원합니다.
+        """
+        try:
+            items, next_cursor = list_job_postings(request.args)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        return jsonify({"status": "success", "items": items, "nextCursor": next_cursor}), 200
+
+    @app.route("/api/job-matches", methods=["POST"])
+    def job_matches_api():
+        """학생들의 기술/희망 직무/경험 기술과 가장 잘 맞는 채용 공고를 학생별로 k개씩 반환합니다.
+
+        요청 본문: {"userIds": [1, 2, ...], "k": 10}. 학급 전체(수백 명)도 한 번의 행렬 곱으로
+        계산합니다. 인덱스는 요청마다 새로 저장된 공고만 읽어 갱신합니다.
+        """
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            data = {}
+        user_ids = data.get("userIds")
+        k = data.get("k", 10)
+        if (
+            not isinstance(user_ids, list)
+            or not user_ids
+            or not all(_is_int(user_id) for user_id in user_ids)
+        ):
+            return jsonify({"status": "error", "message": "userIds는 정수 ID 목록이어야 합니다."}), 400
+        if len(user_ids) > MATCHING_MAX_USERS:
+            return (
+                jsonify(
+                    {
+                        "status": "error",
+                        "message": f"한 번에 최대 {MATCHING_MAX_USERS}명까지 요청할 수 있습니다.",
+                    }
+                ),
+                400,
+            )
+        if not _is_int(k) or not 1 <= k <= MATCHING_MAX_K:
+            return (
+                jsonify({"status": "error", "message": f"k는 1~{MATCHING_MAX_K} 사이의 정수여야 합니다."}),
+                400,
+            )
+
+        job_index.sync()
+        user_ids = list(dict.fromkeys(user_ids))
+        texts = student_texts(user_ids)
+        ranked = job_index.top_k([texts[user_id] for user_id in user_ids], k)
+        jobs = job_summaries({job_id for matches in ranked for job_id, _ in matches})
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "indexedJobs": len(job_index),
+                    "matches": [
+                        {
+                            "userId": user_id,
+                            "jobs": [
+                                {**jobs[job_id], "score": round(score, 4)}
+                                for job_id, score in matches
+                                if job_id in jobs
+                            ],
+                        }
+                        for user_id, matches in zip(user_ids, ranked)
+                    ],
+                }
+            ),
+            200,
+        )
+
+    @app.route("/api/admin/analysis-cache", methods=["GET"])
+    def analysis_cache_stats_api():
+        """AI 분석 캐시의 적중/실패 횟수와 저장된 항목 수를 반환합니다."""
+        denied = admin_auth_error(request.headers.get("X-Admin-Key"))
+        if denied:
+            return jsonify({"status": "error", "message": denied[0]}), denied[1]
+        return jsonify({"status": "success", **analysis_cache.stats()}), 200
+
+    @app.route("/api/admin/search-cache", methods=["GET"])
+    def search_cache_stats_api():
+        """Serper 검색 결과 캐시의 적중/실패 횟수와 저장된 항목 수를 반환합니다."""
+        denied = admin_auth_error(request.headers.get("X-Admin-Key"))
+        if denied:
+            return jsonify({"status": "error", "message": denied[0]}), denied[1]
+        if search_cache is None:
+            return jsonify({"status": "success", "backend": "none"}), 200
+        return jsonify({"status": "success", **search_cache.stats()}), 200
+
+    @app.route("/api/admin/http-clients", methods=["GET"])
+    def http_clients_stats_api():
+        """외부 API(Serper 등) 호출 수, 오류/재시도 횟수, 지연 시간을 반환합니다."""
+        denied = admin_auth_error(request.headers.get("X-Admin-Key"))
+        if denied:
+            return jsonify({"status": "error", "message": denied[0]}), denied[1]
+        return jsonify({"status": "success", "clients": client_stats()}), 200
+
+    @app.route("/api/admin/db-pool", methods=["GET"])
+    def db_pool_stats_api():
+        """DB 연결 풀의 사용 중/유휴 연결 수, 대기 시간, overflow 발생 횟수를 반환합니다."""
+        denied = admin_auth_error(request.headers.get("X-Admin-Key"))
+        if denied:
+            return jsonify({"status": "error", "message": denied[0]}), denied[1]
+        return jsonify({"status": "success", **pool_status(db.engine)}), 200
+
+    @app.route("/api/admin/analysis-cache/<path:company_name>", methods=["DELETE"])
+    def analysis_cache_invalidate_api(company_name):
+        """한 회사의 AI 분석 캐시를 무효화하여 다음 업로드 시 다시 생성되게 합니다."""
+        denied = admin_auth_error(request.headers.get("X-Admin-Key"))
+        if denied:
+            return jsonify({"status": "error", "message": denied[0]}), denied[1]
+        deleted = analysis_cache.invalidate_company(company_name)
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "message": f"'{company_name}'의 AI 분석 캐시 {deleted}건을 삭제했습니다.",
+                    "deleted": deleted,
+                }
+            ),
+            200,
+        )
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics_api():
+        """단계별 소요 시간, 요청/오류 수, 연결 풀과 외부 API 지표를 Prometheus 형식으로 반환합니다."""
+        return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    metrics.register_collector("runtime", lambda: _collect_runtime_metrics(app))
     return app
 
 
+def prefix_cache_status():
+    if prefix_generator is None:
+        return {"enabled": False}
+    return prefix_generator.status()
+
+
+def llm_status():
+    if isinstance(llm_loader, InferenceClient):
+        # 접두어 캐시와 생성 정책은 추론 서버의 상태에 포함되어 있습니다.
+        return llm_loader.status()
+    return {
+        **llm_loader.status(),
+        "prefixCache": prefix_cache_status(),
+        "generationPolicy": generation_policy.status() if generation_policy else None,
+    }
+
+
+def _collect_runtime_metrics(app):
+    """/metrics 조회 시점의 LLM 상태, 작업 큐, DB 연결 풀, 외부 API 클라이언트 지표를 만듭니다."""
+    llm_state = llm_loader.status()["state"]
+    families = [
+        (
+            "dbase_llm_state",
+            "gauge",
+            "LLM 로딩 상태 (현재 상태만 1)",
+            [
+                ({"state": state}, int(state == llm_state))
+                for state in ("loading", "ready", "failed", "disabled")
+            ],
+        ),
+        (
+            "dbase_analysis_cache_lookups_total",
+            "counter",
+            "AI 분석 캐시 조회 수",
+            [
+                ({"result": "hit"}, analysis_cache.hits),
+                ({"result": "miss"}, analysis_cache.misses),
+            ],
+        ),
+    ]
+    if prefix_generator is not None:
+        prefix_status = prefix_generator.status()
+        families.extend(
+            [
+                (
+                    "dbase_llm_prefix_cache_calls_total",
+                    "counter",
+                    "프롬프트 접두어 KV 캐시를 재사용한 생성 수",
+                    [({}, prefix_status["calls"])],
+                ),
+                (
+                    "dbase_llm_prefix_prefill_saved_seconds_total",
+                    "counter",
+                    "접두어 KV 캐시 재사용으로 절약한 prefill 시간 합계",
+                    [({}, prefix_status["prefillSecondsSavedTotal"])],
+                ),
+            ]
+        )
+
+    with app.app_context():
+        pool = pool_status(db.engine)
+    families.append(
+        (
+            "dbase_db_pool_connections",
+            "gauge",
+            "DB 연결 풀의 연결 수",
+            [
+                ({"state": key}, pool[key])
+                for key in ("checkedOut", "idle", "overflow")
+                if key in pool
+            ],
+        )
+    )
+
+    clients = {stats["name"]: stats for stats in client_stats()}
+    for name, doc, key, kind in (
+        ("dbase_external_api_calls_total", "외부 API 호출 수", "calls", "counter"),
+        ("dbase_external_api_errors_total", "외부 API 호출 오류 수", "errors", "counter"),
+        ("dbase_external_api_retries_total", "외부 API 재시도 수", "retries", "counter"),
+        ("dbase_external_api_in_flight", "진행 중인 외부 API 호출 수", "inFlight", "gauge"),
+    ):
+        families.append(
+            (name, kind, doc, [({"client": client}, stats[key]) for client, stats in clients.items()])
+        )
+    return families
+
+
 # ---------- 애플리케이션 실행 ----------
 if __name__ == "__main__":
     app = create_app()
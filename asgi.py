@@ -0,0 +1,382 @@
+"""외부 API 호출이 많은 엔드포인트를 asyncio로 처리하는 ASGI 서버입니다 (starlette, httpx 필요).
+
+Flask 앱(app.py, roadmap.py)은 Serper/Gemini 응답을 기다리는 동안 워커 스레드 하나를
+붙잡고 있지만, 여기서는 이벤트 루프 하나가 여러 외부 호출을 동시에 기다립니다.
+PDF 파싱은 프로세스 풀에서, LLM 생성과 DB 저장은 스레드 풀에서 실행합니다.
+
+실행:
+    uvicorn asgi:app --port 3000           # app.py의 /api/process-pdf 등
+    uvicorn asgi:roadmap_app --port 5000   # roadmap.py의 /generate_roadmap
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import httpx
+from sqlalchemy.exc import IntegrityError
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import app as pdf_service
+from admin_auth import admin_auth_error
+import metrics
+import roadmap
+from gemini_client import AsyncGeminiClient, GeminiError
+from http_client import AsyncHttpClient, client_stats
+from pdf_reader import file_sha256
+from persistence import find_company, normalize_company_fields
+
+# PDF 파싱 프로세스 수와 LLM 생성/DB 저장용 스레드 수
+ASGI_PDF_WORKERS = int(os.getenv("ASGI_PDF_WORKERS", str(os.cpu_count() or 2)))
+ASGI_BLOCKING_WORKERS = int(os.getenv("ASGI_BLOCKING_WORKERS", "32"))
+
+
+class RequestMetricsMiddleware(BaseHTTPMiddleware):
+    """app.py의 after_request 훅과 같은 HTTP 요청/오류 지표를 기록합니다."""
+
+    async def dispatch(self, request, call_next):
+        started = time.perf_counter()
+        response = await call_next(request)
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", None) or "unmatched"
+        metrics.http_requests.inc(request.method, endpoint, str(response.status_code))
+        if response.status_code >= 400:
+            metrics.http_errors.inc(str(response.status_code))
+        metrics.http_duration.observe(time.perf_counter() - started, request.method, endpoint)
+        return response
+
+
+MIDDLEWARE = [
+    Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]),
+    Middleware(RequestMetricsMiddleware),
+]
+
+
+def _error(message, status_code):
+    return JSONResponse({"status": "error", "message": message}, status_code=status_code)
+
+
+async def _json_object(request):
+    """요청 본문의 JSON 객체를 반환합니다. JSON 객체가 아니면 None입니다."""
+    try:
+        data = await request.json()
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+# ---------- PDF 처리 서비스 (app.py) ----------
+serper_async_client = None
+_flask_app = None
+_pdf_executor = None
+_blocking_executor = None
+_document_locks = {}
+
+
+async def search_summary_async(company_name, num=5):
+    """search_summary_for의 비동기 버전입니다. 검색 결과 캐시는 app.py와 공유합니다."""
+    if not company_name or not pdf_service.SERPER_KEY:
+        return pdf_service.summarize_search_results([])
+    cache = pdf_service.search_cache
+    cache_key = pdf_service.search_cache_key(company_name, num)
+    cached = cache.get(cache_key) if cache is not None else None
+    if cached is not None:
+        return pdf_service.summarize_search_results(cached)
+
+    headers = {"X-API-KEY": pdf_service.SERPER_KEY, "Content-Type": "application/json"}
+    try:
+        r = await serper_async_client.post(
+            pdf_service.SERPER_URL, json={"q": company_name, "num": num}, headers=headers
+        )
+        r.raise_for_status()
+        results = pdf_service.format_search_results(r.json())
+    except Exception as e:
+        print(f"--- ERROR: Google 검색 실패: {e}")
+        return pdf_service.summarize_search_results([])
+
+    if cache is not None:
+        cache.set(cache_key, results)
+    return pdf_service.summarize_search_results(results)
+
+
+def _in_app_context(func, *args):
+    """(스레드 풀) DB를 사용하는 함수를 Flask 애플리케이션 컨텍스트 안에서 실행합니다."""
+    with _flask_app.app_context():
+        try:
+            return func(*args)
+        except Exception:
+            pdf_service.db.session.rollback()
+            raise
+
+
+async def _run_blocking(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(
+        _blocking_executor, _in_app_context, func, *args
+    )
+
+
+async def _timed_search(company_name):
+    with metrics.stage_timer("search"):
+        return await search_summary_async(company_name)
+
+
+def _duplicate_response(file_name, existing):
+    company_id, job_information_id = existing
+    return JSONResponse(
+        {
+            "status": "success",
+            "message": f"'{file_name}'은(는) 이미 처리된 문서입니다. 저장된 결과를 반환합니다.",
+            "companyId": company_id,
+            "jobInformationId": job_information_id,
+            "duplicate": True,
+        }
+    )
+
+
+async def process_pdf(request):
+    """app.py의 /api/process-pdf와 같은 요청/응답 형식으로 PDF 한 건을 처리합니다.
+
+    작업 큐("async")와 SSE 스트리밍("stream")은 Flask 앱에서만 지원하므로 400을 반환합니다.
+    """
+    data = await _json_object(request)
+    if data is None:
+        return _error("요청 본문은 JSON 객체여야 합니다.", 400)
+    unsupported = [flag for flag in ("async", "stream") if data.get(flag)]
+    if unsupported:
+        return _error(
+            f"ASGI 서버는 {', '.join(unsupported)} 옵션을 지원하지 않습니다. Flask 앱(app.py)을 사용하세요.",
+            400,
+        )
+    file_name = data.get("fileName")
+    if not file_name:
+        return _error("fileName은 필수입니다.", 400)
+    file_path = os.path.join(pdf_service.UPLOAD_JOB_INFO_ROOT, file_name)
+    if not os.path.exists(file_path):
+        return _error(f"지정된 경로에 파일이 없습니다: {file_path}", 404)
+
+    idempotency_key = request.headers.get("Idempotency-Key")
+    content_hash = await asyncio.to_thread(file_sha256, file_path)
+    # app.py의 _document_lock과 같이 같은 내용의 PDF는 한 번에 하나만 처리합니다.
+    entry = _document_locks.setdefault(content_hash, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            return await _process_pdf_document(
+                file_name, file_path, content_hash, idempotency_key
+            )
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _document_locks[content_hash]
+
+
+async def _process_pdf_document(file_name, file_path, content_hash, idempotency_key):
+    loop = asyncio.get_running_loop()
+    try:
+        existing = await _run_blocking(
+            pdf_service.find_processed_document, content_hash, idempotency_key
+        )
+        if existing:
+            return _duplicate_response(file_name, existing)
+        # 이미 프로세스 풀 안에서 실행되므로 페이지 병렬 추출은 사용하지 않습니다.
+        # 워커 프로세스에서 기록한 extract/parse 지표는 이 프로세스로 돌아오지 않으므로
+        # 두 단계를 합친 시간을 extract로 기록합니다.
+        with metrics.stage_timer("extract"):
+            info = await loop.run_in_executor(
+                _pdf_executor, pdf_service.extract_pdf_info, file_name, file_path, 0
+            )
+        company_name = info.get("company_name")
+        # app.py의 단계 그래프와 같이 검색과 기존 회사 조회, 분석과 날짜 정규화를 동시에 실행합니다.
+        search_summary, existing = await asyncio.gather(
+            _timed_search(company_name), _run_blocking(find_company, company_name)
+        )
+        reused = pdf_service.reusable_analysis(existing, search_summary)
+        if reused is not None:
+            analysis = (reused, "existing")
+            company_fields = normalize_company_fields(info)
+        else:
+            analysis, company_fields = await asyncio.gather(
+                _run_blocking(pdf_service.analyze_company, company_name, search_summary),
+                loop.run_in_executor(_blocking_executor, normalize_company_fields, info),
+            )
+        ai_analysis_result, analysis_status = pdf_service.keep_existing_analysis(
+            existing, *analysis
+        )
+        fingerprint = pdf_service.analysis_fingerprint(search_summary, analysis_status, existing)
+        try:
+            company_id, job_information_id = await _run_blocking(
+                pdf_service.persist_records,
+                info,
+                ai_analysis_result,
+                content_hash,
+                idempotency_key,
+                company_fields,
+                fingerprint,
+            )
+        except IntegrityError:
+            # 다른 워커 프로세스가 같은 문서를 먼저 저장한 경우입니다.
+            existing = await _run_blocking(
+                pdf_service.find_processed_document, content_hash, idempotency_key
+            )
+            if not existing:
+                raise
+            return _duplicate_response(file_name, existing)
+    except pdf_service.PipelineError as e:
+        return _error(e.message, e.status_code)
+    except Exception as e:
+        print(f"--- ERROR: '{file_name}' 처리 중 예외 발생: {e}")
+        return _error(f"예상치 못한 오류가 발생했습니다: {str(e)}", 500)
+
+    return JSONResponse(
+        {
+            "status": "success",
+            "message": f"'{file_name}' 파일이 성공적으로 처리되어 데이터베이스에 저장되었습니다.",
+            "companyId": company_id,
+            "jobInformationId": job_information_id,
+            "analysisStatus": analysis_status,
+            "duplicate": False,
+        },
+        status_code=201,
+    )
+
+
+async def llm_status(request):
+    return JSONResponse({"status": "success", **pdf_service.llm_status()})
+
+
+async def metrics_endpoint(request):
+    return Response(metrics.render(), media_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
+
+async def http_clients_stats(request):
+    denied = admin_auth_error(request.headers.get("X-Admin-Key"))
+    if denied:
+        return _error(*denied)
+    return JSONResponse({"status": "success", "clients": client_stats()})
+
+
+@asynccontextmanager
+async def lifespan(_):
+    global serper_async_client, _flask_app, _pdf_executor, _blocking_executor
+    _flask_app = pdf_service.create_app()
+    serper_async_client = AsyncHttpClient(
+        "serper-async",
+        timeout=pdf_service.SERPER_TIMEOUT,
+        retries=pdf_service.SERPER_RETRIES,
+        max_concurrency=pdf_service.SERPER_MAX_CONCURRENCY,
+    )
+    # 워커 프로세스가 torch를 불러온 부모를 fork하지 않도록 spawn을 사용합니다.
+    _pdf_executor = ProcessPoolExecutor(
+        ASGI_PDF_WORKERS, mp_context=multiprocessing.get_context("spawn")
+    )
+    _blocking_executor = ThreadPoolExecutor(ASGI_BLOCKING_WORKERS)
+    try:
+        yield
+    finally:
+        await serper_async_client.aclose()
+        _pdf_executor.shutdown(cancel_futures=True)
+        _blocking_executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = Starlette(
+    routes=[
+        Route("/api/process-pdf", process_pdf, methods=["POST"]),
+        Route("/api/llm-status", llm_status, methods=["GET"]),
+        Route("/api/admin/http-clients", http_clients_stats, methods=["GET"]),
+        Route("/metrics", metrics_endpoint, methods=["GET"]),
+    ],
+    middleware=MIDDLEWARE,
+    lifespan=lifespan,
+)
+
+
+# ---------- 로드맵 서비스 (roadmap.py) ----------
+gemini_async = None
+_roadmap_locks = {}
+
+
+async def generate_roadmap(request):
+    """roadmap.py의 /generate_roadmap과 같은 요청/응답 형식입니다 (스트리밍은 Flask 앱에서 지원)."""
+    data = await _json_object(request)
+    if data is None:
+        return JSONResponse({"error": "요청 본문은 JSON 객체여야 합니다."}, status_code=400)
+    if data.get("stream"):
+        return JSONResponse(
+            {"error": "ASGI 서버는 stream 옵션을 지원하지 않습니다. Flask 앱(roadmap.py)을 사용하세요."},
+            status_code=400,
+        )
+    job_role, duration, error = roadmap.validate_roadmap_request(data)
+    if error:
+        return JSONResponse({"error": error}, status_code=400)
+    force_refresh = bool(data.get("force_refresh"))
+
+    try:
+        cached = None
+        if not force_refresh:
+            cached = await asyncio.to_thread(roadmap.load_cached_roadmap, job_role, duration)
+        if not cached:
+            lock = _roadmap_locks.setdefault(
+                roadmap.roadmap_filename(job_role, duration), asyncio.Lock()
+            )
+            async with lock:
+                if not force_refresh:
+                    cached = await asyncio.to_thread(
+                        roadmap.load_cached_roadmap, job_role, duration
+                    )
+                if not cached:
+                    generated_text = await gemini_async.generate(
+                        roadmap.build_roadmap_payload(job_role, duration)
+                    )
+                    generated_text, filename, save_path = await asyncio.to_thread(
+                        roadmap.save_roadmap, job_role, duration, generated_text
+                    )
+    except GeminiError as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+    except httpx.HTTPError as e:
+        return JSONResponse({"error": f"Gemini API 호출 중 오류 발생: {e}"}, status_code=500)
+    except Exception as e:
+        return JSONResponse({"error": f"로드맵 생성 중 예상치 못한 오류 발생: {e}"}, status_code=500)
+
+    if cached:
+        generated_text, filename, save_path = cached
+    return JSONResponse({
+        "message": "저장된 로드맵을 반환합니다." if cached else "로드맵이 성공적으로 생성되어 저장되었습니다.",
+        "filename": filename,
+        "path": save_path,
+        "roadmap_content": generated_text,
+        "cached": bool(cached),
+    })
+
+
+async def gemini_metrics(request):
+    denied = admin_auth_error(request.headers.get("X-Admin-Key"))
+    if denied:
+        return JSONResponse({"error": denied[0]}, status_code=denied[1])
+    return JSONResponse(gemini_async.stats())
+
+
+@asynccontextmanager
+async def roadmap_lifespan(_):
+    global gemini_async
+    gemini_async = AsyncGeminiClient()
+    try:
+        yield
+    finally:
+        await gemini_async.http.aclose()
+
+
+roadmap_app = Starlette(
+    routes=[
+        Route("/generate_roadmap", generate_roadmap, methods=["POST"]),
+        Route("/gemini_metrics", gemini_metrics, methods=["GET"]),
+    ],
+    middleware=MIDDLEWARE,
+    lifespan=roadmap_lifespan,
+)
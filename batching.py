@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """여러 호출자의 입력을 짧은 시간 창 동안 모아 한 번에 처리합니다.
+
+    첫 입력이 들어온 뒤 window_ms가 지나거나 max_batch_size개가 모이면
+    run_batch(items)를 한 번 호출하고, 반환된 결과 리스트를 입력 순서대로
+    각 호출자의 Future에 돌려줍니다.
+    """
+
+    def __init__(self, run_batch, window_ms=50, max_batch_size=8, name="micro-batcher"):
+        self.run_batch = run_batch
+        self.window = max(0, window_ms) / 1000
+        self.max_batch_size = max(1, int(max_batch_size))
+        self._pending = []
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """입력을 배치 대기열에 넣고 결과를 받을 Future를 반환합니다."""
+        future = Future()
+        with self._cond:
+            self._pending.append((item, future))
+            self._cond.notify()
+        return future
+
+    def __call__(self, item):
+        """입력을 제출하고 배치 처리가 끝날 때까지 기다려 결과를 반환합니다."""
+        return self.submit(item).result()
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.window
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            items = [item for item, _ in batch]
+            try:
+                results = self.run_batch(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"배치 결과 수({len(results)})가 입력 수({len(items)})와 다릅니다."
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
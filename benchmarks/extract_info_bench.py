@@ -0,0 +1,111 @@
+"""단일 패스 extract_info와 기존 필드별 정규식 구현의 결과 일치 여부와 속도를 비교합니다.
+
+실행: python benchmarks/extract_info_bench.py [--repeat 20]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor import extract_info  # noqa: E402
+from samples import make_form_text, parity_corpus  # noqa: E402
+
+
+def legacy_extract_info(text):
+    """필드마다 본문 전체를 re.search로 훑던 기존 구현입니다 (비교 기준)."""
+    info = {}
+    patterns = {
+        "company_name": r"회사명\s*(.*?)\s*사업자번호",
+        "established": r"설립\s*일자\s*([\d\.\s]+)",
+        "upte": r"업태\s*([^\n]+)",
+        "jongmok": r"종목\s*([^\n]+)",
+        "num_employees": r"상시근로자\s*수\s*(\d+)",
+        "main_business": r"주요\s*사업\s*내용\s*([\s\S]+?)(?:홈페이지|대표자명)",
+        "website": r"홈페이지\s*(https?://\S+)",
+        "location": r"소재지\s*([\s\S]+?)\s*대표자명",
+        "application_deadline": r"요청일:\s*([^\n]+)",
+        "job_category": r"모집직종\s*([^\n]+)",
+        "positions": r"모집인원\s*(\d+)\s*명",
+        "job_description": r"직무내용\s*\(구체적\)\s*([\s\S]+?)\s*근무\s*형태",
+        "qualifications": r"자격요건\s*\(우대자격\)\s*([\s\S]+?)\s*근무\s*시간",
+        "employment_type": r"근무\s*형태\s*([\s\S]+?)\s*자격요건",
+        "work_hours": r"근무\s*시간\s*([\s\S]+?)\s*접수\s*서류",
+        "intern_stipend": r"실습\s*수당\s*\(현장실습\s*시\)\s*(.*?)(?:\n|$)",
+        "salary": r"급여\s*\(정규직\s*채용\s*시\)\s*(.*?)(?:\n|$)",
+        "other_requirements": r"기타\s*요구사항\s*([\s\S]+?)\s*요청일",
+    }
+    for key, pattern in patterns.items():
+        match = re.search(pattern, text, re.DOTALL)
+        info[key] = match.group(1).strip().replace("\n", " ") if match else None
+
+    info["business_type"] = (
+        f"{info['upte']} / {info['jongmok']}"
+        if info.get("upte") and info.get("jongmok")
+        else (info.get("upte") or info.get("jongmok"))
+    )
+
+    if info.get("num_employees"):
+        try:
+            info["num_employees"] = int(info["num_employees"])
+        except (ValueError, TypeError):
+            info["num_employees"] = None
+
+    return info
+
+
+# 홈페이지/대표자명/요청일이 빠진 양식: 기존 구현은 게으른 구간 패턴이 문서 끝까지 되추적합니다.
+MISSING = {"홈페이지": None, "대표자명": None, "요청일:": None}
+
+
+def check_parity(corpus):
+    mismatches = []
+    for name, text in corpus:
+        expected, actual = legacy_extract_info(text), extract_info(text)
+        if expected != actual:
+            diff = {
+                k: (expected.get(k), actual.get(k))
+                for k in expected.keys() | actual.keys()
+                if expected.get(k) != actual.get(k)
+            }
+            mismatches.append((name, diff))
+    return mismatches
+
+
+def bench(func, text, repeat):
+    number = max(1, 2000 // max(1, len(text) // 500))
+    best = min(timeit.repeat(lambda: func(text), number=number, repeat=repeat))
+    return best / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--random-cases", type=int, default=300)
+    args = parser.parse_args()
+
+    corpus = parity_corpus(n_random=args.random_cases)
+    mismatches = check_parity(corpus)
+    print(f"결과 일치: {len(corpus) - len(mismatches)}/{len(corpus)}")
+    for name, diff in mismatches:
+        print(f"  불일치 [{name}]: {diff}")
+
+    print(f"\n{'문서':<26}{'길이':>9}{'기존(us)':>12}{'단일 패스(us)':>16}{'배속':>8}")
+    for label, text in (
+        ("1페이지 양식", make_form_text()),
+        ("양식 + 소개 5페이지", make_form_text(brochure_pages=5)),
+        ("양식 + 소개 30페이지", make_form_text(brochure_pages=30)),
+        ("누락 항목 + 소개 5페이지", make_form_text(brochure_pages=5, **MISSING)),
+        ("누락 항목 + 소개 30페이지", make_form_text(brochure_pages=30, **MISSING)),
+    ):
+        legacy = bench(legacy_extract_info, text, args.repeat)
+        single = bench(extract_info, text, args.repeat)
+        print(f"{label:<26}{len(text):>9}{legacy:>12.1f}{single:>16.1f}{legacy / single:>7.1f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
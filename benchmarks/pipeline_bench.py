@@ -0,0 +1,239 @@
+"""PDF 처리 파이프라인의 단계별 소요 시간을 측정하여 JSON으로 출력합니다.
+
+합성 채용 의뢰서 PDF를 만들어 extract_text, extract_form_text, extract_info,
+google_search(로컬 스텁 Serper 서버), LLM 분석(스텁 또는 작은 로컬 모델),
+DB 저장(SQLite)을 각각 측정하고 단계별 p50/p95와 문서/초를 보고합니다.
+--baseline으로 이전 결과를 주면 p50이 --tolerance 이상 느려진 단계가 있을 때 종료 코드 1을 반환합니다.
+
+실행: python benchmarks/pipeline_bench.py [--docs 50] [--llm stub|local] [--output result.json]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from samples import COMPANY_NAMES, make_form_pdf  # noqa: E402
+
+STAGES = (
+    "extract_text",
+    "extract_form_text",
+    "extract_info",
+    "google_search",
+    "llm_analysis",
+    "persist",
+)
+
+
+class StubSerperHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_POST(self):
+        query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["q"]
+        time.sleep(self.latency)
+        body = json.dumps(
+            {
+                "organic": [
+                    {"title": f"{query} {i}", "link": f"https://example.com/{i}",
+                     "snippet": f"{query}의 주요 사업과 기술 스택 소개 {i}"}
+                    for i in range(5)
+                ]
+            },
+            ensure_ascii=False,
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def stub_llm_pipeline(latency):
+    """배치 크기와 상관없이 latency초 걸리는 가짜 text-generation 파이프라인입니다."""
+
+    def generate(prompts, **kwargs):
+        time.sleep(latency)
+        prompts = [prompts] if isinstance(prompts, str) else prompts
+        return [[{"generated_text": "주력 사업과 기술 스택을 바탕으로 성장 가능성이 높은 기업입니다."}]
+                for _ in prompts]
+
+    return generate
+
+
+def local_llm_pipeline(model_id, max_new_tokens):
+    from transformers import pipeline
+
+    return pipeline("text-generation", model=model_id, max_new_tokens=max_new_tokens,
+                    do_sample=False)
+
+
+def summarize(samples):
+    """초 단위 측정값 목록을 p50/p95/평균(ms)과 문서/초로 요약합니다."""
+    ordered = sorted(samples)
+    count = len(ordered)
+    total = sum(ordered)
+    return {
+        "count": count,
+        "p50Ms": ordered[count // 2] * 1000,
+        "p95Ms": ordered[min(count - 1, int(count * 0.95))] * 1000,
+        "meanMs": total / count * 1000,
+        "docsPerSec": count / total if total else None,
+    }
+
+
+def timed(samples, stage, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    samples[stage].append(time.perf_counter() - started)
+    return result
+
+
+def run(args, workdir):
+    # app.py는 import 시점에 환경 변수를 읽으므로 스텁 주소와 SQLite 경로를 먼저 설정합니다.
+    StubSerperHandler.latency = args.search_latency_ms / 1000
+    serper = ThreadingHTTPServer(("127.0.0.1", 0), StubSerperHandler)
+    threading.Thread(target=serper.serve_forever, daemon=True).start()
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        SERPER_API_KEY="bench",
+        SERPER_URL=f"http://127.0.0.1:{serper.server_port}/search",
+        SERPER_CACHE_BACKEND="none",
+    )
+
+    import app as app_module
+    from extractor import extract_info
+    from models import db
+    from pdf_reader import extract_form_text, extract_text
+    from persistence import bulk_upsert
+
+    paths = []
+    for i in range(args.docs):
+        path = os.path.join(workdir, f"form-{i}.pdf")
+        make_form_pdf(path, f"{COMPANY_NAMES[i % len(COMPANY_NAMES)]}{i}", args.brochure_pages)
+        paths.append(path)
+
+    if args.llm == "local":
+        llm = local_llm_pipeline(args.model_id, args.max_new_tokens)
+    else:
+        llm = stub_llm_pipeline(args.llm_latency_ms / 1000)
+    app_module.llm_pipeline = llm
+    if args.llm == "local" and args.prefix_cache:
+        from prefix_cache import create_prefix_generator
+
+        app_module.prefix_generator = create_prefix_generator(
+            llm,
+            app_module.ANALYSIS_PROMPT_PREFIX,
+            {"max_new_tokens": args.max_new_tokens, "do_sample": False},
+        )
+    if args.llm == "local" and args.generation_policy:
+        from generation_policy import GenerationPolicy
+
+        app_module.generation_policy = GenerationPolicy(
+            llm.tokenizer, app_module.ANALYSIS_PROMPT_PREFIX, decoding="greedy"
+        )
+
+    flask_app = app_module.create_app(load_llm=False)
+    samples = {stage: [] for stage in STAGES}
+    end_to_end = []
+    with flask_app.app_context():
+        db.create_all()
+        for path in paths:
+            started = time.perf_counter()
+            timed(samples, "extract_text", extract_text, path, 0)
+            text = timed(samples, "extract_form_text", extract_form_text, path, 0)
+            info = timed(samples, "extract_info", extract_info, text)
+            results = timed(samples, "google_search", app_module.google_search, info["company_name"])
+            prompt = app_module.build_llm_prompt(
+                info["company_name"], app_module.summarize_search_results(results)
+            )
+            (analysis,) = timed(samples, "llm_analysis", app_module._generate_batch, [prompt])
+            timed(samples, "persist", bulk_upsert, [(info, analysis)])
+            # extract_text는 비교용 측정이므로 실제 파이프라인(양식만 읽기) 시간에서 뺍니다.
+            end_to_end.append(time.perf_counter() - started - samples["extract_text"][-1])
+    serper.shutdown()
+
+    return {
+        "meta": {
+            "createdAt": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "docs": args.docs,
+            "brochurePages": args.brochure_pages,
+            "llm": args.model_id if args.llm == "local" else f"stub({args.llm_latency_ms}ms)",
+            "searchLatencyMs": args.search_latency_ms,
+            "prefixCache": app_module.prefix_cache_status(),
+            "generationPolicy": (
+                app_module.generation_policy.status() if app_module.generation_policy else None
+            ),
+        },
+        "stages": {stage: summarize(values) for stage, values in samples.items()},
+        "endToEnd": summarize(end_to_end),
+    }
+
+
+def compare(result, baseline, tolerance):
+    """baseline보다 p50이 tolerance 비율 이상 느려진 단계 목록을 반환합니다."""
+    regressions = []
+    current = {**result["stages"], "endToEnd": result["endToEnd"]}
+    previous = {**baseline.get("stages", {}), "endToEnd": baseline.get("endToEnd")}
+    for stage, stats in current.items():
+        before = previous.get(stage)
+        if before and before["p50Ms"] and stats["p50Ms"] > before["p50Ms"] * (1 + tolerance):
+            regressions.append((stage, before["p50Ms"], stats["p50Ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--brochure-pages", type=int, default=3)
+    parser.add_argument("--llm", choices=["stub", "local"], default="stub")
+    parser.add_argument("--llm-latency-ms", type=int, default=0,
+                        help="스텁 LLM의 생성 지연(ms)")
+    parser.add_argument("--model-id", default="sshleifer/tiny-gpt2",
+                        help="--llm local에서 사용할 작은 모델")
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    parser.add_argument("--prefix-cache", action="store_true",
+                        help="--llm local에서 프롬프트 접두어 KV 캐시를 사용")
+    parser.add_argument("--generation-policy", action="store_true",
+                        help="--llm local에서 토큰 예산과 조기 종료 조건을 적용 (--max-new-tokens 무시)")
+    parser.add_argument("--search-latency-ms", type=int, default=0,
+                        help="스텁 Serper 서버의 응답 지연(ms)")
+    parser.add_argument("--output", help="결과 JSON 파일 (기본값: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="p50 회귀로 판단할 비율 (기본값 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        result = run(args, workdir)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for stage, before, after in regressions:
+            print(f"회귀: {stage} p50 {before:.2f}ms -> {after:.2f}ms", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""워커 하나가 동시에 처리하는 로드맵 요청 수를 Flask(동기)와 ASGI(비동기) 서버로 비교합니다.
+
+가짜 Gemini 서버(응답 지연 --latency-ms)를 띄우고, 캐시를 쓰지 않도록 force_refresh로
+서로 다른 로드맵을 동시에 요청합니다. 동기 서버는 gunicorn sync 워커 하나처럼 한 번에
+한 요청만 처리하고, ASGI 서버는 uvicorn 워커 하나로 실행합니다.
+
+실행: python benchmarks/roadmap_load.py [--requests 64] [--concurrency 1,8,32] [--latency-ms 300]
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.3
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        body = json.dumps(
+            {"candidates": [{"content": {"parts": [{"text": "## 로드맵\n- 1주차"}]}}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(mode, port):
+    """(하위 프로세스) 측정할 서버를 워커 하나로 실행합니다."""
+    if mode == "flask":
+        from werkzeug.serving import make_server
+
+        import roadmap
+
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        make_server("127.0.0.1", port, roadmap.app, threaded=False).serve_forever()
+    else:
+        import uvicorn
+
+        uvicorn.run("asgi:roadmap_app", host="127.0.0.1", port=port, log_level="warning")
+
+
+def start_server(mode, env):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", mode, "--port", str(port)],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{url}/gemini_metrics", timeout=1)
+            return process, url
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{mode} 서버를 시작할 수 없습니다.")
+
+
+def run_load(url, total, concurrency):
+    """서로 다른 로드맵 total건을 concurrency개씩 동시에 요청하고 (처리량, p50, p95, 오류 수)를 반환합니다."""
+    roles = ["ai-engineer", "app-android", "app-ios", "cyber-security",
+             "server-engineer", "web-back", "web-front"]
+    local = threading.local()
+
+    def one(i):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        response = session.post(
+            f"{url}/generate_roadmap",
+            json={"job_role": roles[i % len(roles)], "duration": 100 + i, "force_refresh": True},
+            timeout=120,
+        )
+        return time.perf_counter() - started, response.status_code == 200
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(seconds for seconds, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+    return total / elapsed, p50, p95, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--latency-ms", type=int, default=300)
+    parser.add_argument("--serve", choices=["flask", "asgi"], help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    FakeGeminiHandler.latency = args.latency_ms / 1000
+    fake = ThreadingHTTPServer(("127.0.0.1", 0), FakeGeminiHandler)
+    threading.Thread(target=fake.serve_forever, daemon=True).start()
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    with tempfile.TemporaryDirectory() as roadmap_dir:
+        env = dict(
+            os.environ,
+            GEMINI_API_BASE=f"http://127.0.0.1:{fake.server_port}/v1beta",
+            GEMINI_API_KEY="bench",
+            GEMINI_RETRIES="0",
+            GEMINI_MAX_CONCURRENCY=str(max(levels)),
+            ROADMAP_DIR=roadmap_dir,
+        )
+        print(f"가짜 Gemini 응답 지연 {args.latency_ms}ms, 요청 {args.requests}건, 워커 1개")
+        print(f"{'서버':<8}{'동시 요청':>10}{'요청/초':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'오류':>6}")
+        for mode in ("flask", "asgi"):
+            process, url = start_server(mode, env)
+            try:
+                for concurrency in levels:
+                    throughput, p50, p95, errors = run_load(url, args.requests, concurrency)
+                    print(f"{mode:<8}{concurrency:>10}{throughput:>10.1f}{p50:>10.0f}{p95:>10.0f}{errors:>6}")
+            finally:
+                process.terminate()
+                process.wait()
+    fake.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""extract_info가 기대하는 라벨 구조를 따르는 합성 채용 의뢰서 텍스트를 만듭니다."""
+import random
+
+# (라벨, 값) 순서는 실제 채용 의뢰서 양식과 같습니다.
+FORM_SECTIONS = (
+    ("회사명", "{company_name}"),
+    ("사업자번호", "123-45-67890"),
+    ("설립 일자", "2010. 3. 1."),
+    ("업태", "서비스업"),
+    ("종목", "소프트웨어 개발 및 공급"),
+    ("상시근로자 수", "25 명"),
+    ("주요 사업 내용", "웹 서비스 개발 및 운영\n클라우드 인프라 컨설팅"),
+    ("홈페이지", "https://www.example.co.kr"),
+    ("소재지", "서울특별시 용산구 회나무로12길 27\n3층"),
+    ("대표자명", "홍길동"),
+    ("모집직종", "웹 백엔드 개발"),
+    ("모집인원", "2 명"),
+    ("직무내용 (구체적)", "파이썬 기반 API 서버 개발\n데이터베이스 설계 및 운영"),
+    ("근무 형태", "정규직 (수습 3개월)"),
+    ("자격요건 (우대자격)", "정보처리기능사 우대\nGit 사용 경험자"),
+    ("근무 시간", "09:00 ~ 18:00 (주 5일)"),
+    ("접수 서류", "이력서, 자기소개서"),
+    ("실습 수당 (현장실습 시)", "월 100만원"),
+    ("급여 (정규직 채용 시)", "연 3,000만원"),
+    ("기타 요구사항", "노트북 지참"),
+    ("요청일:", "2025년 7월 10일"),
+)
+
+COMPANY_NAMES = (
+    "디지텍소프트",
+    "한빛네트웍스",
+    "(주)서울클라우드",
+    "용산데이터랩",
+    "회나무시스템즈",
+    "에이아이브릿지",
+)
+
+BROCHURE_LINE = "저희 회사는 고객 중심의 서비스를 제공하며 지속적으로 성장하고 있습니다. "
+
+
+def make_form_text(company_name="디지텍소프트", separator=" ", brochure_pages=0, **overrides):
+    """채용 의뢰서 텍스트를 만듭니다. overrides로 라벨별 값을 바꾸거나 None으로 뺄 수 있습니다."""
+    lines = ["채용 의뢰서"]
+    for label, value in FORM_SECTIONS:
+        value = overrides.get(label, value)
+        if value is None:
+            continue
+        lines.append(f"{label}{separator}{value.format(company_name=company_name)}")
+    text = "\n".join(lines) + "\n"
+    for page in range(brochure_pages):
+        text += f"\n회사 소개 {page + 1}\n" + BROCHURE_LINE * 40 + "\n"
+    return text
+
+
+def _random_form(rng):
+    overrides = {}
+    for label, _ in FORM_SECTIONS:
+        roll = rng.random()
+        if roll < 0.08:
+            overrides[label] = None
+        elif roll < 0.12:
+            overrides[label] = ""
+        elif roll < 0.15:
+            overrides[label] = rng.choice(["\n", "  ", "\n\n값 없음", "N/A\n"])
+    separator = rng.choice([" ", "", "\n", "  \n ", "\t"])
+    text = make_form_text(
+        company_name=rng.choice(COMPANY_NAMES),
+        separator=separator,
+        brochure_pages=rng.choice([0, 0, 1, 3]),
+        **overrides,
+    )
+    lines = text.split("\n")
+    if rng.random() < 0.2:
+        # 양식 일부가 중복되거나 순서가 바뀐 경우
+        i, j = sorted(rng.sample(range(len(lines)), 2))
+        lines[i], lines[j] = lines[j], lines[i]
+    if rng.random() < 0.2:
+        lines.insert(rng.randrange(len(lines)), rng.choice([l for l in lines if l] or [""]))
+    return "\n".join(lines)
+
+
+def parity_corpus(seed=0, n_random=300):
+    """(이름, 텍스트) 목록을 반환합니다. 경계 사례와 무작위 변형을 함께 포함합니다."""
+    corpus = [
+        ("standard", make_form_text()),
+        ("no-separator", make_form_text(separator="")),
+        ("newline-separator", make_form_text(separator="\n")),
+        ("brochure-30-pages", make_form_text(brochure_pages=30)),
+        ("empty", ""),
+        ("brochure-only", BROCHURE_LINE * 200),
+        ("missing-terminators", make_form_text(**{"사업자번호": None, "대표자명": None})),
+        ("empty-values", make_form_text(**{label: "" for label, _ in FORM_SECTIONS})),
+        ("label-then-terminator", "직무내용 (구체적) 근무 형태 정규직 자격요건 A 근무 형태 B"),
+        ("label-no-space-terminator", "직무내용 (구체적)근무 형태 정규직 자격요건 A 근무 형태 B"),
+        ("website-without-scheme", make_form_text(**{"홈페이지": "www.example.com"})),
+        ("deadline-without-colon", make_form_text(**{"요청일:": None}) + "요청일 2025년 7월 1일\n"),
+        ("duplicate-labels", make_form_text() + make_form_text(company_name="한빛네트웍스")),
+        ("salary-at-end", "급여 (정규직 채용 시) 연 2,800만원"),
+        ("stipend-blank-lines", "실습 수당 (현장실습 시)\n\n"),
+    ]
+    rng = random.Random(seed)
+    corpus.extend((f"random-{i}", _random_form(rng)) for i in range(n_random))
+    return corpus
+
+
+def make_form_pdf(path, company_name="디지텍소프트", brochure_pages=0, **overrides):
+    """make_form_text와 같은 양식을 첫 페이지에, 회사 소개를 그 뒤 페이지에 담은 PDF를 만듭니다."""
+    import pymupdf as fitz
+
+    form = make_form_text(company_name=company_name, **overrides)
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((40, 50), form, fontname="korea", fontsize=9)
+        for number in range(brochure_pages):
+            page = doc.new_page()
+            page.insert_textbox(
+                page.rect + (40, 40, -40, -40),
+                f"회사 소개 {number + 1}\n" + BROCHURE_LINE * 40,
+                fontname="korea",
+                fontsize=9,
+            )
+        doc.save(path)
@@ -0,0 +1,126 @@
+"""워커마다 모델을 불러올 때와 공유 추론 프로세스(inference_server.py)를 쓸 때의 메모리를 비교합니다.
+
+local 모드는 gunicorn 워커처럼 프로세스 --workers개가 각자 create_app()으로 MODEL_ID를 불러오고,
+socket 모드는 추론 프로세스 하나가 모델을 불러오고 워커들은 LLM_SOCKET으로 생성을 요청합니다.
+모든 워커가 분석을 한 번 생성한 뒤 프로세스별 RSS와 PSS(공유 페이지를 프로세스 수로 나눈 값)를
+/proc에서 읽으므로 Linux에서 실행합니다. 합계는 PSS 기준입니다.
+
+실행: python benchmarks/worker_memory.py [--workers 4] [--model-id sshleifer/tiny-gpt2]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def memory_mb(pid):
+    """(RSS, PSS) MB를 반환합니다. PSS를 읽을 수 없는 커널이면 PSS는 None입니다."""
+    rss = pss = None
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1]) / 1024
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    pss = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return rss, pss
+
+
+def run_worker():
+    """(하위 프로세스) create_app()으로 워커 하나를 띄우고 분석을 한 번 생성한 뒤 기다립니다."""
+    import app as app_module
+
+    app_module.create_app()
+    if not app_module.llm_loader.wait(600):
+        print(f"failed {app_module.llm_loader.status()['error']}", flush=True)
+        return
+    app_module.llm_batcher(app_module.build_llm_prompt("메모리측정", "반도체 설계 기업"))
+    print("ready", flush=True)
+    sys.stdin.read()
+
+
+def _wait_ready(name, process):
+    # 워커의 표준 출력에는 앱의 --- INFO 로그도 섞여 있으므로 ready/failed 줄까지 읽습니다.
+    for line in process.stdout:
+        if line.startswith("ready"):
+            return
+        if line.startswith("failed"):
+            break
+    raise RuntimeError(f"{name}를 시작할 수 없습니다.")
+
+
+def start(command, env):
+    return subprocess.Popen(
+        [sys.executable, *command],
+        cwd=ROOT,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+
+
+def measure(mode, args, workdir):
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, f'{mode}.db')}",
+        SERPER_API_KEY="bench",
+        MODEL_ID=args.model_id,
+        JOB_WORKERS="1",
+    )
+    env.pop("LLM_SOCKET", None)
+    processes = []
+    if mode == "socket":
+        env["LLM_SOCKET"] = os.path.join(workdir, "llm.sock")
+        processes.append(("inference_server", start(["inference_server.py"], env)))
+    for i in range(args.workers):
+        processes.append((f"worker-{i}", start([os.path.abspath(__file__), "--worker"], env)))
+
+    try:
+        for name, process in processes:
+            if name.startswith("worker"):
+                _wait_ready(name, process)
+        time.sleep(1)
+        return [(name, *memory_mb(process.pid)) for name, process in processes]
+    finally:
+        for _, process in processes:
+            process.terminate()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--model-id", default="sshleifer/tiny-gpt2")
+    parser.add_argument("--modes", default="local,socket")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker()
+        return
+
+    print(f"모델 {args.model_id}, 워커 {args.workers}개")
+    print(f"{'모드':<8}{'프로세스':<20}{'RSS(MB)':>10}{'PSS(MB)':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in args.modes.split(","):
+            rows = measure(mode, args, workdir)
+            for name, rss, pss in rows:
+                pss_text = f"{pss:>10.0f}" if pss is not None else f"{'-':>10}"
+                print(f"{mode:<8}{name:<20}{rss:>10.0f}{pss_text}")
+            total = sum((pss if pss is not None else rss) for _, rss, pss in rows)
+            print(f"{mode:<8}{'합계':<20}{'':>10}{total:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
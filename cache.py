@@ -0,0 +1,132 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """만료 시간(TTL)이 있는 스레드 안전 인메모리 LRU 캐시입니다."""
+
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """값을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or (self.ttl and item[1] < time.monotonic()):
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + (self.ttl or 0))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._data),
+                "ttlSeconds": self.ttl,
+                "maxEntries": self.maxsize,
+            }
+
+
+class SQLiteCache:
+    """JSON으로 직렬화 가능한 값을 SQLite 파일에 저장하는 TTL 캐시입니다.
+
+    프로세스 재시작이나 여러 워커 프로세스 사이에서도 캐시를 공유할 때 사용합니다.
+    """
+
+    def __init__(self, path, ttl=3600):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl and row[1] < time.time()):
+                if row is not None:
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time() + (self.ttl or 0)),
+            )
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return {
+                "backend": "sqlite",
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "ttlSeconds": self.ttl,
+                "path": self.path,
+            }
+
+
+def make_cache(backend, ttl=3600, maxsize=1024, path=None):
+    """설정 값에 따라 캐시 백엔드를 만듭니다. 'none'이면 None을 반환합니다."""
+    if backend == "memory":
+        return TTLCache(maxsize=maxsize, ttl=ttl)
+    if backend == "sqlite":
+        return SQLiteCache(path, ttl=ttl)
+    if backend in (None, "", "none"):
+        return None
+    raise ValueError(f"지원하지 않는 캐시 백엔드입니다: {backend}")
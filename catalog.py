@@ -0,0 +1,155 @@
+"""회사/채용 공고 조회 API(GET /api/companies, GET /api/job-postings)의 필터와 페이지 조회입니다.
+
+페이지는 OFFSET 대신 키셋 방식(id < 커서, id 내림차순)으로 나누므로 뒤쪽 페이지도 앞쪽과
+같은 비용으로 조회됩니다. 연도/마감일 필터는 B-tree 인덱스를, 키워드 필터(ILIKE '%키워드%')는
+PostgreSQL의 트라이그램 GIN 인덱스를 사용합니다. SQLite에서는 같은 조건을 LIKE로 처리합니다.
+"""
+from datetime import date
+
+from models import db, CompanyInformation, JobInformation
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _int_arg(args, name, minimum=None):
+    value = args.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name}은(는) 정수여야 합니다.")
+    if minimum is not None and number < minimum:
+        raise ValueError(f"{name}은(는) {minimum} 이상이어야 합니다.")
+    return number
+
+
+def _date_arg(args, name):
+    value = args.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(f"{name}은(는) YYYY-MM-DD 형식이어야 합니다.")
+
+
+def _contains(column, keyword):
+    escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+def _keywords(args):
+    return (args.get("q") or "").split()
+
+
+def company_filters(args):
+    """쿼리 문자열의 회사 필터를 SQL 조건 목록으로 변환합니다. 잘못된 값은 ValueError입니다.
+
+    year, businessType(부분 일치), minEmployees, maxEmployees, deadlineFrom, deadlineTo
+    (YYYY-MM-DD, 포함)를 지원합니다.
+    """
+    conditions = []
+    year = _int_arg(args, "year")
+    if year is not None:
+        conditions.append(CompanyInformation.year == year)
+    business_type = (args.get("businessType") or "").strip()
+    if business_type:
+        conditions.append(_contains(CompanyInformation.business_type, business_type))
+    min_employees = _int_arg(args, "minEmployees", minimum=0)
+    if min_employees is not None:
+        conditions.append(CompanyInformation.employee_count >= min_employees)
+    max_employees = _int_arg(args, "maxEmployees", minimum=0)
+    if max_employees is not None:
+        conditions.append(CompanyInformation.employee_count <= max_employees)
+    deadline_from = _date_arg(args, "deadlineFrom")
+    if deadline_from:
+        conditions.append(CompanyInformation.deadline >= deadline_from)
+    deadline_to = _date_arg(args, "deadlineTo")
+    if deadline_to:
+        conditions.append(CompanyInformation.deadline <= deadline_to)
+    return conditions
+
+
+def _page(stmt, id_column, args):
+    """키셋 페이지 조회를 실행하여 (행 목록, 다음 커서)를 반환합니다."""
+    limit = _int_arg(args, "limit", minimum=1) or DEFAULT_PAGE_SIZE
+    limit = min(limit, MAX_PAGE_SIZE)
+    cursor = _int_arg(args, "cursor")
+    if cursor is not None:
+        stmt = stmt.where(id_column < cursor)
+    # 다음 페이지가 있는지 알기 위해 한 건을 더 읽습니다.
+    rows = db.session.execute(stmt.order_by(id_column.desc()).limit(limit + 1)).all()
+    next_cursor = str(rows[limit - 1][0].id) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def company_json(company):
+    return {
+        "id": company.id,
+        "year": company.year,
+        "companyName": company.company_name,
+        "deadline": company.deadline,
+        "establishmentYear": company.establishment_year,
+        "businessType": company.business_type,
+        "employeeCount": company.employee_count,
+        "mainBusiness": company.main_business,
+        "website": company.website,
+        "address": company.address,
+        "aiAnalysis": company.ai_analysis,
+    }
+
+
+def job_posting_json(job, company):
+    return {
+        "id": job.id,
+        "companyId": job.company_id,
+        "companyName": company.company_name,
+        "deadline": company.deadline,
+        "jobTitle": job.job_title,
+        "recruitmentCount": job.recruitment_count,
+        "jobDescription": job.job_description,
+        "qualifications": job.qualifications,
+        "workingHours": job.working_hours,
+        "workType": job.work_type,
+        "internshipPay": job.internship_pay,
+        "salary": job.salary,
+        "additionalRequirements": job.additional_requirements,
+    }
+
+
+def list_companies(args):
+    """회사 필터와 q(회사명 키워드, 공백으로 구분한 모든 단어 포함)로 회사 한 페이지를 조회합니다.
+
+    (항목 목록, 다음 커서)를 반환하며 다음 페이지가 없으면 커서는 None입니다.
+    """
+    stmt = db.select(CompanyInformation).where(*company_filters(args))
+    for keyword in _keywords(args):
+        stmt = stmt.where(_contains(CompanyInformation.company_name, keyword))
+    rows, next_cursor = _page(stmt, CompanyInformation.id, args)
+    return [company_json(company) for (company,) in rows], next_cursor
+
+
+def list_job_postings(args):
+    """회사 필터, companyId, q(직무명 또는 자격 요건에 모든 단어 포함)로 채용 공고 한 페이지를 조회합니다.
+
+    (항목 목록, 다음 커서)를 반환하며 다음 페이지가 없으면 커서는 None입니다.
+    """
+    stmt = (
+        db.select(JobInformation, CompanyInformation)
+        .join(CompanyInformation, JobInformation.company_id == CompanyInformation.id)
+        .where(*company_filters(args))
+    )
+    company_id = _int_arg(args, "companyId")
+    if company_id is not None:
+        stmt = stmt.where(JobInformation.company_id == company_id)
+    for keyword in _keywords(args):
+        stmt = stmt.where(
+            db.or_(
+                _contains(JobInformation.job_title, keyword),
+                _contains(JobInformation.qualifications, keyword),
+            )
+        )
+    rows, next_cursor = _page(stmt, JobInformation.id, args)
+    return [job_posting_json(job, company) for job, company in rows], next_cursor
@@ -0,0 +1,262 @@
+import bisect
+import re
+from collections import namedtuple
+from datetime import datetime
+
+# 값 추출 방식
+# - Slice: 라벨 뒤부터 종료 라벨(들) 중 가장 먼저 나오는 위치까지 잘라냅니다.
+#   min_len=1이면 라벨과 종료 라벨 사이에 최소 한 글자가 있어야 합니다.
+# - Value: 라벨 끝에서 정규식을 match하여 첫 번째 그룹을 값으로 씁니다.
+Slice = namedtuple("Slice", ["terminators", "min_len"])
+Value = namedtuple("Value", ["pattern"])
+
+# (필드명, 라벨, 라벨 뒤에 반드시 따라와야 하는 접미사, 값 추출 방식)
+FIELD_SPECS = (
+    ("company_name", r"회사명", None, Slice((r"사업자번호",), 0)),
+    ("established", r"설립\s*일자", None, Value(r"\s*([\d\.\s]+)")),
+    ("upte", r"업태", None, Value(r"\s*([^\n]+)")),
+    ("jongmok", r"종목", None, Value(r"\s*([^\n]+)")),
+    ("num_employees", r"상시근로자\s*수", None, Value(r"\s*(\d+)")),
+    ("main_business", r"주요\s*사업\s*내용", None, Slice((r"홈페이지", r"대표자명"), 1)),
+    ("website", r"홈페이지", None, Value(r"\s*(https?://\S+)")),
+    ("location", r"소재지", None, Slice((r"대표자명",), 1)),
+    ("application_deadline", r"요청일", r":", Value(r"\s*([^\n]+)")),
+    ("job_category", r"모집직종", None, Value(r"\s*([^\n]+)")),
+    ("positions", r"모집인원", None, Value(r"\s*(\d+)\s*명")),
+    ("job_description", r"직무내용", r"\s*\(구체적\)", Slice((r"근무\s*형태",), 1)),
+    ("qualifications", r"자격요건", r"\s*\(우대자격\)", Slice((r"근무\s*시간",), 1)),
+    ("employment_type", r"근무\s*형태", None, Slice((r"자격요건",), 1)),
+    ("work_hours", r"근무\s*시간", None, Slice((r"접수\s*서류",), 1)),
+    ("intern_stipend", r"실습\s*수당", r"\s*\(현장실습\s*시\)", Value(r"\s*(.*?)(?:\n|$)")),
+    ("salary", r"급여", r"\s*\(정규직\s*채용\s*시\)", Value(r"\s*(.*?)(?:\n|$)")),
+    ("other_requirements", r"기타\s*요구사항", None, Slice((r"요청일",), 1)),
+)
+
+_WHITESPACE = re.compile(r"\s*")
+_SPACES = re.compile(r"\s+")
+
+
+class FieldExtractor:
+    """채용 의뢰서의 라벨 위치를 한 번의 스캔으로 찾으면서 필드 값을 잘라냅니다.
+
+    라벨과 종료 라벨을 하나의 컴파일된 정규식으로 묶어 본문을 앞에서부터 한 번만
+    훑고, 각 필드는 라벨 위치 사이를 자르거나 라벨 끝에서 짧은 정규식을 match하여
+    값을 얻습니다. 모든 필드가 확정되면 나머지 본문(회사 소개서 등)은 읽지 않습니다.
+    결과는 필드별 re.search(..., re.DOTALL)과 동일합니다.
+
+    양식이 온전한 흔한 경우에는 필드별 re.search가 각 라벨 근처에서 바로 끝나므로 스캔보다
+    빠릅니다. 그래서 구간 필드마다 라벨 뒤에 종료 라벨이 있는지 먼저 확인하고, 모두 있으면
+    필드별 정규식으로 추출합니다. 종료 라벨이 없으면 게으른 구간 패턴이 문서 끝까지 되추적하므로
+    그때만 단일 스캔을 사용합니다.
+    """
+
+    def __init__(self, specs=FIELD_SPECS):
+        terms = []
+        for _, label, _, method in specs:
+            for term in (label,) + (
+                method.terminators if isinstance(method, Slice) else ()
+            ):
+                if term not in terms:
+                    terms.append(term)
+        # 분기마다 리터럴로 시작해야 re 모듈의 첫 글자 필터가 적용되므로 이름 있는
+        # 그룹 대신 매치된 문자열에서 공백을 지운 값으로 라벨을 구분합니다.
+        self._scanner = re.compile("|".join(terms))
+        self._term_ids = {
+            _SPACES.sub("", term.replace(r"\s*", "")): i for i, term in enumerate(terms)
+        }
+        self._fields = []
+        self._fields_by_term = [[] for _ in terms]
+        # 필드별 re.search 경로: (필드명, 라벨 정규식, 종료 라벨 정규식들, 필드 정규식).
+        # 종료 라벨은 따로 컴파일합니다. 교대(|)로 묶으면 리터럴 검색 최적화가 적용되지 않아
+        # 종료 라벨이 없는 긴 본문에서 훨씬 느립니다.
+        self._searches = []
+        for name, label, suffix, method in specs:
+            label_id = terms.index(label)
+            suffix_re = re.compile(suffix) if suffix else None
+            label_pattern = label + (suffix or "")
+            if isinstance(method, Slice):
+                terminator_ids = tuple(terms.index(t) for t in method.terminators)
+                field = (name, label_id, suffix_re, terminator_ids, method.min_len)
+                terminator = "|".join(method.terminators)
+                body = r"[\s\S]+?" if method.min_len else r"[\s\S]*?"
+                self._searches.append((
+                    name,
+                    re.compile(label_pattern),
+                    tuple(re.compile(t) for t in method.terminators),
+                    re.compile(rf"{label_pattern}\s*({body})\s*(?:{terminator})"),
+                ))
+            else:
+                terminator_ids = ()
+                field = (name, label_id, suffix_re, re.compile(method.pattern, re.DOTALL), None)
+                self._searches.append(
+                    (name, None, (), re.compile(label_pattern + method.pattern, re.DOTALL))
+                )
+            self._fields.append(field)
+            for term_id in {label_id, *terminator_ids}:
+                self._fields_by_term[term_id].append(field)
+
+    def _iter_anchors(self, text):
+        term_ids = self._term_ids
+        for m in self._scanner.finditer(text):
+            term = m.group()
+            term_id = term_ids.get(term)
+            if term_id is None:
+                term_id = term_ids[_SPACES.sub("", term)]
+            yield term_id, m.start(), m.end()
+
+    def scan(self, text):
+        """본문 전체를 훑어 라벨 ID별 (시작 위치 리스트, 끝 위치 리스트)를 반환합니다."""
+        anchors = {}
+        for term_id, start, end in self._iter_anchors(text):
+            starts, ends = anchors.setdefault(term_id, ([], []))
+            starts.append(start)
+            ends.append(end)
+        return anchors
+
+    def _first_start_from(self, anchors, term_ids, pos):
+        """term_ids 중 pos 이후에 처음 시작하는 위치를 반환합니다."""
+        best = None
+        for term_id in term_ids:
+            starts = anchors.get(term_id, ((), ()))[0]
+            i = bisect.bisect_left(starts, pos)
+            if i < len(starts) and (best is None or starts[i] < best):
+                best = starts[i]
+        return best
+
+    def _extract_field(self, text, anchors, field, complete):
+        """지금까지 찾은 라벨 위치로 필드 값을 구합니다.
+
+        complete가 False이면 스캔 도중이므로, 뒤에 나올 라벨에 따라 달라질 수 있는
+        값(라벨 바로 뒤에 종료 라벨이 오는 경우)은 확정하지 않고 None을 반환합니다.
+        """
+        _, label_id, suffix_re, rule, min_len = field
+        for end in anchors.get(label_id, ((), ()))[1]:
+            if suffix_re is not None:
+                m = suffix_re.match(text, end)
+                if not m:
+                    continue
+                end = m.end()
+            if min_len is None:
+                m = rule.match(text, end)
+                if m:
+                    return m.group(1)
+                continue
+            value_start = _WHITESPACE.match(text, end).end()
+            stop = self._first_start_from(anchors, rule, value_start + min_len)
+            if stop is not None:
+                return text[value_start:stop]
+            # 라벨 바로 뒤에 종료 라벨이 오면 공백만 값으로 잡힙니다.
+            if complete and min_len and value_start > end:
+                if self._first_start_from(anchors, rule, value_start) == value_start:
+                    return ""
+        return None
+
+    def _search_fields(self, text):
+        """필드별 re.search로 값을 구합니다. 종료 라벨이 없는 구간 필드가 있으면 None을 반환합니다."""
+        values = {}
+        for name, label_re, terminator_res, pattern in self._searches:
+            start = 0
+            if label_re is not None:
+                label = label_re.search(text)
+                if label is None:
+                    values[name] = None
+                    continue
+                if not any(t.search(text, label.end()) for t in terminator_res):
+                    return None
+                # 앞에는 라벨이 없으므로 첫 라벨부터 찾아도 결과가 같습니다.
+                start = label.start()
+            m = pattern.search(text, start)
+            values[name] = m.group(1) if m else None
+        return values
+
+    def _scan_fields(self, text):
+        """본문을 한 번 훑으며 값을 구하고, 모든 필드가 확정되면 멈춥니다."""
+        anchors = {}
+        values = {}
+        for term_id, start, end in self._iter_anchors(text):
+            starts, ends = anchors.setdefault(term_id, ([], []))
+            starts.append(start)
+            ends.append(end)
+            for field in self._fields_by_term[term_id]:
+                if field[0] not in values:
+                    value = self._extract_field(text, anchors, field, complete=False)
+                    if value is not None:
+                        values[field[0]] = value
+            if len(values) == len(self._fields):
+                break
+
+        for field in self._fields:
+            if values.get(field[0]) is None:
+                values[field[0]] = self._extract_field(text, anchors, field, complete=True)
+        return values
+
+    def extract(self, text):
+        """필드명 → 추출된 문자열(없으면 None) 딕셔너리를 반환합니다."""
+        values = self._search_fields(text)
+        if values is None:
+            values = self._scan_fields(text)
+        info = {}
+        for field in self._fields:
+            value = values[field[0]]
+            info[field[0]] = value.strip().replace("\n", " ") if value is not None else None
+        return info
+
+
+FIELD_EXTRACTOR = FieldExtractor()
+# 회사명만 찾는 추출기로, 회사명이 확정되면 나머지 본문은 훑지 않습니다.
+COMPANY_NAME_EXTRACTOR = FieldExtractor(FIELD_SPECS[:1])
+
+# 양식의 첫 항목(회사명)과 마지막 항목(요청일)이 모두 나오면 양식 전체를 읽은 것으로 봅니다.
+FORM_BOUNDARY_FIELDS = ("company_name", "application_deadline")
+
+
+def is_form_complete(text):
+    """텍스트에 채용 의뢰서 양식이 끝까지 포함되어 있는지 확인합니다."""
+    info = FIELD_EXTRACTOR.extract(text)
+    return all(info[name] is not None for name in FORM_BOUNDARY_FIELDS)
+
+
+def extract_company_name(text):
+    """PDF 텍스트에서 회사명만 추출합니다. extract_info의 company_name과 같은 값입니다."""
+    return COMPANY_NAME_EXTRACTOR.extract(text)["company_name"]
+
+
+def extract_info(text):
+    """PDF 텍스트에서 구조화된 정보를 추출합니다."""
+    info = FIELD_EXTRACTOR.extract(text)
+
+    info["business_type"] = (
+        f"{info['upte']} / {info['jongmok']}"
+        if info.get("upte") and info.get("jongmok")
+        else (info.get("upte") or info.get("jongmok"))
+    )
+
+    if info.get("num_employees"):
+        try:
+            info["num_employees"] = int(info["num_employees"])
+        except (ValueError, TypeError):
+            info["num_employees"] = None
+
+    return info
+
+
+def parse_deadline(deadline_str):
+    """'2025년 7월 10일' 형식의 요청일 문자열을 date로 변환합니다."""
+    if not deadline_str:
+        return None
+    try:
+        date_match = re.search(r"(\d{4}년\s*\d{1,2}월\s*\d{1,2}일)", deadline_str)
+        if date_match:
+            clean_deadline_str = date_match.group(1).replace(" ", "")
+            return datetime.strptime(clean_deadline_str, "%Y년%m월%d일").date()
+    except ValueError:
+        pass
+    return None
+
+
+def parse_establishment_year(established):
+    """'2010. 3. 1.' 형식의 설립일자에서 연도를 추출합니다."""
+    try:
+        return int(established.split(".")[0]) if established else None
+    except (ValueError, TypeError, IndexError, AttributeError):
+        return None
@@ -0,0 +1,117 @@
+import os
+
+from http_client import AsyncHttpClient, HttpClient
+from sse import iter_sse_data
+
+# Gemini API 설정 (GEMINI_API_BASE를 로컬 가짜 서버 주소로 바꾸면 API 키 없이 테스트할 수 있습니다)
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_API_BASE = os.getenv(
+    "GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta"
+)
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "60"))
+GEMINI_RETRIES = int(os.getenv("GEMINI_RETRIES", "3"))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+
+
+class GeminiError(Exception):
+    """Gemini 응답에서 생성 결과를 찾을 수 없을 때 발생합니다."""
+
+
+def _parts_text(response_json):
+    """generateContent 응답(또는 스트리밍 조각)에서 첫 후보의 텍스트를 꺼냅니다."""
+    for candidate in (response_json or {}).get("candidates", [])[:1]:
+        return "".join(
+            part.get("text", "")
+            for part in candidate.get("content", {}).get("parts", [])
+        )
+    return None
+
+
+def _request_headers(api_key):
+    # API 키를 URL이 아닌 헤더로 보내 접근 로그에 남지 않게 합니다.
+    return {"Content-Type": "application/json", "x-goog-api-key": api_key or ""}
+
+
+def _generated_text(response_json):
+    text = _parts_text(response_json)
+    if not text:
+        raise GeminiError(
+            "Gemini API 응답에서 로드맵을 생성할 수 없습니다. 응답 구조를 확인하세요."
+        )
+    return text
+
+
+class GeminiClient:
+    """연결 풀, 타임아웃, 429/5xx 재시도, 동시 호출 수 제한을 갖춘 Gemini API 클라이언트입니다."""
+
+    def __init__(self, api_key=GEMINI_API_KEY, api_base=GEMINI_API_BASE, model=GEMINI_MODEL,
+                 timeout=GEMINI_TIMEOUT, retries=GEMINI_RETRIES,
+                 max_concurrency=GEMINI_MAX_CONCURRENCY):
+        self.api_key = api_key
+        self.model_url = f"{api_base.rstrip('/')}/models/{model}"
+        self.http = HttpClient(
+            "gemini",
+            timeout=timeout,
+            retries=retries,
+            backoff_factor=1.0,
+            max_concurrency=max_concurrency,
+        )
+
+    def generate(self, payload):
+        """generateContent를 호출하여 생성된 텍스트를 반환합니다."""
+        response = self.http.post(
+            f"{self.model_url}:generateContent",
+            headers=_request_headers(self.api_key),
+            json=payload,
+        )
+        response.raise_for_status()
+        return _generated_text(response.json())
+
+    def stream(self, payload):
+        """streamGenerateContent(SSE)를 호출하여 생성되는 텍스트 조각을 차례로 반환합니다."""
+        with self.http.stream(
+            "POST",
+            f"{self.model_url}:streamGenerateContent",
+            params={"alt": "sse"},
+            headers=_request_headers(self.api_key),
+            json=payload,
+        ) as response:
+            response.raise_for_status()
+            for event in iter_sse_data(response):
+                text = _parts_text(event)
+                if text:
+                    yield text
+
+    def stats(self):
+        return self.http.stats()
+
+
+class AsyncGeminiClient:
+    """GeminiClient의 asyncio 버전입니다. ASGI 서버(asgi.py)에서 사용합니다."""
+
+    def __init__(self, api_key=GEMINI_API_KEY, api_base=GEMINI_API_BASE, model=GEMINI_MODEL,
+                 timeout=GEMINI_TIMEOUT, retries=GEMINI_RETRIES,
+                 max_concurrency=GEMINI_MAX_CONCURRENCY):
+        self.api_key = api_key
+        self.model_url = f"{api_base.rstrip('/')}/models/{model}"
+        self.http = AsyncHttpClient(
+            "gemini-async",
+            timeout=timeout,
+            retries=retries,
+            backoff_factor=1.0,
+            max_concurrency=max_concurrency,
+        )
+
+    async def generate(self, payload):
+        """generateContent를 호출하여 생성된 텍스트를 반환합니다."""
+        response = await self.http.post(
+            f"{self.model_url}:generateContent",
+            headers=_request_headers(self.api_key),
+            json=payload,
+        )
+        response.raise_for_status()
+        return _generated_text(response.json())
+
+    def stats(self):
+        return self.http.stats()
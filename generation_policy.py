@@ -0,0 +1,190 @@
+"""기업 분석(200자 내외) 생성의 토큰 예산, 조기 종료 조건, 디코딩 방식을 정합니다.
+
+파이프라인의 기본값(max_new_tokens=1024)은 요청한 길이보다 훨씬 길어서, 모델이 보고서를 다 쓴
+뒤에도 템플릿을 이어 쓰거나 같은 문장을 반복하며 디코딩 단계를 낭비합니다. 이 모듈은
+- 요청 길이(ANALYSIS_TARGET_CHARS)와 토크나이저의 글자/토큰 비율로 max_new_tokens를 정하고,
+- 보고서 끝 표시(##, --- 등), 반복되는 토큰 n-gram, 문장 수로 행마다 생성을 멈추고,
+- 생성 결과에서 끝 표시, 반복 구간, 끝나지 않은 마지막 문장을 잘라냅니다.
+호출마다 생성한 토큰 수와 남긴 토큰 수, 종료 사유를 metrics.py로 기록합니다.
+"""
+import math
+import os
+import re
+import threading
+
+from metrics import llm_generation_stops, llm_tokens
+
+ANALYSIS_TARGET_CHARS = int(os.getenv("ANALYSIS_TARGET_CHARS", "200"))
+# 예산 = 목표 글자 수 / (글자/토큰) × 여유 배수. LLM_MAX_NEW_TOKENS를 지정하면 그 값을 그대로 사용합니다.
+LLM_TOKEN_BUDGET_MARGIN = float(os.getenv("LLM_TOKEN_BUDGET_MARGIN", "1.5"))
+LLM_MAX_NEW_TOKENS = int(os.getenv("LLM_MAX_NEW_TOKENS", "0"))
+LLM_MAX_SENTENCES = int(os.getenv("LLM_MAX_SENTENCES", "5"))
+LLM_REPEAT_NGRAM = int(os.getenv("LLM_REPEAT_NGRAM", "8"))
+# sample: 기존과 같은 샘플링(temperature 0.5) | greedy: 같은 입력에 항상 같은 결과
+LLM_DECODING = os.getenv("LLM_DECODING", "sample").lower()
+
+MIN_TOKEN_BUDGET = 16
+# 보고서 뒤에 모델이 템플릿을 이어 쓰기 시작하는 표시
+STOP_MARKERS = ("##", "---", "\n\n\n")
+# 마침표/물음표/느낌표 뒤에 공백이나 끝이 오면 문장 끝으로 봅니다 (3.5, Node.js는 제외).
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s|$)")
+
+
+def find_stop_marker(text):
+    """내용이 나온 뒤의 첫 끝 표시 위치를 반환합니다. 없으면 None입니다."""
+    start = len(text) - len(text.lstrip())
+    positions = [
+        index
+        for index in (text.find(marker, start + 1) for marker in STOP_MARKERS)
+        if index > start
+    ]
+    return min(positions) if positions else None
+
+
+def count_sentences(text):
+    return len(_SENTENCE_END_RE.findall(text))
+
+
+def repeat_start(token_ids, n):
+    """마지막 n개 토큰이 앞에서 이미 나왔다면 그 반복이 시작된 위치를, 아니면 None을 반환합니다."""
+    if n <= 0 or len(token_ids) < 2 * n:
+        return None
+    tail = token_ids[-n:]
+    for start in range(len(token_ids) - 2 * n + 1):
+        if token_ids[start : start + n] == tail:
+            return len(token_ids) - n
+    return None
+
+
+def trim_report(text, max_sentences=LLM_MAX_SENTENCES):
+    """끝 표시 뒤, max_sentences를 넘는 문장, 끝나지 않은 마지막 문장을 잘라냅니다."""
+    marker = find_stop_marker(text)
+    if marker is not None:
+        text = text[:marker]
+    ends = [match.end() for match in _SENTENCE_END_RE.finditer(text)]
+    if ends:
+        # 문장이 하나 이상 끝났다면 예산 때문에 중간에 끊긴 마지막 문장은 버립니다.
+        text = text[: ends[min(len(ends), max_sentences) - 1]]
+    return text.strip()
+
+
+class ReportStoppingCriteria:
+    """transformers generate의 stopping_criteria로 쓰이며, 행마다 생성 종료 여부를 판단합니다.
+
+    generate 호출 한 번에 하나씩 만들며, 행별 (생성 토큰 수, 종료 사유, 반복 전까지의 토큰)을 기록합니다.
+    """
+
+    def __init__(self, tokenizer, batch_size, max_sentences, repeat_ngram):
+        self.tokenizer = tokenizer
+        self.max_sentences = max_sentences
+        self.repeat_ngram = repeat_ngram
+        # eos 외에 <|eot_id|> 같은 대화 종료 토큰도 있으므로 특수 토큰이면 끝난 것으로 봅니다.
+        self.special_ids = set(tokenizer.all_special_ids)
+        self.steps = 0
+        self.results = [None] * batch_size
+
+    def _check(self, token_ids):
+        if token_ids[-1] in self.special_ids:
+            return "eos", token_ids[:-1]
+        cut = repeat_start(token_ids, self.repeat_ngram)
+        if cut is not None:
+            return "repeat", token_ids[:cut]
+        text = self.tokenizer.decode(token_ids, skip_special_tokens=True)
+        if find_stop_marker(text) is not None:
+            return "marker", token_ids
+        if count_sentences(text) >= self.max_sentences:
+            return "sentences", token_ids
+        return None
+
+    def __call__(self, input_ids, scores, **kwargs):
+        import torch
+
+        self.steps += 1
+        generated = input_ids[:, -self.steps :].tolist()
+        for row, token_ids in enumerate(generated):
+            if self.results[row] is not None:
+                continue
+            stop = self._check(token_ids)
+            if stop is not None:
+                reason, kept_ids = stop
+                self.results[row] = (self.steps, reason, kept_ids)
+        return torch.tensor(
+            [result is not None for result in self.results], device=input_ids.device
+        )
+
+    def result(self, row):
+        """(생성 토큰 수, 종료 사유, 반복 구간을 뺀 토큰 또는 None)을 반환합니다."""
+        if self.results[row] is None:
+            return self.steps, "budget", None
+        steps, reason, kept_ids = self.results[row]
+        return steps, reason, kept_ids if reason == "repeat" else None
+
+
+class GenerationPolicy:
+    """토큰 예산, 디코딩 방식, 종료 조건을 적용하여 생성하고 결과를 정리합니다."""
+
+    def __init__(self, tokenizer, sample_text, target_chars=ANALYSIS_TARGET_CHARS,
+                 decoding=LLM_DECODING, max_sentences=LLM_MAX_SENTENCES,
+                 repeat_ngram=LLM_REPEAT_NGRAM, max_new_tokens=LLM_MAX_NEW_TOKENS,
+                 margin=LLM_TOKEN_BUDGET_MARGIN, temperature=0.5):
+        self.tokenizer = tokenizer
+        self.decoding = decoding
+        self.temperature = temperature
+        self.max_sentences = max_sentences
+        self.repeat_ngram = repeat_ngram
+        self.target_chars = target_chars
+        # 같은 언어의 예시 문장(분석 지시문)으로 이 토크나이저의 토큰당 글자 수를 잽니다.
+        sample_tokens = len(tokenizer(sample_text, add_special_tokens=False).input_ids)
+        self.chars_per_token = len(sample_text) / max(1, sample_tokens)
+        self.token_budget = max_new_tokens or max(
+            MIN_TOKEN_BUDGET, math.ceil(target_chars / self.chars_per_token * margin)
+        )
+        self.calls = 0
+        self.generated_tokens = 0
+        self.kept_tokens = 0
+        self.stops = {}
+        self._lock = threading.Lock()
+
+    def generate_kwargs(self, criteria):
+        kwargs = {"max_new_tokens": self.token_budget, "stopping_criteria": [criteria]}
+        if self.decoding == "greedy":
+            kwargs.update(do_sample=False, temperature=None, top_p=None, top_k=None)
+        else:
+            kwargs.update(do_sample=True, temperature=self.temperature)
+        return kwargs
+
+    def run(self, generate, prompts, **kwargs):
+        """generate(prompts, **생성 인자)로 생성한 텍스트들을 정리하여 입력 순서대로 반환합니다."""
+        criteria = ReportStoppingCriteria(
+            self.tokenizer, len(prompts), self.max_sentences, self.repeat_ngram
+        )
+        texts = generate(prompts, **self.generate_kwargs(criteria), **kwargs)
+        return [self._finish(text, *criteria.result(row)) for row, text in enumerate(texts)]
+
+    def _finish(self, text, generated, reason, kept_ids):
+        if kept_ids is not None:
+            text = self.tokenizer.decode(kept_ids, skip_special_tokens=True)
+        report = trim_report(text, self.max_sentences)
+        # 정리된 텍스트를 다시 토큰화한 수는 생성 토큰과 경계가 조금 다를 수 있어 생성 수를 넘지 않게 합니다.
+        kept = min(generated, len(self.tokenizer(report, add_special_tokens=False).input_ids))
+        llm_tokens.observe(generated, "generated")
+        llm_tokens.observe(kept, "kept")
+        llm_generation_stops.inc(reason)
+        with self._lock:
+            self.calls += 1
+            self.generated_tokens += generated
+            self.kept_tokens += kept
+            self.stops[reason] = self.stops.get(reason, 0) + 1
+        return report
+
+    def status(self):
+        return {
+            "decoding": self.decoding,
+            "targetChars": self.target_chars,
+            "tokenBudget": self.token_budget,
+            "maxSentences": self.max_sentences,
+            "calls": self.calls,
+            "generatedTokens": self.generated_tokens,
+            "keptTokens": self.kept_tokens,
+            "stops": dict(self.stops),
+        }
@@ -0,0 +1,283 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def build_session(retries=2, backoff_factor=0.5, pool_maxsize=10):
+    """keep-alive 연결 풀과 재시도 정책이 설정된 requests.Session을 만듭니다.
+
+    재시도는 연결 오류와 429/5xx 응답에 대해 지수 백오프로 수행하며,
+    Retry-After 헤더가 있으면 그 값을 따릅니다.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ClientMetrics:
+    """HTTP 호출별 지연 시간, 상태 코드, 재시도 횟수를 집계합니다."""
+
+    def __init__(self, sample_size=1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=sample_size)
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.in_flight = 0
+        self.wait_total = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.status_codes = {}
+
+    def start(self, waited):
+        with self._lock:
+            self.in_flight += 1
+            self.wait_total += waited
+
+    def finish(self, seconds, status_code=None, retries=0, error=False):
+        with self._lock:
+            self.in_flight -= 1
+            self.calls += 1
+            self.retries += retries
+            self.latency_total += seconds
+            self.latency_max = max(self.latency_max, seconds)
+            self._latencies.append(seconds)
+            if error or status_code is None or status_code >= 400:
+                self.errors += 1
+            key = str(status_code) if status_code is not None else "error"
+            self.status_codes[key] = self.status_codes.get(key, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+            def percentile(p):
+                if not latencies:
+                    return 0.0
+                return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "retries": self.retries,
+                "inFlight": self.in_flight,
+                "statusCodes": dict(self.status_codes),
+                "latencyAvgMs": self.latency_total / self.calls * 1000 if self.calls else 0.0,
+                "latencyP50Ms": percentile(0.5),
+                "latencyP95Ms": percentile(0.95),
+                "latencyMaxMs": self.latency_max * 1000,
+                "semaphoreWaitAvgMs": (
+                    self.wait_total / self.calls * 1000 if self.calls else 0.0
+                ),
+            }
+
+
+class HttpClient:
+    """외부 API 호출을 위한 공용 HTTP 계층입니다.
+
+    build_session의 연결 풀과 재시도 정책에 기본 타임아웃과 동시 호출 수 제한
+    (max_concurrency, 0이면 제한 없음)을 더하고, 호출별 지표를 ClientMetrics에 기록합니다.
+    만든 클라이언트는 이름으로 등록되어 client_stats()로 조회할 수 있습니다.
+    """
+
+    def __init__(self, name, timeout=10, retries=2, backoff_factor=0.5,
+                 max_concurrency=0, pool_maxsize=10):
+        self.name = name
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.session = build_session(
+            retries=retries,
+            backoff_factor=backoff_factor,
+            pool_maxsize=max(pool_maxsize, max_concurrency),
+        )
+        self.metrics = ClientMetrics()
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+        _clients[name] = self
+
+    @contextmanager
+    def _slot(self):
+        started = time.perf_counter()
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        self.metrics.start(time.perf_counter() - started)
+        try:
+            yield
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    @staticmethod
+    def _retries(response):
+        retries = getattr(response.raw, "retries", None)
+        return len(retries.history) if retries is not None else 0
+
+    def request(self, method, url, **kwargs):
+        """요청을 보내고 응답을 반환합니다. timeout을 주지 않으면 기본 타임아웃을 사용합니다."""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._slot():
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                self.metrics.finish(time.perf_counter() - started, error=True)
+                raise
+            self.metrics.finish(
+                time.perf_counter() - started, response.status_code, self._retries(response)
+            )
+            return response
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    @contextmanager
+    def stream(self, method, url, **kwargs):
+        """stream=True 요청을 보냅니다. 응답을 다 읽고 닫을 때까지 동시 호출 한 자리를 차지합니다."""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._slot():
+            started = time.perf_counter()
+            status_code, retries, error = None, 0, True
+            try:
+                with self.session.request(method, url, stream=True, **kwargs) as response:
+                    status_code, retries = response.status_code, self._retries(response)
+                    yield response
+                    error = False
+            finally:
+                self.metrics.finish(
+                    time.perf_counter() - started, status_code, retries, error=error
+                )
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "timeoutSeconds": self.timeout,
+            "maxConcurrency": self.max_concurrency,
+            **self.metrics.snapshot(),
+        }
+
+
+class AsyncHttpClient:
+    """HttpClient의 asyncio 버전입니다 (httpx 필요).
+
+    이벤트 루프 하나에서 여러 외부 호출을 동시에 진행할 수 있으며, 타임아웃,
+    429/5xx 지수 백오프 재시도(Retry-After 준수), asyncio.Semaphore 동시 호출 수 제한과
+    지표 수집은 HttpClient와 같습니다.
+    """
+
+    def __init__(self, name, timeout=10, retries=2, backoff_factor=0.5,
+                 max_concurrency=0, pool_maxsize=100):
+        import httpx
+
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_concurrency = max_concurrency
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max(pool_maxsize, max_concurrency),
+                max_keepalive_connections=max(pool_maxsize, max_concurrency),
+            ),
+        )
+        self.metrics = ClientMetrics()
+        self._semaphore = None
+        _clients[name] = self
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff_factor * (2 ** attempt)
+
+    @asynccontextmanager
+    async def _slot(self):
+        if self.max_concurrency and self._semaphore is None:
+            # 세마포어는 실행 중인 이벤트 루프 안에서 만들어야 합니다.
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        started = time.perf_counter()
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        self.metrics.start(time.perf_counter() - started)
+        try:
+            yield
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    async def request(self, method, url, **kwargs):
+        """요청을 보내고 응답을 반환합니다. 연결 오류와 429/5xx 응답은 재시도합니다."""
+        import httpx
+
+        async with self._slot():
+            started = time.perf_counter()
+            for attempt in range(self.retries + 1):
+                try:
+                    response = await self.client.request(method, url, **kwargs)
+                except httpx.TransportError:
+                    if attempt == self.retries:
+                        self.metrics.finish(
+                            time.perf_counter() - started, retries=attempt, error=True
+                        )
+                        raise
+                    await asyncio.sleep(self._backoff(attempt))
+                    continue
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.retries:
+                    await asyncio.sleep(self._backoff(attempt, response))
+                    continue
+                self.metrics.finish(
+                    time.perf_counter() - started, response.status_code, retries=attempt
+                )
+                return response
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "timeoutSeconds": self.timeout,
+            "maxConcurrency": self.max_concurrency,
+            **self.metrics.snapshot(),
+        }
+
+
+_clients = {}
+
+
+def client_stats():
+    """등록된 모든 HttpClient/AsyncHttpClient의 지표를 반환합니다."""
+    return [client.stats() for client in list(_clients.values())]
@@ -0,0 +1,271 @@
+"""모델을 한 번만 불러 두고, 여러 워커 프로세스가 Unix 소켓으로 생성을 요청하는 추론 프로세스입니다.
+
+gunicorn 워커마다 create_app()이 MODEL_ID를 따로 불러오면 워커 수만큼 가중치가 메모리에
+올라갑니다. 이 프로세스를 먼저 실행하고 워커에 LLM_SOCKET을 설정하면, 워커는 torch나 모델을
+불러오지 않고 InferenceClient로 생성을 요청합니다. 여러 워커의 요청은 이 프로세스의 마이크로
+배치(LLM_BATCH_WINDOW_MS)로 함께 묶이며, 접두어 캐시와 생성 정책도 이 프로세스에서 적용됩니다.
+
+메시지는 4바이트 길이(빅 엔디언) + UTF-8 JSON이며, 요청 op는 status, generate, stream입니다.
+
+실행: python inference_server.py [--socket /tmp/dbase-llm.sock]
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+
+DEFAULT_SOCKET_PATH = "/tmp/dbase-llm.sock"
+# 생성 한 건(스트리밍은 토큰 사이)의 응답을 기다리는 최대 시간(초)
+LLM_SOCKET_TIMEOUT = float(os.getenv("LLM_SOCKET_TIMEOUT", "300"))
+
+_HEADER = struct.Struct("!I")
+
+
+def send_message(sock, message):
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _recv_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("추론 서버 연결이 끊어졌습니다.")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock):
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return json.loads(_recv_exactly(sock, size))
+
+
+class InferenceRequestHandler(socketserver.BaseRequestHandler):
+    """연결 하나의 요청을 순서대로 처리합니다. 워커는 스레드마다 연결을 하나씩 유지합니다."""
+
+    def handle(self):
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            try:
+                self._dispatch(request)
+            except Exception as e:
+                send_message(self.request, {"error": str(e)})
+
+    def _dispatch(self, request):
+        app_module = self.server.app_module
+        op = request.get("op")
+        if op == "status":
+            send_message(self.request, {"status": app_module.llm_status()})
+            return
+        if op not in ("generate", "stream"):
+            send_message(self.request, {"error": f"알 수 없는 요청입니다: {op}"})
+            return
+        state = app_module.llm_loader.state
+        if state != "ready":
+            send_message(self.request, {"error": f"모델이 준비되지 않았습니다 ({state}).", "state": state})
+            return
+
+        if op == "generate":
+            send_message(self.request, {"text": app_module.llm_batcher(request["prompt"])})
+            return
+        events = app_module.stream_generate(request["prompt"])
+        while True:
+            try:
+                _, data = next(events)
+            except StopIteration as done:
+                send_message(self.request, {"text": done.value})
+                return
+            send_message(self.request, {"token": data["text"]})
+
+
+class InferenceServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, app_module):
+        self.app_module = app_module
+        super().__init__(socket_path, InferenceRequestHandler)
+
+
+def serve(socket_path):
+    """모델 로딩을 시작하고 소켓에서 요청을 기다립니다. 로딩 중에도 status 요청에는 응답합니다."""
+    import app as app_module
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    app_module.llm_loader.start()
+    server = InferenceServer(socket_path, app_module)
+    # 같은 사용자(또는 그룹)로 실행되는 워커만 연결할 수 있게 합니다.
+    os.chmod(socket_path, 0o660)
+    # SIGTERM(systemd, 컨테이너 종료)에도 finally에서 소켓 파일을 지웁니다.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"--- INFO: 추론 서버가 요청을 기다립니다: {socket_path}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+class InferenceClient:
+    """추론 서버에 생성을 요청하는 클라이언트로, LLMLoader와 같은 상태 인터페이스를 가집니다.
+
+    start()는 서버의 모델이 준비될 때까지 백그라운드에서 상태를 확인하고, 준비되면 on_ready(self)를
+    호출합니다. 서버가 아직 떠 있지 않으면 loading 상태로 계속 기다립니다. 연결은 스레드마다 하나씩
+    유지합니다.
+    """
+
+    def __init__(self, socket_path, on_ready=None, timeout=LLM_SOCKET_TIMEOUT, poll_seconds=1.0):
+        self.socket_path = socket_path
+        self.on_ready = on_ready
+        self.timeout = timeout
+        self.poll_seconds = poll_seconds
+        self.state = "not_started"
+        self.error = None
+        self.server_status = {}
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start(self):
+        with self._lock:
+            if self.state != "not_started":
+                return
+            self.state = "loading"
+        threading.Thread(target=self._watch, name="llm-socket-watch", daemon=True).start()
+
+    @property
+    def is_loading(self):
+        return self.state == "loading"
+
+    def wait(self, timeout=None):
+        if self.state == "not_started":
+            return False
+        self._ready.wait(timeout)
+        return self.state == "ready"
+
+    def _watch(self):
+        try:
+            while True:
+                try:
+                    status = self._request({"op": "status"})["status"]
+                except OSError as e:
+                    self.error = f"추론 서버에 연결할 수 없습니다: {e}"
+                    time.sleep(self.poll_seconds)
+                    continue
+                self.server_status = status
+                if status["state"] == "ready":
+                    self.error = None
+                    if self.on_ready:
+                        self.on_ready(self)
+                    self.state = "ready"
+                    print(f"--- INFO: 추론 서버 연결 완료: {self.socket_path}")
+                    return
+                if status["state"] in ("failed", "disabled"):
+                    self.state = status["state"]
+                    self.error = status.get("error")
+                    return
+                time.sleep(self.poll_seconds)
+        finally:
+            self._ready.set()
+
+    def _connection(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _reset(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _send(self, message):
+        try:
+            send_message(self._connection(), message)
+        except OSError:
+            # 추론 서버가 다시 시작되어 끊어진 연결이면 한 번만 다시 연결합니다.
+            self._reset()
+            send_message(self._connection(), message)
+
+    def _receive(self):
+        try:
+            return recv_message(self._local.sock)
+        except (OSError, ValueError):
+            self._reset()
+            raise
+
+    def _request(self, message):
+        self._send(message)
+        return self._receive()
+
+    def generate(self, prompt):
+        """프롬프트 하나의 생성 결과(서버의 생성 정책으로 정리된 텍스트)를 반환합니다."""
+        response = self._request({"op": "generate", "prompt": prompt})
+        if "error" in response:
+            raise RuntimeError(f"추론 서버 오류: {response['error']}")
+        return response["text"]
+
+    def stream(self, prompt):
+        """`yield from`으로 ("token", {"text": ...}) 이벤트를 내보내고 정리된 최종 결과를 반환합니다."""
+        self._send({"op": "stream", "prompt": prompt})
+        finished = False
+        try:
+            while True:
+                response = self._receive()
+                if "token" in response:
+                    yield "token", {"text": response["token"]}
+                    continue
+                finished = True
+                if "error" in response:
+                    raise RuntimeError(f"추론 서버 오류: {response['error']}")
+                return response["text"]
+        finally:
+            if not finished:
+                # 중간에 멈춘 스트림의 남은 응답이 다음 요청에 섞이지 않도록 연결을 버립니다.
+                self._reset()
+
+    def status(self):
+        if self.state == "ready":
+            try:
+                self.server_status = self._request({"op": "status"})["status"]
+                self.error = None
+            except (OSError, ValueError) as e:
+                self.error = f"추론 서버에 연결할 수 없습니다: {e}"
+        return {
+            **self.server_status,
+            "state": self.state,
+            "error": self.error or self.server_status.get("error"),
+            "inferenceServer": {"socket": self.socket_path},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 LLM 추론 프로세스를 실행합니다.")
+    parser.add_argument("--socket", default=os.getenv("LLM_SOCKET") or DEFAULT_SOCKET_PATH,
+                        help="요청을 받을 Unix 소켓 경로 (기본값: LLM_SOCKET 또는 /tmp/dbase-llm.sock)")
+    args = parser.parse_args()
+    serve(args.socket)
+
+
+if __name__ == "__main__":
+    main()
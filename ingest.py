@@ -0,0 +1,325 @@
+"""채용 의뢰서 PDF 디렉터리를 한 번에 처리하여 DB에 저장하는 일괄 수집 명령입니다.
+
+PDF 텍스트 추출과 필드 파싱은 프로세스 풀에서, Serper 검색과 LLM 분석은 스레드 풀에서
+파이프라인으로 처리하고, 결과는 batch-size 단위의 트랜잭션으로 저장합니다. 처리한 파일의
+내용 해시를 상태 파일과 job_information.content_hash에 기록하므로 중단 후 다시 실행하거나
+API로 이미 업로드된 파일이 있어도 남은 파일만 처리합니다.
+
+실행: python ingest.py [디렉터리] [--workers 4] [--search-workers 8] [--batch-size 20]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from datetime import datetime
+
+from extractor import extract_info
+from pdf_reader import extract_form_text, file_sha256
+
+AI_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STATE_PATH = os.path.join(AI_DIR, "ingest_state.jsonl")
+
+
+def find_pdfs(root):
+    """디렉터리 아래의 모든 PDF 파일 경로를 정렬하여 반환합니다."""
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        paths.extend(
+            os.path.join(dirpath, name)
+            for name in filenames
+            if name.lower().endswith(".pdf")
+        )
+    return sorted(paths)
+
+
+def load_state(state_path):
+    """상태 파일에서 이미 처리된 파일의 내용 해시 집합을 읽습니다."""
+    if not os.path.exists(state_path):
+        return set()
+    with open(state_path, encoding="utf-8") as f:
+        return {json.loads(line)["hash"] for line in f if line.strip()}
+
+
+def parse_file(path):
+    """(프로세스 풀) PDF 텍스트를 추출하고 필드를 파싱합니다.
+
+    (info, 오류 메시지, 소요 시간) 튜플을 반환합니다.
+    """
+    started = time.perf_counter()
+    try:
+        # 이미 프로세스 풀 안에서 실행되므로 페이지 병렬 추출은 사용하지 않습니다.
+        text = extract_form_text(path, workers=0)
+        if not text.strip():
+            return None, "텍스트를 추출할 수 없습니다.", time.perf_counter() - started
+        info = extract_info(text)
+        if not info.get("company_name"):
+            return None, "회사명을 추출할 수 없습니다.", time.perf_counter() - started
+        return info, None, time.perf_counter() - started
+    except Exception as e:
+        return None, f"PDF 처리 실패: {e}", time.perf_counter() - started
+
+
+class StageTimer:
+    """단계별 누적 처리 시간과 건수를 기록합니다."""
+
+    def __init__(self):
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds, count=1):
+        with self._lock:
+            total, n = self.totals.get(stage, (0.0, 0))
+            self.totals[stage] = (total + seconds, n + count)
+
+
+def enrich(flask_app, info, timer):
+    """(스레드 풀) 회사명을 검색하고 (AI 기업 분석, 분석 상태, 근거가 된 검색 요약 지문)을 반환합니다.
+
+    API의 analyze 단계와 같이 저장된 회사의 분석이 같은 검색 근거로 만든 것이면 그대로 쓰고,
+    모델이 없어 분석을 건너뛰었을 때는 저장된 실제 분석을 덮어쓰지 않습니다.
+    """
+    import app as app_module
+    from persistence import find_company
+
+    with flask_app.app_context():
+        company_name = info["company_name"]
+        started = time.perf_counter()
+        search_summary = app_module.search_summary_for(company_name)
+        existing = find_company(company_name)
+        searched = time.perf_counter()
+        reused = app_module.reusable_analysis(existing, search_summary)
+        if reused is not None:
+            ai_analysis, analysis_status = reused, "existing"
+        else:
+            ai_analysis, analysis_status = app_module.analyze_company(company_name, search_summary)
+        ai_analysis, analysis_status = app_module.keep_existing_analysis(
+            existing, ai_analysis, analysis_status
+        )
+        timer.add("search", searched - started)
+        timer.add("analyze", time.perf_counter() - searched)
+        return (
+            ai_analysis,
+            analysis_status,
+            app_module.analysis_fingerprint(search_summary, analysis_status, existing),
+        )
+
+
+class Ingestor:
+    def __init__(self, flask_app, state_path, workers, search_workers, batch_size):
+        self.flask_app = flask_app
+        self.state_path = state_path
+        self.workers = workers
+        self.search_workers = search_workers
+        self.batch_size = max(1, batch_size)
+        self.timer = StageTimer()
+        self.counts = {
+            "scanned": 0,
+            "skipped": 0,
+            "duplicates": 0,
+            "processed": 0,
+            "analysisSkipped": 0,
+            "failed": 0,
+        }
+        self._batch = []
+
+    def _record_state(self, entries):
+        with open(self.state_path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _persist(self, records):
+        """(info, ai_analysis, 검색 요약 지문, path, hash) 목록을 저장하고 성공한 항목을 상태 파일에 기록합니다."""
+        import app as app_module
+        from models import db
+        from persistence import bulk_upsert
+
+        with self.flask_app.app_context():
+            started = time.perf_counter()
+            try:
+                saved = bulk_upsert(
+                    [
+                        (
+                            info,
+                            ai_analysis,
+                            {"content_hash": file_hash, "search_fingerprint": fingerprint},
+                        )
+                        for info, ai_analysis, fingerprint, _, file_hash in records
+                    ]
+                )
+                results = list(zip(records, saved))
+            except Exception as e:
+                # 한 건의 오류로 배치 전체가 실패하지 않도록 한 건씩 다시 저장합니다.
+                db.session.rollback()
+                print(f"--- ERROR: 배치 저장 실패, 개별 저장으로 재시도합니다: {e}")
+                results = []
+                for record in records:
+                    try:
+                        saved = app_module.persist_records(
+                            record[0],
+                            record[1],
+                            content_hash=record[4],
+                            search_fingerprint=record[2],
+                        )
+                        results.append((record, saved))
+                    except Exception as record_error:
+                        db.session.rollback()
+                        self.counts["failed"] += 1
+                        print(f"--- ERROR: '{record[3]}' 저장 실패: {record_error}")
+            self.timer.add("persist", time.perf_counter() - started, len(records))
+
+            processed_at = datetime.now().isoformat(timespec="seconds")
+            self._record_state(
+                {
+                    "hash": file_hash,
+                    "file": path,
+                    "companyId": company_id,
+                    "jobInformationId": job_information_id,
+                    "processedAt": processed_at,
+                }
+                for (_, _, _, path, file_hash), (company_id, job_information_id) in results
+            )
+            self.counts["processed"] += len(results)
+
+    def _flush(self, force=False):
+        while self._batch and (force or len(self._batch) >= self.batch_size):
+            records = self._batch[: self.batch_size]
+            del self._batch[: self.batch_size]
+            self._persist(records)
+
+    def _processed_hashes(self, hashes):
+        """상태 파일과 DB(API로 업로드된 문서 포함)에 기록된 처리 완료 해시를 합칩니다."""
+        from persistence import existing_content_hashes
+
+        with self.flask_app.app_context():
+            return load_state(self.state_path) | existing_content_hashes(hashes)
+
+    def run(self, paths):
+        hashes = {path: file_sha256(path) for path in paths}
+        done_hashes = self._processed_hashes(set(hashes.values()))
+        seen_hashes = set()
+        todo = []
+        for path in paths:
+            self.counts["scanned"] += 1
+            file_hash = hashes[path]
+            if file_hash in done_hashes:
+                self.counts["skipped"] += 1
+                continue
+            if file_hash in seen_hashes:
+                self.counts["duplicates"] += 1
+                continue
+            seen_hashes.add(file_hash)
+            todo.append((path, file_hash))
+        print(
+            f"--- INFO: PDF {len(paths)}개 중 {len(todo)}개 처리 "
+            f"(이미 처리됨 {self.counts['skipped']}개, 중복 {self.counts['duplicates']}개)."
+        )
+
+        started = time.perf_counter()
+        # 워커 프로세스가 torch를 불러온 부모를 fork하지 않도록 spawn을 사용합니다.
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(self.workers, mp_context=mp_context) as parse_pool, \
+                ThreadPoolExecutor(self.search_workers) as enrich_pool:
+            pending = {}
+            for path, file_hash in todo:
+                future = parse_pool.submit(parse_file, path)
+                pending[future] = ("parse", path, file_hash, None)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, path, file_hash, info = pending.pop(future)
+                    if stage == "parse":
+                        info, error, seconds = future.result()
+                        self.timer.add("parse", seconds)
+                        if error:
+                            self.counts["failed"] += 1
+                            print(f"--- ERROR: '{path}' {error}")
+                            continue
+                        next_future = enrich_pool.submit(
+                            enrich, self.flask_app, info, self.timer
+                        )
+                        pending[next_future] = ("enrich", path, file_hash, info)
+                        continue
+                    try:
+                        ai_analysis, analysis_status, fingerprint = future.result()
+                    except Exception as e:
+                        self.counts["failed"] += 1
+                        print(f"--- ERROR: '{path}' 검색/분석 실패: {e}")
+                        continue
+                    if analysis_status not in ("done", "cached", "existing"):
+                        self.counts["analysisSkipped"] += 1
+                    self._batch.append((info, ai_analysis, fingerprint, path, file_hash))
+                    self._flush()
+            self._flush(force=True)
+
+        return time.perf_counter() - started
+
+    def summary(self, elapsed):
+        lines = [
+            "=== 일괄 수집 결과 ===",
+            f"검사한 파일: {self.counts['scanned']}",
+            f"건너뜀(이미 처리): {self.counts['skipped']}",
+            f"건너뜀(같은 내용의 중복 파일): {self.counts['duplicates']}",
+            f"처리 완료: {self.counts['processed']}",
+            f"AI 분석 없이 저장: {self.counts['analysisSkipped']} (서버의 모델이 준비되면 생성됩니다)",
+            f"실패: {self.counts['failed']}",
+            f"소요 시간: {elapsed:.1f}초",
+            f"처리량: {self.counts['processed'] / elapsed if elapsed else 0:.2f} 문서/초",
+        ]
+        for stage in ("parse", "search", "analyze", "persist"):
+            total, n = self.timer.totals.get(stage, (0.0, 0))
+            if n:
+                lines.append(
+                    f"  {stage:<8} 평균 {total / n * 1000:.1f}ms (누적 {total:.1f}초, {n}건)"
+                )
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="채용 의뢰서 PDF 디렉터리를 일괄 처리하여 DB에 저장합니다."
+    )
+    parser.add_argument(
+        "directory", nargs="?", help="PDF 디렉터리 (기본값: 백엔드 업로드 디렉터리)"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="PDF 파싱 프로세스 수")
+    parser.add_argument("--search-workers", type=int, default=8,
+                        help="검색/분석 동시 처리 스레드 수")
+    parser.add_argument("--batch-size", type=int, default=20,
+                        help="한 트랜잭션에 저장할 문서 수")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH,
+                        help="처리 완료 파일 해시를 기록할 상태 파일")
+    args = parser.parse_args()
+
+    import app as app_module
+
+    directory = args.directory or app_module.UPLOAD_JOB_INFO_ROOT
+    paths = find_pdfs(directory)
+    flask_app = app_module.create_app()
+    print("--- INFO: LLM 모델 로딩을 기다립니다...")
+    if not app_module.llm_loader.wait():
+        # 분석 없이 저장된 회사는 서버의 대기 중 분석 백필이나 refresh_analysis.py가 생성합니다.
+        print("--- ERROR: LLM 모델을 불러오지 못해 AI 분석 없이 저장합니다.")
+
+    ingestor = Ingestor(
+        flask_app,
+        state_path=args.state,
+        workers=args.workers,
+        search_workers=args.search_workers,
+        batch_size=args.batch_size,
+    )
+    elapsed = ingestor.run(paths)
+    print(ingestor.summary(elapsed))
+
+
+if __name__ == "__main__":
+    main()
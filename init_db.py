@@ -2,7 +2,8 @@ import os
 from app import create_app
 from models import db, User, UserCompany, Experience, CompanyInformation, JobInformation, ApplicationStatus, PresentCompany
 
-app = create_app()
+# DB 초기화에는 LLM이 필요 없으므로 모델을 불러오지 않습니다.
+app = create_app(load_llm=False)
 
 def init_database():
     """데이터베이스의 모든 테이블을 삭제하고 다시 생성합니다."""
@@ -0,0 +1,282 @@
+import os
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+
+from sqlalchemy import and_, or_, update
+
+from models import db, PipelineJob
+
+# 채용 의뢰서 처리 파이프라인의 단계. extract 뒤의 parse, search, lookup은 동시에 실행되고
+# normalize는 analyze와 동시에 실행되므로, 보고 순서는 실행마다 다를 수 있습니다.
+JOB_STAGES = ("extract", "parse", "search", "lookup", "normalize", "analyze", "persist")
+
+# 다른 프로세스가 등록한 작업을 확인하는 간격(초)
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+# 처리 중인 작업의 heartbeat가 이 시간(초) 동안 갱신되지 않으면 다른 워커가 다시 처리합니다.
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+# 워커가 죽어 다시 처리하는 작업의 최대 시도 횟수
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _pending_stages():
+    return {
+        stage: {"status": "pending", "started_at": None, "finished_at": None}
+        for stage in JOB_STAGES
+    }
+
+
+class JobQueue:
+    """PDF 처리 작업을 DB(pipeline_job 테이블)에 등록하고 워커 스레드 풀에서 처리합니다.
+
+    작업 상태가 DB에 있으므로 여러 gunicorn 워커 중 어느 프로세스에서도 작업을 조회할 수 있고,
+    등록된 작업은 재시작 후에도 남습니다. 워커는 조건부 UPDATE로 대기 중인 작업을 하나씩
+    가져가며(다른 프로세스와 겹치지 않음), 처리 중에는 heartbeat를 갱신합니다. heartbeat가
+    JOB_LEASE_SECONDS 동안 멈춘 작업(워커가 죽은 경우)은 다른 워커가 다시 처리합니다.
+
+    handler(payload, report)는 워커 스레드에서 호출되며, report(stage, status)로
+    각 단계의 진행 상황을 알립니다. handler의 반환값(JSON)은 작업 결과로 저장됩니다.
+    모든 DB 작업은 app의 애플리케이션 컨텍스트에서 실행합니다.
+    """
+
+    def __init__(self, app, handler, num_workers=2, max_finished=1000,
+                 poll_seconds=JOB_POLL_SECONDS, lease_seconds=JOB_LEASE_SECONDS,
+                 max_attempts=JOB_MAX_ATTEMPTS):
+        self.app = app
+        self.handler = handler
+        self.num_workers = max(1, int(num_workers))
+        self.max_finished = max_finished
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._running = set()
+        self._workers = []
+
+    def start(self):
+        """워커 스레드를 시작합니다. 이미 시작된 경우 아무것도 하지 않습니다."""
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.num_workers):
+                worker = threading.Thread(
+                    target=self._work, name=f"pdf-job-worker-{i}", daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+            threading.Thread(target=self._heartbeat, name="pdf-job-heartbeat", daemon=True).start()
+        print(f"--- INFO: 작업 큐 워커 {self.num_workers}개 시작.")
+
+    def submit(self, payload):
+        """작업을 큐에 등록하고 작업 ID를 반환합니다."""
+        job_id = uuid.uuid4().hex
+        with self.app.app_context():
+            db.session.add(
+                PipelineJob(
+                    id=job_id,
+                    status="queued",
+                    payload=payload,
+                    stages=_pending_stages(),
+                    attempts=0,
+                    created_at=_now(),
+                )
+            )
+            db.session.commit()
+            self._evict_finished()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """작업 상태를 딕셔너리로 반환합니다. 없는 작업이면 None을 반환합니다."""
+        with self.app.app_context():
+            job = PipelineJob.query.filter_by(id=job_id).first()
+            if job is None:
+                return None
+            queue_position = None
+            if job.status == "queued":
+                queue_position = PipelineJob.query.filter(
+                    PipelineJob.status == "queued", PipelineJob.seq <= job.seq
+                ).count()
+            return {
+                "id": job.id,
+                "status": job.status,
+                "payload": job.payload,
+                "stages": job.stages,
+                "result": job.result,
+                "error": job.error,
+                "created_at": job.created_at,
+                "started_at": job.started_at,
+                "finished_at": job.finished_at,
+                "queue_position": queue_position,
+            }
+
+    def _evict_finished(self):
+        """완료된 작업이 max_finished를 넘으면 오래된 것부터 삭제합니다."""
+        finished = PipelineJob.status.in_(FINISHED_STATUSES)
+        cutoff = db.session.scalar(
+            db.select(PipelineJob.seq)
+            .where(finished)
+            .order_by(PipelineJob.seq.desc())
+            .offset(self.max_finished)
+            .limit(1)
+        )
+        if cutoff is not None:
+            db.session.execute(
+                db.delete(PipelineJob).where(finished, PipelineJob.seq <= cutoff)
+            )
+            db.session.commit()
+
+    def _claimable(self, now):
+        """대기 중인 작업과, heartbeat가 끊긴 처리 중 작업의 조건입니다."""
+        return or_(
+            PipelineJob.status == "queued",
+            and_(
+                PipelineJob.status == "running",
+                PipelineJob.heartbeat_at < now - self.lease_seconds,
+            ),
+        )
+
+    def _claim(self):
+        """처리할 작업 하나를 가져와 running으로 바꾸고 (ID, payload)를 반환합니다. 없으면 None입니다."""
+        with self.app.app_context():
+            now = int(time.time())
+            candidates = db.session.execute(
+                db.select(PipelineJob.id, PipelineJob.attempts)
+                .where(self._claimable(now))
+                .order_by(PipelineJob.seq)
+                .limit(self.num_workers)
+            ).all()
+            for job_id, attempts in candidates:
+                if attempts >= self.max_attempts:
+                    # 워커가 처리 도중 여러 번 죽은 작업은 다시 시도하지 않습니다.
+                    db.session.execute(
+                        update(PipelineJob)
+                        .where(PipelineJob.id == job_id, self._claimable(now))
+                        .values(
+                            status="failed",
+                            error={
+                                "message": f"작업을 처리하던 워커가 {attempts}번 중단되었습니다.",
+                                "status_code": 500,
+                            },
+                            finished_at=_now(),
+                        )
+                    )
+                    db.session.commit()
+                    continue
+                # 다른 프로세스가 먼저 가져간 작업이면 조건이 맞지 않아 갱신되지 않습니다.
+                claimed = db.session.execute(
+                    update(PipelineJob)
+                    .where(PipelineJob.id == job_id, self._claimable(now))
+                    .values(
+                        status="running",
+                        attempts=attempts + 1,
+                        heartbeat_at=now,
+                        started_at=_now(),
+                        stages=_pending_stages(),
+                    )
+                ).rowcount
+                db.session.commit()
+                if claimed:
+                    payload = db.session.scalar(
+                        db.select(PipelineJob.payload).where(PipelineJob.id == job_id)
+                    )
+                    return job_id, payload
+            return None
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(max(1, self.lease_seconds // 4))
+            with self._lock:
+                running = list(self._running)
+            if not running:
+                continue
+            try:
+                with self.app.app_context():
+                    db.session.execute(
+                        update(PipelineJob)
+                        .where(PipelineJob.id.in_(running), PipelineJob.status == "running")
+                        .values(heartbeat_at=int(time.time()))
+                    )
+                    db.session.commit()
+            except Exception as e:
+                print(f"--- ERROR: 작업 heartbeat 갱신 실패: {e}")
+
+    def _report(self, job_id, stage, status):
+        with self.app.app_context():
+            job = PipelineJob.query.filter_by(id=job_id).first()
+            if job is None or stage not in job.stages:
+                return
+            stages = {k: dict(v) for k, v in job.stages.items()}
+            entry = stages[stage]
+            entry["status"] = status
+            if status == "running":
+                entry["started_at"] = _now()
+            elif status in ("done", "failed", "skipped"):
+                entry["finished_at"] = _now()
+            job.stages = stages
+            db.session.commit()
+
+    def _finish(self, job_id, **values):
+        with self.app.app_context():
+            job = PipelineJob.query.filter_by(id=job_id).first()
+            if job is None:
+                return
+            if values["status"] == "failed":
+                stages = {k: dict(v) for k, v in job.stages.items()}
+                for entry in stages.values():
+                    if entry["status"] == "running":
+                        entry["status"] = "failed"
+                        entry["finished_at"] = _now()
+                job.stages = stages
+            for key, value in values.items():
+                setattr(job, key, value)
+            job.finished_at = _now()
+            db.session.commit()
+
+    def _work(self):
+        while True:
+            try:
+                claimed = self._claim()
+            except Exception as e:
+                print(f"--- ERROR: 작업 큐 조회 실패: {e}")
+                claimed = None
+            if claimed is None:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+            self._run(*claimed)
+
+    def _run(self, job_id, payload):
+        with self._lock:
+            self._running.add(job_id)
+
+        def report(stage, status):
+            self._report(job_id, stage, status)
+
+        try:
+            try:
+                result = self.handler(payload, report)
+            except Exception as e:
+                traceback.print_exc()
+                self._finish(
+                    job_id,
+                    status="failed",
+                    error={
+                        "message": str(e),
+                        "status_code": getattr(e, "status_code", 500),
+                    },
+                )
+                return
+            self._finish(job_id, status="succeeded", result=result)
+        finally:
+            with self._lock:
+                self._running.discard(job_id)
@@ -0,0 +1,204 @@
+import os
+import threading
+import time
+
+# 추론 백엔드: torch | onnx (optimum[onnxruntime] 필요)
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "torch")
+# 정밀도: auto(GPU는 fp16, CPU는 fp32) | fp32 | bf16 | fp16 | int8
+MODEL_PRECISION = os.getenv("MODEL_PRECISION", "auto")
+# ONNX로 변환한 모델을 저장해 두고 다음 시작 때 재사용할 디렉터리
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR")
+# 파이프라인과 프롬프트 접두어 캐시 생성(prefix_cache.py)이 함께 쓰는 생성 설정
+GENERATION_KWARGS = {"max_new_tokens": 1024, "do_sample": True, "temperature": 0.5}
+
+# 선택한 설정이 실패하면 시도할 다음 설정
+PRECISION_FALLBACKS = {
+    "int8": "bf16",
+    "bf16": "fp32",
+    "fp16": "fp32",
+}
+
+
+def candidate_configs(backend, precision, cuda):
+    """선택한 (백엔드, 정밀도)에서 시작하여 실패 시 차례로 시도할 설정 목록을 만듭니다."""
+    if precision == "auto":
+        precision = "fp16" if cuda else "fp32"
+    configs = []
+    if backend == "onnx":
+        configs.append(("onnx", "fp32"))
+    while precision:
+        configs.append(("torch", precision))
+        precision = PRECISION_FALLBACKS.get(precision)
+    return configs
+
+
+class LLMLoader:
+    """LLM 파이프라인을 백그라운드 스레드에서 불러옵니다.
+
+    torch/transformers는 start()가 호출된 뒤 로딩 스레드 안에서만 import하므로,
+    start()를 호출하지 않는 도구(init_db.py 등)는 모델이나 torch를 전혀 건드리지 않습니다.
+    상태는 not_started → loading → ready | failed | disabled 순서로 바뀝니다.
+
+    MODEL_BACKEND와 MODEL_PRECISION으로 추론 방식을 고르며, 불러온 뒤 짧은 생성으로
+    자체 점검을 하고 실패하면 더 안전한 설정(int8 → bf16 → fp32)으로 다시 시도합니다.
+    """
+
+    def __init__(self, model_id, on_ready=None, backend=MODEL_BACKEND, precision=MODEL_PRECISION):
+        self.model_id = model_id
+        self.on_ready = on_ready
+        self.backend = backend
+        self.precision = precision
+        self.state = "not_started"
+        self.error = None
+        self.pipeline = None
+        self.load_seconds = None
+        self.active_config = None
+        self.attempts = []
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """로딩 스레드를 시작합니다. 이미 시작했으면 아무것도 하지 않습니다."""
+        with self._lock:
+            if self.state != "not_started":
+                return
+            self.state = "loading"
+        threading.Thread(target=self._load, name="llm-loader", daemon=True).start()
+
+    @property
+    def is_loading(self):
+        return self.state == "loading"
+
+    def wait(self, timeout=None):
+        """로딩이 끝날 때까지 기다리고, 파이프라인이 준비되었는지 반환합니다."""
+        if self.state == "not_started":
+            return False
+        self._ready.wait(timeout)
+        return self.state == "ready"
+
+    def _load_torch_model(self, torch, precision):
+        from transformers import AutoModelForCausalLM
+
+        cuda = torch.cuda.is_available()
+        kwargs = {"low_cpu_mem_usage": True, "device_map": "auto" if cuda else "cpu"}
+        if precision == "int8" and cuda:
+            from transformers import BitsAndBytesConfig
+
+            kwargs["quantization_config"] = BitsAndBytesConfig(load_in_8bit=True)
+            return AutoModelForCausalLM.from_pretrained(self.model_id, **kwargs)
+
+        dtypes = {
+            "fp32": torch.float32,
+            "bf16": torch.bfloat16,
+            "fp16": torch.float16,
+            # CPU int8은 bf16으로 불러온 뒤 양자화하므로 fp32 전체 가중치를 메모리에 올리지 않습니다.
+            "int8": torch.bfloat16,
+        }
+        model = AutoModelForCausalLM.from_pretrained(
+            self.model_id, torch_dtype=dtypes[precision], **kwargs
+        )
+        if precision == "int8":
+            # CPU에서는 Linear 가중치를 int8로 동적 양자화합니다. inplace로 층을 하나씩 바꾸므로
+            # 모델 사본을 만들지 않고, 바뀐 층의 bf16 가중치는 바로 해제됩니다.
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+            # 동적 양자화 Linear는 fp32 입력만 받으므로 남은 임베딩/정규화 층을 fp32로 맞춥니다.
+            model = model.float()
+        return model
+
+    def _load_onnx_model(self):
+        from optimum.onnxruntime import ORTModelForCausalLM
+
+        if ONNX_MODEL_DIR and os.path.isdir(ONNX_MODEL_DIR):
+            return ORTModelForCausalLM.from_pretrained(ONNX_MODEL_DIR)
+        model = ORTModelForCausalLM.from_pretrained(self.model_id, export=True)
+        if ONNX_MODEL_DIR:
+            model.save_pretrained(ONNX_MODEL_DIR)
+        return model
+
+    def _build_pipeline(self, torch, tokenizer, backend, precision):
+        from transformers import pipeline
+
+        if backend == "onnx":
+            model = self._load_onnx_model()
+        else:
+            model = self._load_torch_model(torch, precision)
+        llm_pipeline = pipeline(
+            "text-generation",
+            model=model,
+            tokenizer=tokenizer,
+            **GENERATION_KWARGS,
+        )
+        # 자체 점검: 짧은 생성이 예외 없이 문자열을 돌려주는지 확인합니다.
+        output = llm_pipeline(
+            "안녕하세요", max_new_tokens=4, do_sample=False, return_full_text=False
+        )
+        if not isinstance(output[0]["generated_text"], str):
+            raise RuntimeError("자체 점검 생성 결과가 올바르지 않습니다.")
+        return llm_pipeline
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            try:
+                import torch
+                from transformers import AutoTokenizer
+            except ImportError:
+                self.state = "disabled"
+                self.error = "torch 또는 transformers가 설치되어 있지 않습니다."
+                print("Warning: torch or transformers not found. LLM features will be disabled.")
+                return
+
+            print(f"--- INFO: LLM 파이프라인 로딩 시작: {self.model_id}")
+            tokenizer = AutoTokenizer.from_pretrained(self.model_id)
+            # 배치 생성 시 프롬프트 길이를 맞추기 위해 왼쪽 패딩을 사용
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            tokenizer.padding_side = "left"
+
+            llm_pipeline = None
+            for backend, precision in candidate_configs(
+                self.backend, self.precision, torch.cuda.is_available()
+            ):
+                try:
+                    llm_pipeline = self._build_pipeline(torch, tokenizer, backend, precision)
+                except Exception as e:
+                    self.attempts.append(
+                        {"backend": backend, "precision": precision, "error": str(e)}
+                    )
+                    print(
+                        f"--- ERROR: LLM 로딩/자체 점검 실패 ({backend}, {precision}): {e}"
+                    )
+                    continue
+                self.active_config = {"backend": backend, "precision": precision}
+                break
+            if llm_pipeline is None:
+                raise RuntimeError("사용 가능한 추론 설정이 없습니다.")
+
+            self.pipeline = llm_pipeline
+            self.load_seconds = time.perf_counter() - started
+            if self.on_ready:
+                self.on_ready(llm_pipeline)
+            self.state = "ready"
+            print(
+                f"--- INFO: LLM 파이프라인 로딩 성공 ({self.active_config['backend']}, "
+                f"{self.active_config['precision']}, {self.load_seconds:.1f}초)."
+            )
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            print(f"--- ERROR: LLM 파이프라인 로딩 실패: {e}")
+        finally:
+            self._ready.set()
+
+    def status(self):
+        return {
+            "state": self.state,
+            "modelId": self.model_id,
+            "requested": {"backend": self.backend, "precision": self.precision},
+            "active": self.active_config,
+            "failedAttempts": self.attempts,
+            "error": self.error,
+            "loadSeconds": self.load_seconds,
+        }
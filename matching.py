@@ -0,0 +1,221 @@
+"""학생 프로필과 채용 공고를 해시 문자 n-gram TF-IDF 벡터로 비교하는 매칭 엔진입니다.
+
+채용 공고(직무명, 자격 요건, 업무 내용)는 단어 안의 문자 2~3-gram을 MATCHING_FEATURES개
+버킷으로 해싱한 희소 벡터(로그 TF, L2 정규화)로 만들어 SciPy CSR 행렬 하나에 쌓습니다.
+IDF는 질의(학생) 쪽에만 곱하므로, 새 공고가 추가되어도 기존 행을 다시 계산하지 않고 행만
+덧붙입니다. 학생 여러 명은 하나의 희소 행렬로 묶어 한 번의 행렬 곱으로 모든 공고와 비교합니다.
+형태소 분석기 없이도 '파이썬'/'파이썬을', 'React'/'react.js'처럼 어미나 표기가 달라도 겹칩니다.
+"""
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+from scipy import sparse
+
+from models import db, CompanyInformation, Experience, JobInformation, User, UserCompany
+
+MATCHING_FEATURES = int(os.getenv("MATCHING_FEATURES", str(2**18)))
+NGRAM_SIZES = (2, 3)
+# C++, C#, Node.js 같은 기술명이 쪼개지지 않도록 +, #, .은 단어에 포함합니다.
+_WORD_RE = re.compile(r"[\w+#.]+")
+
+
+def char_ngrams(text):
+    """소문자로 바꾼 각 단어의 앞뒤에 공백을 붙여 문자 n-gram을 만듭니다 (단어 경계를 넘지 않음)."""
+    grams = []
+    for word in _WORD_RE.findall((text or "").lower()):
+        padded = f" {word.strip('.')} "
+        for n in NGRAM_SIZES:
+            grams.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def hashed_counts(text, n_features=MATCHING_FEATURES):
+    """텍스트의 n-gram을 해싱하여 (버킷 번호 배열, 빈도 배열)을 반환합니다.
+
+    프로세스마다 값이 바뀌는 hash() 대신 crc32를 사용하므로 어느 워커에서나 같은 버킷이 됩니다.
+    """
+    grams = char_ngrams(text)
+    if not grams:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    buckets = np.fromiter(
+        (zlib.crc32(gram.encode("utf-8")) % n_features for gram in grams),
+        dtype=np.int32,
+        count=len(grams),
+    )
+    indices, counts = np.unique(buckets, return_counts=True)
+    return indices, counts.astype(np.float32)
+
+
+def _rows(texts, n_features, weights=None):
+    """텍스트 목록을 로그 TF(× weights) 후 L2 정규화한 CSR 행렬로 만듭니다."""
+    indptr = [0]
+    indices = []
+    data = []
+    for text in texts:
+        row_indices, counts = hashed_counts(text, n_features)
+        values = 1.0 + np.log(counts)
+        if weights is not None:
+            values *= weights[row_indices]
+        norm = np.linalg.norm(values)
+        if norm:
+            values /= norm
+        indices.append(row_indices)
+        data.append(values)
+        indptr.append(indptr[-1] + len(row_indices))
+    return sparse.csr_matrix(
+        (
+            np.concatenate(data) if data else np.empty(0, dtype=np.float32),
+            np.concatenate(indices) if indices else np.empty(0, dtype=np.int32),
+            np.asarray(indptr, dtype=np.int64),
+        ),
+        shape=(len(texts), n_features),
+        dtype=np.float32,
+    )
+
+
+def job_text(job_title, qualifications, job_description):
+    # 직무명은 짧지만 가장 중요한 신호이므로 두 번 넣어 가중치를 높입니다.
+    return " ".join(filter(None, (job_title, job_title, qualifications, job_description)))
+
+
+class JobMatchingIndex:
+    """채용 공고 벡터 행렬과 공고별 문서 빈도(df)를 유지하는 스레드 안전 인덱스입니다."""
+
+    def __init__(self, n_features=MATCHING_FEATURES):
+        self.n_features = n_features
+        self.job_ids = np.empty(0, dtype=np.int64)
+        self.matrix = sparse.csr_matrix((0, n_features), dtype=np.float32)
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.last_job_id = 0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def add(self, jobs):
+        """(채용 정보 ID, 텍스트) 목록을 행렬 끝에 덧붙입니다."""
+        if not jobs:
+            return
+        rows = _rows([text for _, text in jobs], self.n_features)
+        with self._lock:
+            self.matrix = sparse.vstack([self.matrix, rows], format="csr")
+            self.job_ids = np.concatenate(
+                [self.job_ids, np.fromiter((job_id for job_id, _ in jobs), dtype=np.int64)]
+            )
+            np.add.at(self.document_frequency, rows.indices, 1)
+            self.last_job_id = max(self.last_job_id, int(self.job_ids.max()))
+
+    def sync(self, chunk_size=5000):
+        """DB에서 마지막으로 읽은 ID 이후에 저장된 공고를 읽어 덧붙이고 추가된 수를 반환합니다.
+
+        공고는 추가만 되므로(일괄 수집, 다른 워커의 업로드 포함) ID 비교만으로 증분 동기화합니다.
+        애플리케이션 컨텍스트 안에서 호출해야 합니다.
+        """
+        added = 0
+        with self._sync_lock:
+            while True:
+                rows = self._fetch_after(self.last_job_id, chunk_size)
+                if not rows:
+                    return added
+                self.add([(job_id, job_text(*fields)) for job_id, *fields in rows])
+                added += len(rows)
+
+    @staticmethod
+    def _fetch_after(last_job_id, chunk_size):
+        return db.session.execute(
+            db.select(
+                JobInformation.id,
+                JobInformation.job_title,
+                JobInformation.qualifications,
+                JobInformation.job_description,
+            )
+            .where(JobInformation.id > last_job_id)
+            .order_by(JobInformation.id)
+            .limit(chunk_size)
+        ).all()
+
+    def idf(self):
+        n_documents = len(self.job_ids)
+        return (
+            np.log((1 + n_documents) / (1 + self.document_frequency)) + 1
+        ).astype(np.float32)
+
+    def top_k(self, texts, k=10):
+        """텍스트(학생 프로필)마다 점수가 높은 공고 k개를 [(채용 정보 ID, 점수), ...]로 반환합니다.
+
+        모든 학생과 모든 공고의 점수를 (학생 수 × 공고 수) 희소 행렬 곱 한 번으로 계산합니다.
+        """
+        with self._lock:
+            matrix, job_ids, idf = self.matrix, self.job_ids, self.idf()
+        if not texts:
+            return []
+        if not len(job_ids):
+            return [[] for _ in texts]
+
+        queries = _rows(texts, self.n_features, weights=idf)
+        scores = (queries @ matrix.T).toarray()
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in zip(scores, top):
+            ranked = candidates[np.argsort(-row[candidates], kind="stable")]
+            results.append(
+                [(int(job_ids[i]), float(row[i])) for i in ranked if row[i] > 0]
+            )
+        return results
+
+
+def job_summaries(job_ids):
+    """채용 정보 ID 목록의 직무명과 회사 정보를 {ID: 딕셔너리}로 반환합니다. 삭제된 공고는 빠집니다."""
+    rows = db.session.execute(
+        db.select(
+            JobInformation.id,
+            JobInformation.job_title,
+            CompanyInformation.id,
+            CompanyInformation.company_name,
+            CompanyInformation.deadline,
+        )
+        .join(CompanyInformation, JobInformation.company_id == CompanyInformation.id)
+        .where(JobInformation.id.in_(job_ids))
+    )
+    return {
+        job_id: {
+            "jobInformationId": job_id,
+            "jobTitle": job_title,
+            "companyId": company_id,
+            "companyName": company_name,
+            "deadline": deadline,
+        }
+        for job_id, job_title, company_id, company_name, deadline in rows
+    }
+
+
+def student_texts(user_ids):
+    """사용자 ID 목록의 기술, 희망 직무, 경험 기술을 합친 프로필 텍스트를 {ID: 텍스트}로 반환합니다."""
+    parts = {user_id: [] for user_id in user_ids}
+    for user_id, skills in db.session.execute(
+        db.select(User.id, User.skills).where(User.id.in_(user_ids))
+    ):
+        parts[user_id].append(skills)
+    for user_id, desired_position in db.session.execute(
+        db.select(UserCompany.user_id, UserCompany.desired_position).where(
+            UserCompany.user_id.in_(user_ids)
+        )
+    ):
+        parts[user_id].append(desired_position)
+    for user_id, skills in db.session.execute(
+        db.select(Experience.user_id, Experience.skills).where(
+            Experience.user_id.in_(user_ids)
+        )
+    ):
+        parts[user_id].append(skills)
+    return {
+        user_id: " ".join(filter(None, texts)) for user_id, texts in parts.items()
+    }
+
+
+job_index = JobMatchingIndex()
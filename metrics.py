@@ -0,0 +1,197 @@
+"""파이프라인 단계별 소요 시간과 HTTP 요청/오류 수를 Prometheus 텍스트 형식으로 노출합니다.
+
+외부 라이브러리 없이 Counter/Histogram만 구현하며, GET /metrics에서 render()의 결과를
+반환합니다. 연결 풀이나 외부 API 클라이언트처럼 이미 지표를 모으는 객체는
+register_collector로 등록하면 조회 시점의 값이 함께 출력됩니다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 초 단위 히스토그램 구간 (PDF 파싱 수 ms ~ LLM 생성 수십 초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+TOKEN_BUCKETS = (16, 32, 64, 128, 192, 256, 384, 512, 768, 1024)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+                )
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    label_text = _format_labels(
+                        self.labelnames, labels, (("le", _format_number(bound)),)
+                    )
+                    lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+                label_text = _format_labels(self.labelnames, labels)
+                lines.append(f"{self.name}_sum{label_text} {_format_number(total)}")
+                lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+stage_duration = Histogram(
+    "dbase_pipeline_stage_duration_seconds",
+    "PDF 처리 파이프라인 단계별 소요 시간 (extract, parse, search, llm, commit)",
+    ("stage",),
+)
+stage_errors = Counter(
+    "dbase_pipeline_stage_errors_total",
+    "예외로 끝난 파이프라인 단계 수",
+    ("stage",),
+)
+http_requests = Counter(
+    "dbase_http_requests_total",
+    "처리한 HTTP 요청 수",
+    ("method", "endpoint", "status"),
+)
+http_errors = Counter(
+    "dbase_http_errors_total",
+    "오류(4xx/5xx)로 응답한 HTTP 요청 수",
+    ("status",),
+)
+http_duration = Histogram(
+    "dbase_http_request_duration_seconds",
+    "HTTP 요청 처리 시간 (스트리밍 응답은 응답 시작까지)",
+    ("method", "endpoint"),
+)
+
+pipeline_time = Histogram(
+    "dbase_pipeline_request_seconds",
+    "PDF 한 건 처리의 임계 경로 시간(critical_path)과 단계 시간의 단순 합(serial)",
+    ("kind",),
+)
+
+llm_tokens = Histogram(
+    "dbase_llm_tokens_per_call",
+    "AI 분석 한 건에서 생성한 토큰 수(generated)와 정리 후 남긴 토큰 수(kept)",
+    ("kind",),
+    buckets=TOKEN_BUCKETS,
+)
+llm_generation_stops = Counter(
+    "dbase_llm_generation_stops_total",
+    "AI 분석 생성 종료 사유 (eos, marker, repeat, sentences, budget)",
+    ("reason",),
+)
+
+_METRICS = [
+    stage_duration,
+    stage_errors,
+    http_requests,
+    http_errors,
+    http_duration,
+    pipeline_time,
+    llm_tokens,
+    llm_generation_stops,
+]
+_collectors = {}
+
+
+@contextmanager
+def stage_timer(stage):
+    """파이프라인 단계 하나의 소요 시간을 기록합니다. 예외가 나면 오류 수도 올립니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        stage_errors.inc(stage)
+        raise
+    finally:
+        stage_duration.observe(time.perf_counter() - started, stage)
+
+
+def register_collector(name, collect):
+    """조회 시점에 (이름, 종류, 설명, [(라벨 딕셔너리, 값), ...]) 목록을 반환하는 함수를 등록합니다.
+
+    같은 이름으로 다시 등록하면 이전 함수를 대체합니다 (create_app을 여러 번 호출하는 경우).
+    """
+    _collectors[name] = collect
+
+
+def render():
+    """등록된 모든 지표를 Prometheus 텍스트 형식으로 반환합니다."""
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    for collect in list(_collectors.values()):
+        try:
+            families = collect()
+        except Exception as e:
+            print(f"--- ERROR: 지표 수집 실패: {e}")
+            continue
+        for name, kind, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = _format_labels(labels.keys(), labels.values())
+                lines.append(f"{name}{label_text} {_format_number(value)}")
+    return "\n".join(lines) + "\n"
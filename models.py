@@ -1,8 +1,23 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DDL, event
 from sqlalchemy.ext.associationproxy import association_proxy
 
 db = SQLAlchemy()
 
+# 부분 문자열 검색(ILIKE '%키워드%')용 트라이그램 인덱스는 PostgreSQL에서만 만듭니다.
+event.listen(
+    db.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def trigram_index(name, column):
+    """PostgreSQL에서만 생성되는 column의 GIN 트라이그램 인덱스입니다."""
+    return db.Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+    ).ddl_if(dialect="postgresql")
+
 
 class User(db.Model):
     __tablename__ = "user"
@@ -60,10 +75,15 @@ class Experience(db.Model):
 
 class CompanyInformation(db.Model):
     __tablename__ = "company_information"
+    __table_args__ = (
+        trigram_index("ix_company_information_company_name_trgm", "company_name"),
+        trigram_index("ix_company_information_business_type_trgm", "business_type"),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    year = db.Column(db.Integer)
+    year = db.Column(db.Integer, index=True)
     company_name = db.Column(db.String(255), unique=True)
-    deadline = db.Column(db.String(255), nullable=True)
+    # YYYY-MM-DD 문자열이므로 문자열 비교가 날짜 비교와 같습니다.
+    deadline = db.Column(db.String(255), nullable=True, index=True)
     establishment_year = db.Column(db.Integer)
     business_type = db.Column(db.String(255))
     employee_count = db.Column(db.Integer)
@@ -71,6 +91,11 @@ class CompanyInformation(db.Model):
     website = db.Column(db.String(512), nullable=True)
     address = db.Column(db.Text)
     ai_analysis = db.Column(db.Text)
+    # AI 분석의 근거가 된 검색 요약의 지문과 마지막 재검색 시각 (refresh_analysis.py)
+    search_fingerprint = db.Column(db.String(64), nullable=True)
+    search_checked_at = db.Column(db.BigInteger, nullable=True, index=True)
+    # 대기 중 분석을 생성하는 프로세스가 회사를 가져간 시각 (app.py의 백필 lease)
+    analysis_claimed_at = db.Column(db.BigInteger, nullable=True)
 
     jobs = db.relationship(
         "JobInformation", backref="company", cascade="all, delete-orphan"
@@ -82,8 +107,14 @@ class CompanyInformation(db.Model):
 
 class JobInformation(db.Model):
     __tablename__ = "job_information"
+    __table_args__ = (
+        trigram_index("ix_job_information_job_title_trgm", "job_title"),
+        trigram_index("ix_job_information_qualifications_trgm", "qualifications"),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey("company_information.id"))
+    company_id = db.Column(
+        db.Integer, db.ForeignKey("company_information.id"), index=True
+    )
     job_title = db.Column(db.Text, nullable=True)
     recruitment_count = db.Column(db.Integer)
     job_description = db.Column(db.Text, nullable=True)
@@ -93,6 +124,9 @@ class JobInformation(db.Model):
     internship_pay = db.Column(db.String(100))
     salary = db.Column(db.String(100))
     additional_requirements = db.Column(db.Text)
+    # 원본 PDF의 SHA-256 해시와 요청의 Idempotency-Key (같은 문서/요청의 중복 처리 방지)
+    content_hash = db.Column(db.String(64), unique=True, nullable=True)
+    idempotency_key = db.Column(db.String(255), unique=True, nullable=True)
 
     applications = db.relationship(
         "ApplicationStatus", backref="job", cascade="all, delete-orphan"
@@ -112,3 +146,33 @@ class PresentCompany(db.Model):
     __tablename__ = "present_company"
     id = db.Column(db.Integer, primary_key=True)
     company_id = db.Column(db.Integer, db.ForeignKey("company_information.id"))
+
+
+class AnalysisCacheEntry(db.Model):
+    __tablename__ = "analysis_cache"
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, nullable=False)
+    company_name = db.Column(db.String(255), nullable=False, index=True)
+    ai_analysis = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.BigInteger, nullable=False)
+    last_accessed_at = db.Column(db.BigInteger, nullable=False, index=True)
+
+
+class PipelineJob(db.Model):
+    """비동기 PDF 처리 작업(jobs.py)입니다. 여러 워커 프로세스가 같은 작업을 조회하고 처리합니다."""
+
+    __tablename__ = "pipeline_job"
+    # 등록 순서 (큐 순서와 대기 순번 계산에 사용)
+    seq = db.Column(db.Integer, primary_key=True)
+    id = db.Column(db.String(32), unique=True, nullable=False)
+    status = db.Column(db.String(20), nullable=False, index=True)
+    payload = db.Column(db.JSON, nullable=False)
+    stages = db.Column(db.JSON, nullable=False)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.JSON, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.String(19), nullable=False)
+    started_at = db.Column(db.String(19), nullable=True)
+    finished_at = db.Column(db.String(19), nullable=True)
+    # 처리 중인 워커가 주기적으로 갱신하는 시각(초). 오래 갱신되지 않으면 워커가 죽은 것으로 봅니다.
+    heartbeat_at = db.Column(db.BigInteger, nullable=True)
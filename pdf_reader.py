@@ -0,0 +1,104 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pymupdf as fitz
+
+from extractor import is_form_complete
+
+# 남은 페이지가 PDF_PARALLEL_MIN_PAGES 이상이면 PDF_WORKERS개 프로세스로 나누어 추출합니다.
+# PDF_WORKERS=0이면 병렬 추출을 사용하지 않습니다.
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+# 양식은 보통 앞 1~2페이지에 있으므로 처음 몇 페이지는 병렬화하지 않고 순서대로 읽습니다.
+SEQUENTIAL_HEAD_PAGES = 3
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """workers개 프로세스의 풀을 반환합니다. 호출자마다 요청한 크기가 다를 수 있으므로 크기별로 만듭니다."""
+    with _pools_lock:
+        if workers not in _pools:
+            # PyMuPDF는 스레드 안전하지 않으므로 프로세스 단위로 병렬화합니다.
+            _pools[workers] = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pools[workers]
+
+
+def file_sha256(path):
+    """파일 내용의 SHA-256 해시를 반환합니다."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_pages(path, start=0, stop=None):
+    """PDF 페이지 텍스트를 한 페이지씩 지연 생성합니다.
+
+    생성기가 끝나거나 close()되면 문서도 닫히므로, 중간에 멈출 때는
+    contextlib.closing으로 감싸 사용합니다.
+    """
+    with fitz.open(path) as doc:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for number in range(start, stop):
+            yield doc.load_page(number).get_text()
+
+
+def _extract_range(path, start, stop):
+    """(프로세스 풀) start부터 stop 직전 페이지까지의 텍스트를 추출합니다."""
+    return "".join(iter_pages(path, start, stop))
+
+
+def _extract_parallel(path, start, stop, workers):
+    chunk = -(-(stop - start) // workers)
+    ranges = [(s, min(s + chunk, stop)) for s in range(start, stop, chunk)]
+    pool = _get_pool(workers)
+    futures = [pool.submit(_extract_range, path, s, e) for s, e in ranges]
+    return "".join(future.result() for future in futures)
+
+
+def extract_text(path, workers=None):
+    """PDF 파일 경로를 받아 텍스트를 추출합니다."""
+    workers = PDF_WORKERS if workers is None else workers
+    with fitz.open(path) as doc:
+        page_count = doc.page_count
+        if not workers or page_count < PDF_PARALLEL_MIN_PAGES:
+            return "".join(page.get_text() for page in doc)
+    return _extract_parallel(path, 0, page_count, workers)
+
+
+def extract_text_until(path, is_complete, workers=None):
+    """is_complete(지금까지의 텍스트)가 참이 될 때까지만 페이지를 순서대로 읽습니다.
+
+    끝까지 읽어야 하는데 남은 페이지가 많으면 나머지는 병렬로 추출합니다.
+    """
+    workers = PDF_WORKERS if workers is None else workers
+    text = ""
+    with fitz.open(path) as doc:
+        page_count = doc.page_count
+        for number in range(page_count):
+            text += doc.load_page(number).get_text()
+            if is_complete(text):
+                return text
+            remaining = page_count - number - 1
+            if (
+                workers
+                and number + 1 >= SEQUENTIAL_HEAD_PAGES
+                and remaining >= PDF_PARALLEL_MIN_PAGES
+            ):
+                break
+        else:
+            return text
+    return text + _extract_parallel(path, number + 1, page_count, workers)
+
+
+def extract_form_text(path, workers=None):
+    """채용 의뢰서 양식의 모든 항목이 나올 때까지만 읽고, 뒤에 붙은 소개서 페이지는 건너뜁니다."""
+    return extract_text_until(path, is_form_complete, workers)
@@ -0,0 +1,197 @@
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from extractor import parse_deadline, parse_establishment_year
+from models import db, CompanyInformation, JobInformation
+
+# ON CONFLICT (company_name) 시 덮어쓸 회사 정보 컬럼
+COMPANY_UPDATE_COLUMNS = (
+    "year",
+    "deadline",
+    "establishment_year",
+    "business_type",
+    "employee_count",
+    "main_business",
+    "website",
+    "address",
+    "ai_analysis",
+    "search_fingerprint",
+)
+
+_INSERT_BY_DIALECT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _to_int(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_company_fields(info):
+    """요청일과 설립일자 문자열을 DB에 저장할 마감일(YYYY-MM-DD)과 설립 연도로 변환합니다."""
+    deadline = parse_deadline(info.get("application_deadline"))
+    return {
+        "deadline": deadline.isoformat() if deadline else None,
+        "establishment_year": parse_establishment_year(info.get("established")),
+    }
+
+
+def company_row(info, ai_analysis, year, normalized=None, search_fingerprint=None):
+    """추출 정보를 company_information 행 딕셔너리로 변환합니다.
+
+    normalized에 normalize_company_fields의 결과를 주면 날짜를 다시 변환하지 않습니다.
+    search_fingerprint는 ai_analysis의 근거가 된 검색 요약의 지문이며, 근거를 모르면 None입니다.
+    """
+    normalized = normalized or normalize_company_fields(info)
+    return {
+        "company_name": info["company_name"],
+        "year": year,
+        "deadline": normalized["deadline"],
+        "establishment_year": normalized["establishment_year"],
+        "business_type": info.get("business_type"),
+        "employee_count": info.get("num_employees"),
+        "main_business": info.get("main_business"),
+        "website": info.get("website"),
+        "address": info.get("location"),
+        "ai_analysis": ai_analysis,
+        "search_fingerprint": search_fingerprint,
+    }
+
+
+def job_row(info, company_id, content_hash=None, idempotency_key=None):
+    """추출 정보를 job_information 행 딕셔너리로 변환합니다."""
+    return {
+        "company_id": company_id,
+        "job_title": info.get("job_category"),
+        "recruitment_count": _to_int(info.get("positions")),
+        "job_description": info.get("job_description"),
+        "qualifications": info.get("qualifications"),
+        "working_hours": info.get("work_hours"),
+        "work_type": info.get("employment_type"),
+        "internship_pay": info.get("intern_stipend"),
+        "salary": info.get("salary"),
+        "additional_requirements": info.get("other_requirements"),
+        "content_hash": content_hash,
+        "idempotency_key": idempotency_key,
+    }
+
+
+def bulk_upsert(records):
+    """(info, ai_analysis) 목록을 한 트랜잭션으로 저장하고 (회사 ID, 채용 정보 ID) 목록을 반환합니다.
+
+    레코드에 세 번째 값으로 {"content_hash": ..., "idempotency_key": ...} 딕셔너리를 주면
+    채용 정보 행에 함께 저장합니다. 이미 저장된 해시/키와 겹치면 IntegrityError가 발생합니다.
+    같은 딕셔너리의 "company_fields"에 normalize_company_fields의 결과를 주면 그 값을 쓰고,
+    "search_fingerprint"에 AI 분석의 근거가 된 검색 요약 지문을 주면 분석과 함께 저장합니다.
+    지문을 주지 않으면 근거를 알 수 없으므로 기존 지문을 지웁니다(NULL).
+
+    회사는 INSERT ... ON CONFLICT (company_name) DO UPDATE 한 문장으로 upsert하고,
+    채용 정보는 RETURNING을 포함한 executemany 한 번으로 추가합니다. 같은 배치에
+    같은 회사가 여러 번 있으면 마지막 레코드의 회사 정보가 저장됩니다.
+    PostgreSQL과 SQLite를 지원합니다.
+    """
+    if not records:
+        return []
+
+    dialect = db.session.get_bind().dialect.name
+    insert = _INSERT_BY_DIALECT.get(dialect)
+    if insert is None:
+        raise NotImplementedError(f"bulk_upsert는 {dialect} 데이터베이스를 지원하지 않습니다.")
+
+    year = datetime.now().year
+    companies = {}
+    for info, ai_analysis, *options in records:
+        options = options[0] if options else {}
+        companies[info["company_name"]] = company_row(
+            info,
+            ai_analysis,
+            year,
+            options.get("company_fields"),
+            options.get("search_fingerprint"),
+        )
+
+    stmt = insert(CompanyInformation).values(list(companies.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CompanyInformation.company_name],
+        set_={column: stmt.excluded[column] for column in COMPANY_UPDATE_COLUMNS},
+    ).returning(CompanyInformation.id, CompanyInformation.company_name)
+    company_ids = {name: company_id for company_id, name in db.session.execute(stmt)}
+
+    job_rows = [
+        job_row(
+            info,
+            company_ids[info["company_name"]],
+            options[0].get("content_hash") if options else None,
+            options[0].get("idempotency_key") if options else None,
+        )
+        for info, _, *options in records
+    ]
+    job_ids = db.session.scalars(
+        insert(JobInformation).returning(JobInformation.id, sort_by_parameter_order=True),
+        job_rows,
+    ).all()
+
+    db.session.commit()
+    return [
+        (company_ids[info["company_name"]], job_id)
+        for (info, *_), job_id in zip(records, job_ids)
+    ]
+
+
+class IdempotencyKeyConflict(Exception):
+    """같은 Idempotency-Key로 이미 다른 내용의 문서가 저장된 경우입니다."""
+
+
+def find_processed_job(content_hash=None, idempotency_key=None):
+    """같은 내용 해시나 Idempotency-Key로 이미 저장된 채용 정보의 (회사 ID, 채용 정보 ID)를 찾습니다.
+
+    Idempotency-Key로 저장된 문서의 내용 해시가 content_hash와 다르면 IdempotencyKeyConflict를 발생시킵니다.
+    """
+    if idempotency_key:
+        row = db.session.execute(
+            db.select(JobInformation.company_id, JobInformation.id, JobInformation.content_hash)
+            .where(JobInformation.idempotency_key == idempotency_key)
+            .order_by(JobInformation.id)
+            .limit(1)
+        ).first()
+        if row:
+            if content_hash and row.content_hash and row.content_hash != content_hash:
+                raise IdempotencyKeyConflict(idempotency_key)
+            return row.company_id, row.id
+    if not content_hash:
+        return None
+    row = db.session.execute(
+        db.select(JobInformation.company_id, JobInformation.id)
+        .where(JobInformation.content_hash == content_hash)
+        .order_by(JobInformation.id)
+        .limit(1)
+    ).first()
+    return tuple(row) if row else None
+
+
+def find_company(company_name):
+    """회사명으로 저장된 회사의 (ID, AI 분석, 검색 요약 지문)을 찾습니다. 없으면 None입니다."""
+    return db.session.execute(
+        db.select(
+            CompanyInformation.id,
+            CompanyInformation.ai_analysis,
+            CompanyInformation.search_fingerprint,
+        ).where(CompanyInformation.company_name == company_name)
+    ).first()
+
+
+def existing_content_hashes(hashes, chunk_size=500):
+    """주어진 해시 중 이미 job_information에 저장된 해시의 집합을 반환합니다."""
+    hashes = list(hashes)
+    found = set()
+    for i in range(0, len(hashes), chunk_size):
+        found.update(
+            db.session.scalars(
+                db.select(JobInformation.content_hash).where(
+                    JobInformation.content_hash.in_(hashes[i : i + chunk_size])
+                )
+            )
+        )
+    return found
@@ -0,0 +1,177 @@
+"""고정된 분석 지시문(프롬프트 앞부분)의 KV 캐시를 한 번만 계산해 두고 요청마다 재사용합니다.
+
+기업 분석 프롬프트는 항상 같은 지시문으로 시작하므로, 서버 시작 시 그 부분만 모델에 통과시켜
+past_key_values를 만들어 둡니다. 요청이 오면 캐시의 사본과 함께 generate를 호출하여 회사명과
+검색 요약(뒷부분)만 새로 prefill합니다. 배치에서는 [공통 접두어][패딩][뒷부분] 형태로 입력을
+만들어 모든 행이 같은 접두어 캐시를 공유하고, 패딩은 attention mask로 가립니다.
+
+접두어 prefill 시간은 시작 시 한 행과 최대 배치 크기(max_batch_size행)로 측정합니다. N행 배치의
+prefill은 한 행의 N배보다 짧으므로, generate 호출마다 두 측정값 사이를 선형으로 보간한 그 배치
+크기의 prefill 시간을 절약 시간으로 더합니다(요청 처리 중에는 측정하지 않습니다).
+torch 모델에서만 동작하고, ONNX 백엔드나 LLM_PREFIX_CACHE=false이면 기존 파이프라인을 씁니다.
+접두어와 뒷부분을 따로 토큰화한 결과가 전체 프롬프트의 토큰화와 다르면(ByteLevel BPE 토크나이저가
+경계의 공백/줄바꿈을 다음 토큰과 합치는 경우 등) 캐시 경로의 출력이 달라지므로, 그런 프롬프트는
+기존 파이프라인으로 생성합니다.
+"""
+import copy
+import os
+import threading
+import time
+
+LLM_PREFIX_CACHE = os.getenv("LLM_PREFIX_CACHE", "true").lower() in ("1", "true", "yes")
+# 접두어 prefill 시간은 여러 번 측정하여 가장 짧은 값을 사용합니다 (첫 실행의 초기화 비용 제외).
+PREFILL_TIMING_RUNS = 3
+
+
+class PrefixCachedGenerator:
+    """고정 접두어의 KV 캐시를 재사용하여 접두어로 시작하는 프롬프트들을 생성합니다."""
+
+    def __init__(self, model, tokenizer, prefix, generate_kwargs, max_batch_size=1):
+        import torch
+
+        self._torch = torch
+        self.model = model
+        self.tokenizer = tokenizer
+        self.prefix = prefix
+        self.generate_kwargs = dict(generate_kwargs)
+        self.pad_token_id = (
+            tokenizer.pad_token_id
+            if tokenizer.pad_token_id is not None
+            else tokenizer.eos_token_id
+        )
+        self.prefix_ids = tokenizer(prefix, return_tensors="pt").input_ids.to(model.device)
+        self._prefix_id_list = self.prefix_ids[0].tolist()
+        self.prefix_cache, self.prefill_seconds = self._prefill(self.prefix_ids)
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.prefill_seconds_by_size = {1: self.prefill_seconds}
+        if self.max_batch_size > 1:
+            # 첫 측정으로 모델이 준비되었으므로 최대 배치 크기는 한 번만 측정합니다.
+            _, self.prefill_seconds_by_size[self.max_batch_size] = self._prefill(
+                self.prefix_ids.expand(self.max_batch_size, -1), runs=1
+            )
+        self.calls = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _prefill(self, input_ids, runs=PREFILL_TIMING_RUNS):
+        from transformers import DynamicCache
+
+        best = None
+        with self._torch.inference_mode():
+            for _ in range(runs):
+                cache = DynamicCache()
+                started = time.perf_counter()
+                self.model(input_ids, past_key_values=cache, use_cache=True)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+        return cache, best
+
+    def _batch_prefill_seconds(self, batch_size):
+        """batch_size행 접두어 prefill 시간의 추정값입니다. 시작 시 측정한 1행과 최대 배치 크기 사이를 선형 보간합니다."""
+        if self.max_batch_size == 1:
+            return self.prefill_seconds * batch_size
+        largest = self.prefill_seconds_by_size[self.max_batch_size]
+        per_row = (largest - self.prefill_seconds) / (self.max_batch_size - 1)
+        return max(0.0, self.prefill_seconds + per_row * (batch_size - 1))
+
+    @property
+    def prefix_tokens(self):
+        return self.prefix_ids.shape[1]
+
+    def matches(self, prompt):
+        """접두어로 시작하고, 접두어 + 뒷부분 토큰이 전체 프롬프트의 토큰과 같은 프롬프트인지 확인합니다."""
+        if not prompt.startswith(self.prefix):
+            return False
+        suffix_ids = self.tokenizer(prompt[len(self.prefix):], add_special_tokens=False).input_ids
+        return self.tokenizer(prompt).input_ids == self._prefix_id_list + suffix_ids
+
+    def _build_inputs(self, prompts):
+        torch = self._torch
+        suffixes = [
+            self.tokenizer(prompt[len(self.prefix):], add_special_tokens=False).input_ids
+            for prompt in prompts
+        ]
+        width = max(len(ids) for ids in suffixes)
+        if width == 0:
+            raise ValueError("접두어 뒤에 생성할 내용이 없는 프롬프트입니다.")
+        prefix_length = self.prefix_tokens
+        input_ids = torch.full(
+            (len(prompts), prefix_length + width),
+            self.pad_token_id,
+            dtype=self.prefix_ids.dtype,
+        )
+        attention_mask = torch.zeros_like(input_ids)
+        input_ids[:, :prefix_length] = self.prefix_ids[0].cpu()
+        attention_mask[:, :prefix_length] = 1
+        for row, ids in enumerate(suffixes):
+            # 뒷부분을 오른쪽에 붙이고 접두어와의 사이를 패딩합니다. position_ids는 attention mask로
+            # 계산되므로 패딩이 있어도 뒷부분 토큰의 위치는 접두어 바로 다음부터 이어집니다.
+            input_ids[row, input_ids.shape[1] - len(ids):] = torch.tensor(ids)
+            attention_mask[row, input_ids.shape[1] - len(ids):] = 1
+        device = self.prefix_ids.device
+        return input_ids.to(device), attention_mask.to(device)
+
+    def generate(self, prompts, **kwargs):
+        """접두어로 시작하는 프롬프트들을 한 배치로 생성하고 생성된 텍스트 목록을 반환합니다."""
+        input_ids, attention_mask = self._build_inputs(prompts)
+        cache = copy.deepcopy(self.prefix_cache)
+        if len(prompts) > 1:
+            cache.batch_repeat_interleave(len(prompts))
+        with self._torch.inference_mode():
+            output = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                past_key_values=cache,
+                pad_token_id=self.pad_token_id,
+                **{**self.generate_kwargs, **kwargs},
+            )
+        saved = self._batch_prefill_seconds(len(prompts))
+        with self._lock:
+            self.calls += len(prompts)
+            self.saved_seconds += saved
+        return self.tokenizer.batch_decode(
+            output[:, input_ids.shape[1]:], skip_special_tokens=True
+        )
+
+    def status(self):
+        return {
+            "enabled": True,
+            "prefixTokens": self.prefix_tokens,
+            "prefillSecondsSavedPerCall": self.prefill_seconds,
+            "prefillSecondsByBatchSize": dict(sorted(self.prefill_seconds_by_size.items())),
+            "calls": self.calls,
+            "prefillSecondsSavedTotal": self.saved_seconds,
+        }
+
+
+def create_prefix_generator(llm_pipeline, prefix, generate_kwargs, sample_prompt=None,
+                            max_batch_size=1):
+    """text-generation 파이프라인의 모델로 접두어 캐시 생성기를 만듭니다.
+
+    LLM_PREFIX_CACHE=false이거나 torch 모델이 아니면(ONNX 등) None을 반환합니다.
+    sample_prompt(실제 프롬프트 형식의 예)가 접두어 경계에서 다르게 토큰화되면 이 토크나이저로는
+    대부분의 프롬프트가 캐시를 쓰지 못하므로 None을 반환합니다. max_batch_size는 절약 시간
+    추정을 위해 시작 시 prefill을 측정할 최대 배치 크기입니다.
+    """
+    if not LLM_PREFIX_CACHE:
+        return None
+    import torch
+
+    model = llm_pipeline.model
+    if not isinstance(model, torch.nn.Module):
+        print("--- INFO: torch 모델이 아니므로 프롬프트 접두어 캐시를 사용하지 않습니다.")
+        return None
+    generator = PrefixCachedGenerator(
+        model, llm_pipeline.tokenizer, prefix, generate_kwargs, max_batch_size
+    )
+    if sample_prompt is not None and not generator.matches(sample_prompt):
+        print(
+            "--- INFO: 이 토크나이저는 접두어 경계를 다르게 토큰화하므로 "
+            "프롬프트 접두어 캐시를 사용하지 않습니다."
+        )
+        return None
+    print(
+        f"--- INFO: 프롬프트 접두어 캐시 준비 ({generator.prefix_tokens}토큰, "
+        f"호출당 prefill {generator.prefill_seconds * 1000:.1f}ms 절약)."
+    )
+    return generator
@@ -0,0 +1,63 @@
+"""모든 직무 × 학습 기간 조합의 로드맵을 미리 생성하여 캐시 디렉터리에 저장하는 명령입니다.
+
+이미 저장되어 있고 만료되지 않은 로드맵은 건너뛰며, --force를 주면 모두 다시 생성합니다.
+
+실행: python prewarm_roadmaps.py [--durations 1,3,6] [--workers 4] [--force]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import roadmap
+
+
+def prewarm(job_roles, durations, workers, force_refresh=False):
+    """(직무, 기간) 조합을 동시에 생성하고 결과 건수를 반환합니다."""
+    counts = {"cached": 0, "generated": 0, "failed": 0}
+
+    def warm(combo):
+        job_role, duration = combo
+        started = time.perf_counter()
+        try:
+            _, filename, _, cached = roadmap.get_roadmap(job_role, duration, force_refresh)
+        except Exception as e:
+            print(f"--- ERROR: {duration}-{job_role} 생성 실패: {e}")
+            return "failed"
+        state = "cached" if cached else "generated"
+        print(f"--- INFO: {filename} {state} ({time.perf_counter() - started:.1f}초)")
+        return state
+
+    combos = [(job_role, duration) for job_role in job_roles for duration in durations]
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        for state in pool.map(warm, combos):
+            counts[state] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="모든 직무와 학습 기간 조합의 로드맵을 미리 생성합니다."
+    )
+    parser.add_argument(
+        "--durations",
+        default=",".join(str(d) for d in roadmap.ROADMAP_DURATIONS),
+        help="생성할 학습 기간(개월), 쉼표로 구분",
+    )
+    parser.add_argument("--workers", type=int, default=4,
+                        help="동시에 보낼 Gemini 요청 수")
+    parser.add_argument("--force", action="store_true",
+                        help="저장된 로드맵이 있어도 다시 생성")
+    args = parser.parse_args()
+
+    durations = [int(d) for d in args.durations.split(",") if d.strip()]
+    started = time.perf_counter()
+    counts = prewarm(roadmap.ROADMAP_LINKS, durations, args.workers, args.force)
+    print("=== 로드맵 미리 생성 결과 ===")
+    print(f"캐시 사용: {counts['cached']}")
+    print(f"새로 생성: {counts['generated']}")
+    print(f"실패: {counts['failed']}")
+    print(f"소요 시간: {time.perf_counter() - started:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
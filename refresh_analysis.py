@@ -0,0 +1,198 @@
+"""기존 회사를 다시 검색하여, 검색 근거가 바뀐 회사만 AI 분석을 다시 생성하는 명령입니다.
+
+회사마다 AI 분석의 근거가 된 검색 요약의 지문(search_fingerprint)을 분석과 함께 저장해 두고,
+새 검색 요약의 지문이 다를 때만 LLM을 호출합니다. 지문이 없는 회사(근거를 알 수 없는 분석)와
+AI 분석이 '대기 중'이거나 건너뛴 회사는 항상 다시 생성합니다. Serper 할당량을 넘지 않도록
+검색은 --rate(초당 요청 수)로 제한하며, 한 번에 --limit개 회사를 오래 확인하지 않은 순서로
+처리합니다. cron 등으로 주기적으로 실행합니다.
+
+실행: python refresh_analysis.py [--limit 200] [--rate 1] [--min-age-days 7] [--workers 8] [--force]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from sqlalchemy import or_, select, update
+
+from models import db, CompanyInformation
+
+
+class RateLimiter:
+    """호출 간격이 1/rate초 이상이 되도록 기다립니다. rate가 0 이하이면 제한하지 않습니다."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next = 0.0
+
+    def wait(self):
+        now = time.monotonic()
+        if self._next > now:
+            time.sleep(self._next - now)
+        self._next = max(now, self._next) + self.interval
+
+
+def select_companies(limit, min_age_seconds):
+    """마지막 재검색 후 min_age_seconds가 지난 회사를 오래된 순서(미확인 우선)로 limit개 고릅니다."""
+    cutoff = int(time.time()) - min_age_seconds
+    return db.session.execute(
+        select(
+            CompanyInformation.id,
+            CompanyInformation.company_name,
+            CompanyInformation.ai_analysis,
+            CompanyInformation.search_fingerprint,
+        )
+        .where(CompanyInformation.company_name.is_not(None))
+        .where(
+            or_(
+                CompanyInformation.search_checked_at.is_(None),
+                CompanyInformation.search_checked_at < cutoff,
+            )
+        )
+        .order_by(
+            CompanyInformation.search_checked_at.asc().nulls_first(),
+            CompanyInformation.id,
+        )
+        .limit(limit)
+    ).all()
+
+
+def _needs_analysis(app_module, ai_analysis):
+    return not app_module.has_analysis(ai_analysis)
+
+
+def regenerate(flask_app, company_id, company_name, search_summary, fingerprint):
+    """(스레드 풀) 새 검색 요약으로 AI 분석을 다시 생성하여 저장합니다. 생성하지 못하면 False입니다."""
+    import app as app_module
+
+    with flask_app.app_context():
+        ai_analysis, status = app_module.analyze_company(company_name, search_summary)
+        if status not in ("done", "cached"):
+            return False
+        db.session.execute(
+            update(CompanyInformation)
+            .where(CompanyInformation.id == company_id)
+            .values(
+                ai_analysis=ai_analysis,
+                search_fingerprint=fingerprint,
+                search_checked_at=int(time.time()),
+            )
+        )
+        db.session.commit()
+        return True
+
+
+def refresh(flask_app, limit, rate, min_age_seconds, workers, force=False):
+    """회사를 다시 검색하고 근거가 바뀐 회사의 AI 분석을 다시 생성한 뒤 결과 건수를 반환합니다."""
+    import app as app_module
+
+    counts = {
+        "checked": 0,
+        "unchanged": 0,
+        "regenerated": 0,
+        "noResults": 0,
+        "failed": 0,
+    }
+    with flask_app.app_context():
+        companies = select_companies(limit, min_age_seconds)
+    print(f"--- INFO: 회사 {len(companies)}곳을 다시 검색합니다.")
+
+    limiter = RateLimiter(rate)
+    checked_rows = []
+    futures = []
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        for company_id, company_name, ai_analysis, previous in companies:
+            limiter.wait()
+            counts["checked"] += 1
+            try:
+                results = app_module.fetch_search_results(company_name)
+            except requests.exceptions.RequestException as e:
+                counts["failed"] += 1
+                print(f"--- ERROR: '{company_name}' 검색 실패: {e}")
+                continue
+            if not results:
+                # 결과가 비어도 기존 분석을 근거 없는 분석으로 바꾸지 않고, 확인 시각만 기록하여
+                # 다음 실행에서 다른 회사가 먼저 검색되게 합니다.
+                counts["noResults"] += 1
+                checked_rows.append({"id": company_id, "search_checked_at": int(time.time())})
+                continue
+
+            search_summary = app_module.summarize_search_results(results)
+            fingerprint = app_module.search_fingerprint(search_summary)
+            # 지문이 없으면 분석의 근거를 알 수 없으므로, 이번 검색 결과를 근거로 다시 생성합니다.
+            changed = previous != fingerprint
+            if force or changed or _needs_analysis(app_module, ai_analysis):
+                futures.append(
+                    (
+                        company_name,
+                        pool.submit(
+                            regenerate,
+                            flask_app,
+                            company_id,
+                            company_name,
+                            search_summary,
+                            fingerprint,
+                        ),
+                    )
+                )
+                continue
+            counts["unchanged"] += 1
+            checked_rows.append({"id": company_id, "search_checked_at": int(time.time())})
+
+        for company_name, future in futures:
+            try:
+                regenerated = future.result()
+            except Exception as e:
+                regenerated = False
+                print(f"--- ERROR: '{company_name}' AI 분석 재생성 실패: {e}")
+            counts["regenerated" if regenerated else "failed"] += 1
+
+    if checked_rows:
+        with flask_app.app_context():
+            db.session.execute(update(CompanyInformation), checked_rows)
+            db.session.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="검색 근거가 바뀐 회사의 AI 분석만 다시 생성합니다."
+    )
+    parser.add_argument("--limit", type=int, default=200,
+                        help="한 번에 다시 검색할 최대 회사 수")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="초당 Serper 검색 수 (0이면 제한 없음)")
+    parser.add_argument("--min-age-days", type=float, default=7,
+                        help="마지막 재검색 후 이 기간이 지난 회사만 검색")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="AI 분석을 동시에 생성할 스레드 수")
+    parser.add_argument("--force", action="store_true",
+                        help="검색 근거가 같아도 AI 분석을 다시 생성")
+    args = parser.parse_args()
+
+    import app as app_module
+
+    flask_app = app_module.create_app()
+    print("--- INFO: LLM 모델 로딩을 기다립니다...")
+    app_module.llm_loader.wait()
+
+    started = time.perf_counter()
+    counts = refresh(
+        flask_app,
+        limit=args.limit,
+        rate=args.rate,
+        min_age_seconds=int(args.min_age_days * 24 * 3600),
+        workers=args.workers,
+        force=args.force,
+    )
+    print("=== AI 분석 갱신 결과 ===")
+    print(f"다시 검색한 회사: {counts['checked']}")
+    print(f"근거 변화 없음: {counts['unchanged']}")
+    print(f"AI 분석 재생성: {counts['regenerated']}")
+    print(f"검색 결과 없음: {counts['noResults']}")
+    print(f"실패: {counts['failed']}")
+    print(f"소요 시간: {time.perf_counter() - started:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
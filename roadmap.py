@@ -1,10 +1,16 @@
 import os
-from flask import Flask, request, jsonify
+import threading
+import time
+from flask import Flask, Response, request, jsonify, stream_with_context
 import requests
-import json
 from dotenv import load_dotenv
 from flask_cors import CORS 
 
+from admin_auth import admin_auth_error
+from cache import TTLCache
+from gemini_client import GeminiClient, GeminiError
+from sse import SSE_HEADERS, sse_event
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
@@ -15,11 +21,24 @@ CORS(app)
 SCRIPT_PATH = os.path.abspath(__file__)
 AI_DIR = os.path.dirname(SCRIPT_PATH)
 DBASE_ROOT_DIR = os.path.dirname(AI_DIR)
-UPLOAD_BASE_DIR = os.path.join(DBASE_ROOT_DIR, 'DBase-backend', 'roadmap_file')
+UPLOAD_BASE_DIR = os.getenv("ROADMAP_DIR") or os.path.join(DBASE_ROOT_DIR, 'DBase-backend', 'roadmap_file')
+
+# 로드맵 캐시: 저장된 파일이 이 시간(초)보다 오래되면 다시 생성합니다. 0이면 만료되지 않습니다.
+ROADMAP_CACHE_TTL_SECONDS = int(os.getenv("ROADMAP_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+# prewarm_roadmaps.py가 미리 생성할 학습 기간(개월)
+ROADMAP_DURATIONS = tuple(
+    int(d) for d in os.getenv("ROADMAP_DURATIONS", "1,3,6").split(",") if d.strip()
+)
+
+# 디스크에서 읽은 로드맵을 (내용, 파일 수정 시각)으로 보관합니다. 조회할 때마다 파일의 수정 시각과
+# 비교하므로, 다른 워커나 prewarm_roadmaps.py --force가 파일을 바꾸면 다시 읽습니다.
+# 만료(ROADMAP_CACHE_TTL_SECONDS)도 파일 수정 시각으로 판단합니다.
+roadmap_memory_cache = TTLCache(maxsize=256, ttl=0)
+_generation_locks = {}
+_generation_locks_guard = threading.Lock()
 
-# Gemini API 설정
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+# Gemini API 클라이언트 (설정은 gemini_client.py의 GEMINI_* 환경 변수)
+gemini = GeminiClient()
 
 # 각 직무에 해당하는 roadmap.sh 링크 매핑
 ROADMAP_LINKS = {
@@ -45,30 +64,8 @@ def job_role_to_korean(job_role):
     }
     return mapping.get(job_role, job_role)
 
-@app.route('/generate_roadmap', methods=['POST'])
-def generate_roadmap():
-    """
-    POST 요청을 받아 AI 특성화고 학생을 위한 로드맵을 생성합니다.
-    요청 본문에는 'job_role' (희망 직무)과 'duration' (학습 기간: 1, 3, 6개월)이 포함되어야 합니다.
-    """
-    job_role = request.json.get('job_role')
-    duration = request.json.get('duration')
-
-    # 필수 입력값 검증
-    if not job_role or not duration:
-        return jsonify({"error": "job_role과 duration은 필수 입력값입니다."}), 400
-
-    # 유효한 직무 역할인지 검증
-    if job_role not in ROADMAP_LINKS:
-        return jsonify({"error": "유효하지 않은 job_role입니다. 유효한 값: ai-engineer, app-android, app-ios, cyber-security, server-engineer, web-back, web-front"}), 400
-
-    try:
-        # duration은 정수형이어야 합니다.
-        int(duration)
-    except ValueError:
-        return jsonify({"error": "duration은 숫자여야 합니다 (예: 1, 3, 6)."}), 400
-
-    # Gemini API 프롬프트
+def build_roadmap_payload(job_role, duration):
+    """Gemini API에 보낼 로드맵 생성 요청 본문을 만듭니다."""
     prompt = f"""
     서울디지텍고등학교 학생을 위한 {job_role_to_korean(job_role)} {duration}개월 로드맵을 생성해줘.
     하나의 프로젝트를 주제로 삼고, 각 주차/개월별로 학습할 내용과 진행할 프로젝트 단계를 상세하게 작성해줘.
@@ -98,10 +95,7 @@ def generate_roadmap():
     예시 파일의 구조와 같이 Markdown 형식으로 제공하고, 마지막에는 {ROADMAP_LINKS[job_role]} 링크를 포함해줘.
     """
 
-    headers = {
-        'Content-Type': 'application/json',
-    }
-    payload = {
+    return {
         "contents": [
             {
                 "role": "user",
@@ -115,42 +109,215 @@ def generate_roadmap():
         }
     }
 
+
+def roadmap_filename(job_role, duration):
+    return f"{duration}-{job_role}.md"
+
+
+def load_cached_roadmap(job_role, duration):
+    """메모리 또는 디스크에 저장된 로드맵을 (내용, 파일 이름, 저장 경로)로 반환합니다.
+
+    없거나 ROADMAP_CACHE_TTL_SECONDS보다 오래되었으면 None을 반환합니다.
+    """
+    filename = roadmap_filename(job_role, duration)
+    save_path = os.path.join(UPLOAD_BASE_DIR, filename)
     try:
-        # Gemini API 호출
-        response = requests.post(f"{GEMINI_API_URL}?key={GEMINI_API_KEY}", headers=headers, data=json.dumps(payload))
-        response.raise_for_status() 
-        gemini_response = response.json()
-
-        # Gemini API 응답에서 생성된 텍스트를 추출
-        if gemini_response and gemini_response.get('candidates'):
-            generated_text = gemini_response['candidates'][0]['content']['parts'][0]['text']
-
-            # Gemini가 로드맵 링크를 포함하지 않았을 경우 수동으로 추가
-            if ROADMAP_LINKS[job_role] not in generated_text:
-                generated_text += f"\n\n{ROADMAP_LINKS[job_role]}"
-
-            # 생성된 로드맵 파일의 이름과 저장 경로를 정의
-            filename = f"{duration}-{job_role}.md"
-            save_path = os.path.join(UPLOAD_BASE_DIR, filename)
-
-            # 생성된 로드맵 내용을 Markdown 파일로 저장
-            with open(save_path, 'w', encoding='utf-8') as f:
-                f.write(generated_text)
-
-            # 성공 응답 반환
-            return jsonify({
-                "message": "로드맵이 성공적으로 생성되어 저장되었습니다.",
-                "filename": filename,
-                "path": save_path,
-                "roadmap_content": generated_text 
-            }), 200
-        else:
-            return jsonify({"error": "Gemini API 응답에서 로드맵을 생성할 수 없습니다. 응답 구조를 확인하세요."}), 500
+        saved_at = os.stat(save_path).st_mtime
+    except OSError:
+        roadmap_memory_cache.delete(filename)
+        return None
+    entry = roadmap_memory_cache.get(filename)
+    if entry is None or entry[1] != saved_at:
+        try:
+            with open(save_path, encoding='utf-8') as f:
+                content = f.read()
+                # 읽는 사이 파일이 교체되었을 수 있으므로 연 파일의 수정 시각을 기록합니다.
+                saved_at = os.fstat(f.fileno()).st_mtime
+        except OSError:
+            return None
+        entry = (content, saved_at)
+        roadmap_memory_cache.set(filename, entry)
+    content, saved_at = entry
+    if ROADMAP_CACHE_TTL_SECONDS and time.time() - saved_at > ROADMAP_CACHE_TTL_SECONDS:
+        roadmap_memory_cache.delete(filename)
+        return None
+    return content, filename, save_path
+
+
+def save_roadmap(job_role, duration, generated_text):
+    """로드맵 링크를 보완하여 Markdown 파일로 저장하고 (최종 내용, 파일 이름, 저장 경로)를 반환합니다."""
+    # Gemini가 로드맵 링크를 포함하지 않았을 경우 수동으로 추가
+    if ROADMAP_LINKS[job_role] not in generated_text:
+        generated_text += f"\n\n{ROADMAP_LINKS[job_role]}"
+
+    # 생성된 로드맵 파일의 이름과 저장 경로를 정의
+    filename = roadmap_filename(job_role, duration)
+    save_path = os.path.join(UPLOAD_BASE_DIR, filename)
+
+    # 생성된 로드맵 내용을 Markdown 파일로 저장 (읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일을 교체)
+    os.makedirs(UPLOAD_BASE_DIR, exist_ok=True)
+    tmp_path = f"{save_path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(generated_text)
+    os.replace(tmp_path, save_path)
+    roadmap_memory_cache.set(filename, (generated_text, os.path.getmtime(save_path)))
+    return generated_text, filename, save_path
+
+
+def request_roadmap(job_role, duration):
+    """Gemini API를 호출하여 로드맵 Markdown을 생성합니다."""
+    return gemini.generate(build_roadmap_payload(job_role, duration))
+
+
+def _generation_lock(filename):
+    with _generation_locks_guard:
+        return _generation_locks.setdefault(filename, threading.Lock())
+
+
+def get_roadmap(job_role, duration, force_refresh=False):
+    """캐시된 로드맵을 반환하고, 없거나 force_refresh이면 새로 생성하여 저장합니다.
+
+    (내용, 파일 이름, 저장 경로, 캐시 사용 여부)를 반환합니다. 같은 로드맵을 동시에
+    요청하면 한 요청만 Gemini를 호출하고 나머지는 그 결과를 사용합니다.
+    """
+    if not force_refresh:
+        cached = load_cached_roadmap(job_role, duration)
+        if cached:
+            return (*cached, True)
+    with _generation_lock(roadmap_filename(job_role, duration)):
+        if not force_refresh:
+            cached = load_cached_roadmap(job_role, duration)
+            if cached:
+                return (*cached, True)
+        generated_text = request_roadmap(job_role, duration)
+        return (*save_roadmap(job_role, duration, generated_text), False)
+
 
+def stream_roadmap(job_role, duration, force_refresh=False):
+    """Gemini 스트리밍 응답을 받아 생성되는 텍스트 조각을 SSE token 이벤트로 바로 보냅니다.
+
+    생성이 끝나면 파일로 저장하고 done 이벤트로 파일 이름과 경로를 보냅니다. 캐시된
+    로드맵이 있으면 전체 내용을 token 이벤트 하나로 보냅니다. 오류는 error 이벤트로 보냅니다.
+    """
+    cached = None if force_refresh else load_cached_roadmap(job_role, duration)
+    if cached:
+        yield from _cached_roadmap_events(cached)
+        return
+
+    # get_roadmap과 같은 잠금으로 같은 로드맵을 동시에 생성하지 않습니다. 기다리는 동안 다른 요청이
+    # 생성했으면 저장된 파일을 보냅니다.
+    with _generation_lock(roadmap_filename(job_role, duration)):
+        cached = None if force_refresh else load_cached_roadmap(job_role, duration)
+        if cached:
+            yield from _cached_roadmap_events(cached)
+            return
+        yield from _stream_new_roadmap(job_role, duration)
+
+
+def _cached_roadmap_events(cached):
+    content, filename, save_path = cached
+    yield sse_event("token", {"text": content})
+    yield sse_event("done", {
+        "message": "저장된 로드맵을 반환합니다.",
+        "filename": filename,
+        "path": save_path,
+        "roadmap_content": content,
+        "cached": True
+    })
+
+
+def _stream_new_roadmap(job_role, duration):
+    chunks = []
+    try:
+        for text in gemini.stream(build_roadmap_payload(job_role, duration)):
+            chunks.append(text)
+            yield sse_event("token", {"text": text})
+
+        if not chunks:
+            yield sse_event("error", {"error": "Gemini API 응답에서 로드맵을 생성할 수 없습니다. 응답 구조를 확인하세요."})
+            return
+
+        generated_text, filename, save_path = save_roadmap(job_role, duration, "".join(chunks))
+        yield sse_event("done", {
+            "message": "로드맵이 성공적으로 생성되어 저장되었습니다.",
+            "filename": filename,
+            "path": save_path,
+            "roadmap_content": generated_text,
+            "cached": False
+        })
+    except requests.exceptions.RequestException as e:
+        yield sse_event("error", {"error": f"Gemini API 호출 중 오류 발생: {e}"})
+    except Exception as e:
+        yield sse_event("error", {"error": f"로드맵 생성 중 예상치 못한 오류 발생: {e}"})
+
+
+def validate_roadmap_request(data):
+    """요청 본문에서 (job_role, duration, 오류 메시지)를 꺼냅니다. 정상이면 오류 메시지는 None입니다."""
+    job_role = data.get('job_role')
+    duration = data.get('duration')
+
+    # 필수 입력값 검증
+    if not job_role or not duration:
+        return None, None, "job_role과 duration은 필수 입력값입니다."
+
+    # 유효한 직무 역할인지 검증
+    if job_role not in ROADMAP_LINKS:
+        return None, None, "유효하지 않은 job_role입니다. 유효한 값: ai-engineer, app-android, app-ios, cyber-security, server-engineer, web-back, web-front"
+
+    try:
+        # duration은 정수형이어야 합니다. ("3"과 3이 같은 캐시 파일을 쓰도록 정규화)
+        duration = int(duration)
+    except (TypeError, ValueError):
+        return None, None, "duration은 숫자여야 합니다 (예: 1, 3, 6)."
+    return job_role, duration, None
+
+
+@app.route('/generate_roadmap', methods=['POST'])
+def generate_roadmap():
+    """
+    POST 요청을 받아 AI 특성화고 학생을 위한 로드맵을 생성합니다.
+    요청 본문에는 'job_role' (희망 직무)과 'duration' (학습 기간: 1, 3, 6개월)이 포함되어야 합니다.
+    이미 생성된 로드맵은 저장된 파일에서 반환하며, 'force_refresh': true이면 다시 생성합니다.
+    'stream': true를 넣으면 생성되는 로드맵을 Server-Sent Events로 바로 보냅니다.
+    """
+    job_role, duration, error = validate_roadmap_request(request.json)
+    if error:
+        return jsonify({"error": error}), 400
+    force_refresh = bool(request.json.get('force_refresh'))
+
+    if request.json.get('stream'):
+        return Response(
+            stream_with_context(stream_roadmap(job_role, duration, force_refresh)),
+            mimetype="text/event-stream",
+            headers=SSE_HEADERS,
+        )
+
+    try:
+        generated_text, filename, save_path, cached = get_roadmap(job_role, duration, force_refresh)
+
+        # 성공 응답 반환
+        return jsonify({
+            "message": "저장된 로드맵을 반환합니다." if cached else "로드맵이 성공적으로 생성되어 저장되었습니다.",
+            "filename": filename,
+            "path": save_path,
+            "roadmap_content": generated_text,
+            "cached": cached
+        }), 200
+
+    except GeminiError as e:
+        return jsonify({"error": str(e)}), 500
     except requests.exceptions.RequestException as e:
         return jsonify({"error": f"Gemini API 호출 중 오류 발생: {e}"}), 500
     except Exception as e:
         return jsonify({"error": f"로드맵 생성 중 예상치 못한 오류 발생: {e}"}), 500
 
+@app.route('/gemini_metrics', methods=['GET'])
+def gemini_metrics():
+    """Gemini API 호출 수, 오류/재시도 횟수, 지연 시간(평균/p50/p95)을 반환합니다 (X-Admin-Key 필요)."""
+    denied = admin_auth_error(request.headers.get("X-Admin-Key"))
+    if denied:
+        return jsonify({"error": denied[0]}), denied[1]
+    return jsonify(gemini.stats()), 200
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,28 @@
+import json
+
+# 프록시(nginx 등)가 응답을 모아서 보내지 않도록 하는 SSE 응답 헤더
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event, data):
+    """Server-Sent Events 형식의 이벤트 하나를 문자열로 만듭니다."""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def iter_sse_data(response):
+    """SSE 응답(requests, stream=True)에서 data 필드를 JSON으로 읽어 차례로 반환합니다."""
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    buffer = []
+    # chunk_size=None: 512바이트가 모일 때까지 기다리지 않고 도착한 만큼 바로 읽습니다.
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if line is None:
+            continue
+        if line.startswith("data:"):
+            buffer.append(line[5:].strip())
+        elif not line and buffer:
+            yield json.loads("\n".join(buffer))
+            buffer = []
+    if buffer:
+        yield json.loads("\n".join(buffer))
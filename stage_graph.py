@@ -0,0 +1,170 @@
+"""요청 한 건의 처리 단계를 의존 관계 그래프로 실행합니다.
+
+의존하는 단계가 모두 끝난 단계는 곧바로 공용 스레드 풀에서 시작되므로, 서로 관계없는 단계
+(예: Serper 검색과 기존 회사 DB 조회, 날짜 정규화와 LLM 생성)는 동시에 진행됩니다. 다른 단계를
+기다리는 단계는 스레드를 차지하지 않고 실행 가능해진 뒤에야 제출되므로 풀이 작아도 교착되지 않습니다.
+LLM 생성처럼 스레드를 오래 붙잡는 단계는 별도의 풀(add()의 executor)에서 실행해, 다른 요청의
+짧은 단계가 그 뒤에 줄 서지 않게 합니다.
+
+단계마다 시작 시각과 소요 시간을 기록하고, 마지막에 끝난 단계에서 거꾸로 "가장 늦게 끝난 의존
+단계"를 따라가 임계 경로(critical path)를 구합니다. 임계 경로에 있는 단계만 빨라져야 전체
+응답 시간이 줄어듭니다.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from db_pool import DB_MAX_OVERFLOW, DB_POOL_SIZE
+
+# 공용 풀의 단계는 각자 DB 세션을 쓰므로 기본값은 DB 연결 풀이 내줄 수 있는 연결 수입니다.
+STAGE_WORKERS = int(os.getenv("STAGE_WORKERS") or DB_POOL_SIZE + DB_MAX_OVERFLOW)
+
+_executors = {}
+_executor_lock = threading.Lock()
+_DONE = object()
+
+
+def shared_executor(name="stage", workers=STAGE_WORKERS):
+    """이름별로 프로세스에 하나씩 만드는 스레드 풀입니다. 처음 요청한 workers로 만들어집니다."""
+    with _executor_lock:
+        if name not in _executors:
+            _executors[name] = ThreadPoolExecutor(workers, thread_name_prefix=name)
+        return _executors[name]
+
+
+def _noop_report(stage, status):
+    pass
+
+
+def emit_from(events, emit):
+    """단계 안에서 `yield from` 대신 사용합니다. 생성기의 이벤트를 emit으로 보내고 반환값을 돌려줍니다."""
+    while True:
+        try:
+            event, data = next(events)
+        except StopIteration as done:
+            return done.value
+        emit(event, data)
+
+
+class Stage:
+    def __init__(self, name, func, deps, done_status, executor):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.done_status = done_status
+        self.executor = executor
+
+
+class StageGraph:
+    """단계를 add()로 등록한 뒤 run()으로 실행합니다.
+
+    단계 함수는 func(results, emit)으로 호출됩니다. results는 끝난 단계의 {이름: 반환값}이고,
+    emit(event, data)로 보낸 이벤트는 run()이 호출한 쪽 스레드에서 순서대로 내보냅니다.
+    report(stage, status)로 단계의 시작(running)과 종료(done 또는 done_status(결과), failed)를 알립니다.
+    add()에 executor를 주지 않은 단계는 그래프의 executor(기본값: 공용 풀)에서 실행됩니다.
+    """
+
+    def __init__(self, report=_noop_report, executor=None):
+        self.report = report
+        self.executor = executor
+        self.stages = {}
+        self.results = {}
+        self.spans = {}
+
+    def add(self, name, func, deps=(), done_status=None, executor=None):
+        unknown = [dep for dep in deps if dep not in self.stages]
+        if unknown:
+            raise ValueError(f"'{name}' 단계의 의존 단계가 먼저 등록되지 않았습니다: {unknown}")
+        self.stages[name] = Stage(name, func, deps, done_status, executor)
+        return self
+
+    def run(self):
+        """`yield from`으로 단계가 보낸 (이벤트, 데이터)를 내보내고 {단계 이름: 반환값}을 반환합니다.
+
+        단계 하나가 예외로 끝나면 새 단계는 시작하지 않고, 이미 실행 중인 단계가 끝나기를 기다려
+        상태를 보고한 뒤 처음 발생한 예외를 그대로 발생시킵니다.
+        """
+        executor = self.executor or shared_executor()
+        events = queue.Queue()
+        started = time.perf_counter()
+        launched = set()
+        running = set()
+
+        def emit(event, data):
+            events.put((event, data))
+
+        def execute(stage):
+            stage_started = time.perf_counter()
+            result = error = None
+            try:
+                result = stage.func(self.results, emit)
+            except BaseException as e:
+                error = e
+            events.put((_DONE, stage, result, error, stage_started, time.perf_counter()))
+
+        def launch_ready():
+            for stage in self.stages.values():
+                if stage.name in launched or not all(dep in self.results for dep in stage.deps):
+                    continue
+                launched.add(stage.name)
+                running.add(stage.name)
+                self.report(stage.name, "running")
+                (stage.executor or executor).submit(execute, stage)
+
+        failure = None
+        launch_ready()
+        while running:
+            item = events.get()
+            if item[0] is not _DONE:
+                if failure is None:
+                    yield item
+                continue
+            _, stage, result, error, stage_started, finished = item
+            running.discard(stage.name)
+            self.spans[stage.name] = (stage_started - started, finished - started)
+            if error is not None:
+                self.report(stage.name, "failed")
+                failure = failure or error
+                continue
+            self.results[stage.name] = result
+            self.report(stage.name, stage.done_status(result) if stage.done_status else "done")
+            if failure is None:
+                launch_ready()
+        if failure is not None:
+            raise failure
+        return self.results
+
+    def critical_path(self):
+        """마지막에 끝난 단계부터 가장 늦게 끝난 의존 단계를 따라간 단계 이름 목록입니다."""
+        if not self.spans:
+            return []
+        name = max(self.spans, key=lambda stage: self.spans[stage][1])
+        path = [name]
+        while True:
+            deps = [dep for dep in self.stages[name].deps if dep in self.spans]
+            if not deps:
+                break
+            name = max(deps, key=lambda dep: self.spans[dep][1])
+            path.append(name)
+        return path[::-1]
+
+    def timings(self):
+        """단계별 시작/소요 시간과 임계 경로, 전체 시간, 단계 시간의 단순 합(순차 실행 시)을 ms로 반환합니다."""
+        path = self.critical_path()
+        return {
+            "totalMs": round(max((end for _, end in self.spans.values()), default=0) * 1000, 1),
+            "criticalPath": path,
+            "criticalPathMs": round(
+                sum(self.spans[name][1] - self.spans[name][0] for name in path) * 1000, 1
+            ),
+            "serialMs": round(sum(end - start for start, end in self.spans.values()) * 1000, 1),
+            "stages": {
+                name: {
+                    "startMs": round(start * 1000, 1),
+                    "durationMs": round((end - start) * 1000, 1),
+                }
+                for name, (start, end) in self.spans.items()
+            },
+        }
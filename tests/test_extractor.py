@@ -0,0 +1,39 @@
+"""extract_info가 기존 필드별 정규식 구현(benchmarks/extract_info_bench.py)과 같은 결과를 내는지 확인합니다.
+
+실행: python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+)
+
+from extract_info_bench import MISSING, legacy_extract_info  # noqa: E402
+from extractor import FIELD_EXTRACTOR, FieldExtractor, extract_info  # noqa: E402
+from samples import make_form_text, parity_corpus  # noqa: E402
+
+CORPUS = parity_corpus(n_random=500)
+
+
+@pytest.mark.parametrize("name, text", CORPUS, ids=[name for name, _ in CORPUS])
+def test_matches_legacy(name, text):
+    assert extract_info(text) == legacy_extract_info(text)
+
+
+@pytest.mark.parametrize("name, text", CORPUS, ids=[name for name, _ in CORPUS])
+def test_scan_matches_legacy(monkeypatch, name, text):
+    # 필드별 re.search 경로를 끄고 단일 스캔 경로만으로 비교합니다.
+    monkeypatch.setattr(FieldExtractor, "_search_fields", lambda self, text: None)
+    assert extract_info(text) == legacy_extract_info(text)
+
+
+@pytest.mark.parametrize("brochure_pages", [0, 5])
+def test_complete_form_uses_search_path(brochure_pages):
+    assert FIELD_EXTRACTOR._search_fields(make_form_text(brochure_pages=brochure_pages)) is not None
+
+
+def test_missing_terminators_use_scan_path():
+    assert FIELD_EXTRACTOR._search_fields(make_form_text(brochure_pages=5, **MISSING)) is None